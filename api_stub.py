@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Record/Replay Stub for Upstream Sports APIs
+
+A local HTTP server standing in for every upstream the app calls:
+- The Odds API (api.the-odds-api.com)
+- FootyStats (api.footystats.org)
+- football-data (api.football-data.org)
+- API-Sports (*.api-sports.io)
+- SportsData (api.sportsdata.io)
+
+With UPSTREAM_STUB_URL set (e.g. http://127.0.0.1:8099), requests made
+through RateLimitedSession or main.fetch_json are sent to the stub as
+{stub}/{upstream host}{path}?{query} instead of the real API.
+
+Modes:
+- record: forward each request to the real API and save the response as
+  a fixture (credentials are stripped from the fixture)
+- replay: answer from fixtures only; unknown requests get a 404
+
+Latency, server errors and 429s can be injected on top of either mode,
+so DataManager, EnhancedDataDownloader and run_betting_scan can be
+benchmarked and load-tested offline and repeatably.
+
+Usage:
+    python api_stub.py --mode record --port 8099
+    python api_stub.py --port 8099 --latency 0.2 --error-rate 0.05 --rate-limit-rate 0.1
+    UPSTREAM_STUB_URL=http://127.0.0.1:8099 python main.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+
+from group_commit import atomic_write_text
+
+
+# Upstream hosts the stub can stand in for (suffix match)
+UPSTREAM_HOSTS = (
+    "api.the-odds-api.com",
+    "api.footystats.org",
+    "api.football-data.org",
+    "api-sports.io",
+    "sportsdata.io"
+)
+
+# Credentials never used in fixture keys or written to fixtures
+CREDENTIAL_PARAMS = {"apikey", "key", "api_key"}
+CREDENTIAL_HEADERS = {"x-auth-token", "x-rapidapi-key", "x-apisports-key", "authorization"}
+
+# Request/response headers passed through to and from the real API
+FORWARDED_REQUEST_HEADERS = ("accept", "range", "if-none-match", "if-modified-since", "if-range") + tuple(CREDENTIAL_HEADERS)
+RECORDED_RESPONSE_HEADERS = ("content-type", "etag", "last-modified", "retry-after", "accept-ranges")
+
+FIXTURES_DIR = Path("tests") / "fixtures" / "upstream"
+
+logger = logging.getLogger(__name__)
+
+
+def upstream_url(url: str) -> str:
+    """
+    Route an upstream API URL to the stub when UPSTREAM_STUB_URL is set.
+
+    Args:
+        url: Real API URL
+
+    Returns:
+        {stub}/{host}{path}?{query}, or the URL unchanged
+    """
+    stub = os.getenv("UPSTREAM_STUB_URL")
+    if not stub:
+        return url
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if not any(host == suffix or host.endswith(f".{suffix}") for suffix in UPSTREAM_HOSTS):
+        return url
+
+    return f"{stub.rstrip('/')}/{host}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+@dataclass
+class FaultConfig:
+    """Faults injected into stub responses."""
+    latency: float = 0.0          # seconds added to every response
+    jitter: float = 0.0           # extra uniform random delay, seconds
+    error_rate: float = 0.0       # fraction answered with 503
+    rate_limit_rate: float = 0.0  # fraction answered with 429
+    retry_after: int = 1          # Retry-After of injected 429s
+    seed: Optional[int] = None    # seed for repeatable runs
+
+
+class FixtureStore:
+    """Recorded upstream responses, one JSON file per request."""
+
+    def __init__(self, root: Path = FIXTURES_DIR):
+        """
+        Args:
+            root: Fixture directory (one subdirectory per upstream host)
+        """
+        self.root = Path(root)
+
+    def path_for(self, method: str, host: str, path: str, query: List[Tuple[str, str]]) -> Path:
+        """
+        Fixture file of a request; credentials do not affect the key.
+
+        Args:
+            method: HTTP method
+            host: Upstream host
+            path: Request path
+            query: Query parameters
+
+        Returns:
+            Fixture path (may not exist)
+        """
+        params = sorted((k, v) for k, v in query if k.lower() not in CREDENTIAL_PARAMS)
+        digest = hashlib.sha256(f"{method} {host}{path}?{urlencode(params)}".encode()).hexdigest()[:12]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        return self.root / host / f"{method.lower()}_{slug}_{digest}.json"
+
+    def load(self, method: str, host: str, path: str, query: List[Tuple[str, str]]) -> Optional[Dict[str, Any]]:
+        """Recorded response of a request, or None."""
+        fixture = self.path_for(method, host, path, query)
+        if not fixture.exists():
+            return None
+        with open(fixture, 'r') as f:
+            return json.load(f)
+
+    def save(self, method: str, host: str, path: str, query: List[Tuple[str, str]],
+             status: int, headers: Dict[str, str], body: bytes) -> Path:
+        """
+        Record a response.
+
+        Args:
+            method: HTTP method
+            host: Upstream host
+            path: Request path
+            query: Query parameters (credentials are dropped)
+            status: Response status code
+            headers: Response headers
+            body: Response body
+
+        Returns:
+            Path of the fixture written
+        """
+        try:
+            encoded = {"text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            encoded = {"base64": base64.b64encode(body).decode("ascii")}
+
+        fixture = {
+            "request": {
+                "method": method,
+                "host": host,
+                "path": path,
+                "query": [[k, v] for k, v in query if k.lower() not in CREDENTIAL_PARAMS]
+            },
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() in RECORDED_RESPONSE_HEADERS},
+            "body": encoded,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+
+        path_out = self.path_for(method, host, path, query)
+        path_out.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(path_out, json.dumps(fixture, indent=2), fsync=False)
+        return path_out
+
+    @staticmethod
+    def body(fixture: Dict[str, Any]) -> bytes:
+        """Decoded body of a fixture."""
+        body = fixture.get("body", {})
+        if "base64" in body:
+            return base64.b64decode(body["base64"])
+        return body.get("text", "").encode("utf-8")
+
+
+class UpstreamStub:
+    """Local record/replay server for the upstream sports APIs."""
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR, mode: str = "replay",
+                 faults: Optional[FaultConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            fixtures_dir: Fixture directory
+            mode: "replay" (fixtures only) or "record" (forward and save)
+            faults: Latency/errors/429s to inject
+            host: Interface to bind
+            port: Port to bind (0 = any free port)
+        """
+        if mode not in ("replay", "record"):
+            raise ValueError(f"Unknown stub mode: {mode}")
+
+        self.store = FixtureStore(fixtures_dir)
+        self.mode = mode
+        self.faults = faults or FaultConfig()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._upstream = requests.Session()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as UPSTREAM_STUB_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread; returns the base URL."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="upstream-stub", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Upstream stub ({self.mode}) listening on {self.url}")
+        return self.url
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "UpstreamStub":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, method: str, raw_path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one stub request.
+
+        Args:
+            method: HTTP method
+            raw_path: /{upstream host}{path}?{query}
+            headers: Request headers
+
+        Returns:
+            (status, headers, body)
+        """
+        parsed = urlparse(raw_path)
+        host, _, path = parsed.path.lstrip("/").partition("/")
+        path = f"/{path}"
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+
+        fault = self._draw_fault()
+        if fault == "rate_limit":
+            self._count(host, "injected_429")
+            return 429, {"Retry-After": str(self.faults.retry_after), "Content-Type": "application/json"}, \
+                b'{"message": "Too many requests (injected)"}'
+        if fault == "error":
+            self._count(host, "injected_errors")
+            return 503, {"Content-Type": "application/json"}, b'{"message": "Service unavailable (injected)"}'
+
+        if self.mode == "record":
+            return self._record(method, host, path, query, headers)
+
+        fixture = self.store.load(method, host, path, query)
+        if fixture is None:
+            self._count(host, "missing")
+            logger.warning(f"⚠️  No fixture for {method} {host}{path}")
+            body = json.dumps({"message": f"No fixture for {method} {host}{path}"}).encode()
+            return 404, {"Content-Type": "application/json"}, body
+
+        self._count(host, "replayed")
+        return fixture["status"], fixture.get("headers", {}), self.store.body(fixture)
+
+    def _record(self, method: str, host: str, path: str, query: List[Tuple[str, str]],
+                headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Forward a request to the real API and save its response."""
+        forwarded = {k: v for k, v in headers.items() if k.lower() in FORWARDED_REQUEST_HEADERS}
+        try:
+            response = self._upstream.request(method, f"https://{host}{path}", params=query,
+                                              headers=forwarded, timeout=60)
+        except requests.RequestException as e:
+            self._count(host, "upstream_errors")
+            return 502, {"Content-Type": "application/json"}, json.dumps({"message": str(e)}).encode()
+
+        headers_out = {k: v for k, v in response.headers.items() if k.lower() in RECORDED_RESPONSE_HEADERS}
+        # Partial, not-modified and rate-limited responses depend on the request's
+        # Range/conditional headers, which aren't part of the fixture key, so they
+        # are passed through but not kept
+        if response.status_code not in (206, 304, 429):
+            self.store.save(method, host, path, query, response.status_code, headers_out, response.content)
+            self._count(host, "recorded")
+        return response.status_code, headers_out, response.content
+
+    def _draw_fault(self) -> Optional[str]:
+        """Sleep the injected latency and pick an injected failure, if any."""
+        with self._lock:
+            delay = self.faults.latency + self._random.uniform(0, self.faults.jitter)
+            roll = self._random.random()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.faults.rate_limit_rate:
+            return "rate_limit"
+        if roll < self.faults.rate_limit_rate + self.faults.error_rate:
+            return "error"
+        return None
+
+    def _count(self, host: str, event: str):
+        """Bump a per-host counter."""
+        with self._lock:
+            counts = self.stats.setdefault(host, {})
+            counts[event] = counts.get(event, 0) + 1
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                status, headers, body = stub.handle(self.command, self.path, dict(self.headers))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_HEAD = _respond
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+
+@contextmanager
+def stubbed_upstreams(fixtures_dir: Path = FIXTURES_DIR, mode: str = "replay",
+                      faults: Optional[FaultConfig] = None) -> Iterator[UpstreamStub]:
+    """
+    Run a stub and route upstream requests in this process to it.
+
+    Args:
+        fixtures_dir: Fixture directory
+        mode: "replay" or "record"
+        faults: Latency/errors/429s to inject
+
+    Yields:
+        The running UpstreamStub
+    """
+    previous = os.environ.get("UPSTREAM_STUB_URL")
+    with UpstreamStub(fixtures_dir, mode, faults) as stub:
+        os.environ["UPSTREAM_STUB_URL"] = stub.url
+        try:
+            yield stub
+        finally:
+            if previous is None:
+                os.environ.pop("UPSTREAM_STUB_URL", None)
+            else:
+                os.environ["UPSTREAM_STUB_URL"] = previous
+
+
+def main():
+    """Run the stub server."""
+    parser = argparse.ArgumentParser(description="Record/replay stub for upstream sports APIs")
+    parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Fixture directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of injected 429s")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable fault injection")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    faults = FaultConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate, args.retry_after, args.seed)
+    stub = UpstreamStub(args.fixtures, args.mode, faults, args.host, args.port)
+
+    print(f"🧪 Upstream stub ({args.mode}) on {stub.url}, fixtures in {args.fixtures}")
+    print(f"   export UPSTREAM_STUB_URL={stub.url}")
+
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+        print(f"📊 Stub stats: {json.dumps(stub.stats, indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Columnar Storage for Market Data
+
+Stores odds, public betting and line movement records as a directory of
+NumPy column files instead of pretty-printed JSON:
+- One .npy file per column, memory-mappable so loaders touch only the
+  columns they need
+- Low-cardinality strings (game_id, book, bet_type, ...) dictionary
+  encoded as int32 codes
+- Timestamps as naive-UTC datetime64, numbers as float64/int64 (missing
+  ints stored as INT_MISSING and read back as None)
+
+Layout:
+    {data_type}_{timestamp}.cols/
+        _meta.json        # row count, column kinds, string dictionaries
+        game_id.npy
+        odds.npy
+        ...
+"""
+
+import json
+import logging
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNAR_SUFFIX = ".cols"
+META_FILENAME = "_meta.json"
+
+# Marker for missing/invalid values in int columns (readers return None)
+INT_MISSING = np.iinfo(np.int64).min
+
+logger = logging.getLogger(__name__)
+
+# Column kinds per data type: "category", "float", "int", "datetime"
+MARKET_DATA_SCHEMAS = {
+    "odds": {
+        "game_id": "category",
+        "book": "category",
+        "bet_type": "category",
+        "odds": "int",
+        "line_value": "float",
+        "timestamp": "datetime"
+    },
+    "public_betting": {
+        "game_id": "category",
+        "bet_type": "category",
+        "side": "category",
+        "bets_percentage": "float",
+        "money_percentage": "float",
+        "split_difference": "float",
+        "timestamp": "datetime"
+    },
+    "line_movements": {
+        "game_id": "category",
+        "book": "category",
+        "bet_type": "category",
+        "from_line": "float",
+        "to_line": "float",
+        "movement_size": "float",
+        "direction": "category",
+        "timestamp": "datetime"
+    }
+}
+
+
+def write_columnar(
+    records: List[Dict[str, Any]],
+    path: Path,
+    data_type: str,
+    schema: Optional[Dict[str, str]] = None
+) -> Path:
+    """
+    Write records as a columnar dataset directory.
+
+    Columns outside the schema are stored as float if numeric, otherwise
+    as dictionary-encoded strings. A datetime column with values that do
+    not parse as timestamps is kept as strings rather than losing them.
+
+    Args:
+        records: Flat record dicts
+        path: Output directory (conventionally ending in .cols)
+        data_type: Data type recorded in the metadata
+        schema: Column kinds (default: the data type's market data schema)
+
+    Returns:
+        Path of the written dataset
+    """
+    path = Path(path)
+    frame = pd.DataFrame.from_records(records)
+    schema = dict(schema if schema is not None else MARKET_DATA_SCHEMAS.get(data_type, {}))
+
+    for column in frame.columns:
+        if column not in schema:
+            schema[column] = "float" if pd.api.types.is_numeric_dtype(frame[column]) else "category"
+
+    temp_path = path.with_name(f".{path.name}.tmp")
+    if temp_path.exists():
+        shutil.rmtree(temp_path)
+    temp_path.mkdir(parents=True)
+
+    meta = {
+        "data_type": data_type,
+        "rows": len(frame),
+        "created_at": datetime.now().isoformat(),
+        "columns": {}
+    }
+
+    try:
+        for column, kind in schema.items():
+            values = frame[column] if column in frame.columns else pd.Series([None] * len(frame), dtype=object)
+            column_meta = {"kind": kind}
+
+            if kind == "category":
+                strings = values.astype(object).where(values.notna(), None)
+                strings = strings.map(lambda v: v if v is None else str(v))
+                categorical = pd.Categorical(strings)
+                array = categorical.codes.astype(np.int32)  # -1 = missing
+                column_meta["dictionary"] = [str(c) for c in categorical.categories]
+            elif kind == "int":
+                numbers = pd.to_numeric(values, errors="coerce")
+                invalid = int((numbers.isna() & _present(values)).sum())
+                if invalid:
+                    logger.warning(f"⚠️ {invalid} invalid {column} values in {path.name} stored as missing")
+                array = numbers.fillna(INT_MISSING).astype(np.int64).to_numpy()
+            elif kind == "float":
+                array = pd.to_numeric(values, errors="coerce").astype(np.float64).to_numpy()
+            else:
+                timestamps = _parse_timestamps(values)
+                if timestamps is None:
+                    logger.warning(f"⚠️ Unparseable {column} values in {path.name}; stored as strings")
+                    strings = values.astype(object).where(values.notna(), None)
+                    categorical = pd.Categorical(strings.map(lambda v: v if v is None else str(v)))
+                    array = categorical.codes.astype(np.int32)
+                    column_meta = {"kind": "category", "dictionary": [str(c) for c in categorical.categories]}
+                else:
+                    array = timestamps.to_numpy(dtype="datetime64[us]")
+
+            np.save(temp_path / f"{column}.npy", array, allow_pickle=False)
+            meta["columns"][column] = column_meta
+
+        with open(temp_path / META_FILENAME, 'w') as f:
+            json.dump(meta, f)
+
+        if path.exists():
+            shutil.rmtree(path)
+        temp_path.rename(path)
+
+    except Exception:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    return path
+
+
+def _present(values: pd.Series) -> pd.Series:
+    """Mask of non-null, non-blank values."""
+    return values.notna() & values.astype(str).str.strip().ne("")
+
+
+def _parse_timestamps(values: pd.Series) -> Optional[pd.Series]:
+    """
+    Parse a timestamp column to naive UTC.
+
+    Values with a UTC offset are converted to UTC; naive values are taken
+    as UTC already, so one upload may mix both.
+
+    Returns:
+        Parsed timestamps, or None if any non-empty value does not parse
+    """
+    timestamps = pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+
+    retry = timestamps.isna() & _present(values)
+    if retry.any():
+        timestamps[retry] = pd.to_datetime(values[retry], errors="coerce", utc=True, format="mixed")
+        if (timestamps.isna() & _present(values)).any():
+            return None
+
+    return timestamps.dt.tz_convert(None)
+
+
+class ColumnarDataset:
+    """Reader for a columnar dataset directory."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        with open(self.path / META_FILENAME, 'r') as f:
+            self.meta = json.load(f)
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names in storage order."""
+        return list(self.meta["columns"].keys())
+
+    @property
+    def rows(self) -> int:
+        """Number of rows."""
+        return self.meta["rows"]
+
+    def read_column(self, column: str, mmap: bool = True) -> np.ndarray:
+        """
+        Read one column's raw array (codes for dictionary columns).
+
+        Args:
+            column: Column name
+            mmap: Memory-map the column file instead of reading it
+
+        Returns:
+            Column array
+        """
+        return np.load(self.path / f"{column}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+
+    def dictionary(self, column: str) -> List[str]:
+        """String dictionary for a category column."""
+        return self.meta["columns"][column].get("dictionary", [])
+
+    def to_dataframe(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load selected columns as a DataFrame (categories decoded).
+
+        Args:
+            columns: Columns to load (all if None)
+
+        Returns:
+            DataFrame with typed columns
+        """
+        data = {}
+
+        for column in columns or self.columns:
+            kind = self.meta["columns"][column]["kind"]
+            array = self.read_column(column)
+
+            if kind == "category":
+                data[column] = pd.Categorical.from_codes(
+                    np.asarray(array), categories=self.dictionary(column)
+                )
+            elif kind == "int":
+                array = np.asarray(array)
+                data[column] = pd.arrays.IntegerArray(array, array == INT_MISSING)
+            else:
+                data[column] = np.asarray(array)
+
+        return pd.DataFrame(data)
+
+    def to_records(self, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Load selected columns as record dicts (JSON-compatible values).
+
+        Args:
+            columns: Columns to load (all if None)
+
+        Returns:
+            List of record dicts
+        """
+        columns = columns or self.columns
+        decoded = {}
+
+        for column in columns:
+            kind = self.meta["columns"][column]["kind"]
+            array = np.asarray(self.read_column(column))
+
+            if kind == "category":
+                dictionary = self.dictionary(column)
+                decoded[column] = [dictionary[code] if code >= 0 else None for code in array.tolist()]
+            elif kind == "datetime":
+                decoded[column] = [
+                    None if np.isnat(value) else pd.Timestamp(value).isoformat()
+                    for value in array
+                ]
+            elif kind == "float":
+                decoded[column] = [None if value != value else value for value in array.tolist()]
+            elif kind == "int":
+                decoded[column] = [None if value == INT_MISSING else value for value in array.tolist()]
+            else:
+                decoded[column] = array.tolist()
+
+        return [
+            {column: decoded[column][i] for column in columns}
+            for i in range(self.rows)
+        ]
+
+
+def find_columnar_datasets(data_directory: Path, data_type: str) -> List[Path]:
+    """List columnar datasets for a data type, oldest first."""
+    return sorted(
+        path for path in Path(data_directory).glob(f"{data_type}_*{COLUMNAR_SUFFIX}")
+        if (path / META_FILENAME).exists()
+    )
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Upload Compaction for Sharp Betting Predictor
+
+Every upload through DataInputManager writes a new timestamped file
+(odds_20250115_183000.json, games_..., ...), and add_line_movement
+appends to JSON-lines segments (line_movements_..._<id>.jsonl; older
+data directories have one shared line_movements.json). Compaction merges
+them into one partition per data type, upload day and sport:
+
+    odds_20250115_000000_mlb.json
+    games_20250115_000000_nba.json
+
+Superseded records (a later upload of the same game, or of the same
+quote/snapshot at the same timestamp) are dropped. Partition names sort
+ahead of the same day's later uploads, so "latest upload wins" readers
+such as MarketDataIndex see the same order as before compaction.
+
+Usage:
+    python data_compaction.py --data-dir data
+    python data_compaction.py --data-type odds --before 20250115
+"""
+
+import argparse
+import json
+import logging
+import re
+import shutil
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from columnar_store import COLUMNAR_SUFFIX, ColumnarDataset
+from data_input_manager import DataInputManager, read_json_lines
+from group_commit import atomic_write_text, file_lock
+
+
+DATA_TYPES = ["games", "odds", "public_betting", "line_movements"]
+
+# Fields identifying a record; a later record with the same key supersedes it
+RECORD_KEYS = {
+    "games": ("game_id",),
+    "odds": ("game_id", "book", "bet_type", "side", "timestamp"),
+    "public_betting": ("game_id", "bet_type", "side", "timestamp"),
+    "line_movements": ("game_id", "book", "bet_type", "from_line", "to_line", "timestamp")
+}
+
+PARTITION_TIME = "000000"
+
+
+class UploadCompactor:
+    """Merges small upload files into per-day, per-sport partitions."""
+
+    def __init__(self, data_manager: DataInputManager):
+        self.data_manager = data_manager
+        self.data_directory = data_manager.data_directory
+        self._sports: Dict[str, str] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def compact(
+        self,
+        data_types: Optional[List[str]] = None,
+        before_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compact upload files.
+
+        Args:
+            data_types: Data types to compact (all if None)
+            before_date: Only compact upload days before this YYYYMMDD date
+                (all days if None)
+
+        Returns:
+            Dict with file and record counts
+        """
+        stats = {
+            "success": True,
+            "files_read": 0,
+            "partitions_written": 0,
+            "records_read": 0,
+            "records_written": 0,
+            "superseded_dropped": 0
+        }
+
+        try:
+            for data_type in data_types or DATA_TYPES:
+                if data_type == "line_movements":
+                    # Hold off concurrent add_line_movement commits while the
+                    # appended movements are folded into partitions
+                    self.data_manager.line_movement_writer.flush()
+                    with file_lock(self.data_directory / ".line_movements.lock"):
+                        self._compact_type(data_type, before_date, stats)
+                else:
+                    self._compact_type(data_type, before_date, stats)
+        except Exception as e:
+            self.logger.error(f"Error compacting uploads: {str(e)}")
+            stats.update({"success": False, "error": str(e)})
+
+        return stats
+
+    def _compact_type(self, data_type: str, before_date: Optional[str], stats: Dict[str, Any]):
+        """Compact every eligible upload day of one data type."""
+        days: Dict[str, List[Path]] = defaultdict(list)
+
+        for path, day in self._find_sources(data_type):
+            if before_date is None or day < before_date:
+                days[day].append(path)
+
+        # Records appended by add_line_movement, split by their own dates
+        appended: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        appended_files = self._find_appended(data_type)
+        for appended_file in appended_files:
+            for record in self._read_source(appended_file):
+                day = self._record_day(record)
+                if before_date is None or day < before_date:
+                    appended[day].append(record)
+
+        for day in sorted(set(days) | set(appended)):
+            sources = sorted(days.get(day, []))
+            if not appended.get(day) and all(self._is_partition(path, data_type) for path in sources):
+                continue
+
+            records = [record for path in sources for record in self._read_source(path)]
+            records += appended.get(day, [])
+
+            stats["files_read"] += len(sources)
+            stats["records_read"] += len(records)
+
+            outputs = set()
+            for sport, partition in self._partition(records, data_type).items():
+                stem = f"{data_type}_{day}_{PARTITION_TIME}_{sport}"
+                outputs.add(self.data_manager._save_records(partition, data_type, stem))
+                stats["partitions_written"] += 1
+                stats["records_written"] += len(partition)
+
+            for path in sources:
+                if path.name not in outputs:
+                    self._remove(path)
+
+        if appended:
+            for appended_file in appended_files:
+                remaining = [
+                    record for record in self._read_source(appended_file)
+                    if before_date is not None and self._record_day(record) >= before_date
+                ]
+                if not remaining:
+                    self._remove(appended_file)
+                    continue
+
+                if appended_file.suffix == ".jsonl":
+                    text = "".join(f"{json.dumps(record)}\n" for record in remaining)
+                else:
+                    text = json.dumps(remaining)
+                atomic_write_text(appended_file, text)
+                self.data_manager.manifest.record_file(appended_file)
+
+        stats["superseded_dropped"] = stats["records_read"] - stats["records_written"]
+
+    def _find_sources(self, data_type: str) -> List[Tuple[Path, str]]:
+        """Upload files and partitions of a data type with their upload day."""
+        pattern = re.compile(
+            rf"^{data_type}_(\d{{8}})(?:_\d{{6}})?(?:_[0-9a-z_]+)?(?:\.json|{re.escape(COLUMNAR_SUFFIX)})$"
+        )
+        sources = []
+
+        for path in self.data_directory.iterdir():
+            match = pattern.match(path.name)
+            if match:
+                sources.append((path, match.group(1)))
+
+        return sources
+
+    def _find_appended(self, data_type: str) -> List[Path]:
+        """Line movement segments and the legacy shared movements file, oldest first."""
+        if data_type != "line_movements":
+            return []
+
+        appended = sorted(self.data_directory.glob(f"{data_type}_*.jsonl"))
+        legacy_file = self.data_directory / f"{data_type}.json"
+        if legacy_file.exists():
+            appended.insert(0, legacy_file)
+
+        return appended
+
+    def _is_partition(self, path: Path, data_type: str) -> bool:
+        """Whether a file is already a compacted partition."""
+        return re.match(rf"^{data_type}_\d{{8}}_{PARTITION_TIME}_", path.name) is not None
+
+    def _read_source(self, path: Path) -> List[Dict[str, Any]]:
+        """Read the records of an upload file or columnar dataset."""
+        if path.is_dir():
+            return ColumnarDataset(path).to_records()
+
+        if path.suffix == ".jsonl":
+            return read_json_lines(path)
+
+        with open(path, 'r') as f:
+            records = json.load(f)
+
+        if isinstance(records, dict):
+            records = [records]
+
+        return [record for record in records if isinstance(record, dict)]
+
+    def _partition(self, records: List[Dict[str, Any]], data_type: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Split records by sport, keeping only the latest of each record key."""
+        key_fields = RECORD_KEYS[data_type]
+        partitions: Dict[str, Dict[tuple, Dict[str, Any]]] = defaultdict(dict)
+
+        for record in records:
+            key = tuple(
+                str(record.get(field)).replace(" ", "T") if field == "timestamp" else record.get(field)
+                for field in key_fields
+            )
+            partition = partitions[self._sport_key(record, data_type)]
+            # Re-insert so the surviving record keeps the later position
+            partition.pop(key, None)
+            partition[key] = record
+
+        return {sport: list(partition.values()) for sport, partition in partitions.items()}
+
+    def _sport_key(self, record: Dict[str, Any], data_type: str) -> str:
+        """Partition key for a record's sport."""
+        if data_type == "games":
+            sport = record.get("sport")
+        else:
+            game_id = record.get("game_id")
+            if game_id not in self._sports:
+                game = self.data_manager.get_game_data(game_id) if game_id else None
+                self._sports[game_id] = game.sport if game else None
+            sport = self._sports[game_id]
+
+        return re.sub(r"[^0-9a-z]+", "_", str(sport or "unknown").lower()).strip("_") or "unknown"
+
+    def _record_day(self, record: Dict[str, Any]) -> str:
+        """YYYYMMDD of a record's timestamp (today if missing or invalid)."""
+        try:
+            return datetime.fromisoformat(str(record.get("timestamp"))).strftime("%Y%m%d")
+        except ValueError:
+            return datetime.now().strftime("%Y%m%d")
+
+    def _remove(self, path: Path):
+        """Delete a compacted source and drop it from the manifest."""
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+        self.data_manager.manifest.remove_file(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact uploaded data files into daily per-sport partitions")
+    parser.add_argument("--data-dir", default="data", help="DataInputManager data directory")
+    parser.add_argument("--data-type", action="append", choices=DATA_TYPES, help="Data type to compact (repeatable)")
+    parser.add_argument("--before", help="Only compact upload days before this date (YYYYMMDD)")
+
+    args = parser.parse_args()
+
+    print("🗜️  Upload Compaction")
+    print("=" * 50)
+
+    data_manager = DataInputManager(args.data_dir)
+    files_before = data_manager.get_data_summary(refresh=True)["data_files"]
+
+    stats = UploadCompactor(data_manager).compact(args.data_type, args.before)
+
+    if not stats["success"]:
+        print(f"❌ Compaction failed: {stats['error']}")
+        return
+
+    files_after = data_manager.get_data_summary()["data_files"]
+    print(f"📁 Files: {len(files_before)} → {len(files_after)}")
+    print(f"📝 Records: {stats['records_read']} read, {stats['records_written']} written, "
+          f"{stats['superseded_dropped']} superseded")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,19 +10,48 @@ Handles data input from multiple sources:
 """
 
 import csv
+import codecs
 import json
 import pandas as pd
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple, Any, Union
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, List, Optional, Set, Tuple, Any, Union, Callable, Iterable, Iterator, FrozenSet
 from datetime import datetime, timedelta
 import io
+import os
 import logging
+import sys
+import threading
+import time
+import uuid
 from pathlib import Path
 
+from game_store import SQLiteGameStore
+from game_assembler import MarketDataIndex, intern_categoricals
+from group_commit import GroupCommitWriter, append_lines, atomic_write_text, file_lock
+from columnar_store import (
+    COLUMNAR_SUFFIX, MARKET_DATA_SCHEMAS, ColumnarDataset, find_columnar_datasets, write_columnar
+)
 
-@dataclass
+# Optional SQLite game store (file-based games_*.json when unset)
+GAME_DATABASE_PATH = os.getenv("GAME_DATABASE_PATH")
+DATA_STORAGE_FORMAT = os.getenv("DATA_STORAGE_FORMAT", "json")
+
+# Size after which add_line_movement starts a new JSON-lines segment
+LINE_MOVEMENT_SEGMENT_BYTES = int(os.getenv("LINE_MOVEMENT_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+
+# Directory mtimes closer than this to a check may not reflect later changes yet
+DIRECTORY_MTIME_GRANULARITY_NS = 1_000_000_000
+
+
+@dataclass(slots=True)
 class GameData:
-    """Structured game data for analysis."""
+    """
+    Structured game data for analysis.
+    
+    Slotted to drop the per-instance __dict__; _dict_to_game_data interns
+    the repeated team, sport and book strings so a full season of games
+    with line history stays compact in memory.
+    """
     game_id: str
     sport: str
     home_team: str
@@ -60,14 +89,685 @@ class PublicBettingInfo:
     timestamp: Optional[datetime] = None
 
 
+def iter_json_records(stream: Any, read_size: int = 65536) -> Iterator[Any]:
+    """
+    Incrementally parse a JSON array (or single value) from a stream.
+    
+    Yields top-level array elements one at a time, keeping only the
+    unparsed tail of the input in memory, so peak memory scales with the
+    largest record rather than the whole document.
+    
+    Args:
+        stream: File-like object returning str or bytes (UTF-8)
+        read_size: Characters/bytes to read per refill
+        
+    Yields:
+        Parsed records
+    
+    Raises:
+        json.JSONDecodeError: If the document is malformed
+    """
+    decoder = json.JSONDecoder()
+    byte_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    eof = False
+    
+    def refill(size: int) -> bool:
+        nonlocal buffer, pos, eof
+        chunk = ""
+        # A read can end inside a multi-byte character and decode to
+        # nothing, so only an empty raw read is the end of the stream
+        while not chunk:
+            if eof:
+                return False
+            raw = stream.read(size)
+            eof = not raw
+            chunk = byte_decoder.decode(raw, final=eof) if isinstance(raw, bytes) else raw
+        # Drop the consumed prefix before growing the buffer
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+    
+    def next_token() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not refill(read_size):
+                return ""
+    
+    def decode_value() -> Any:
+        nonlocal pos
+        size = read_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A value not followed by a delimiter may be truncated (e.g. "1.5" of "1.5e3")
+                if eof or (end < len(buffer) and buffer[end] in ",]} \t\r\n"):
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Grow reads geometrically so large records don't reparse quadratically
+            refill(size)
+            size *= 2
+    
+    first = next_token()
+    if first == "":
+        return
+    
+    if first != "[":
+        yield decode_value()
+        if next_token() != "":
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+        return
+    
+    pos += 1
+    if next_token() == "]":
+        pos += 1
+        return
+    
+    while True:
+        yield decode_value()
+        
+        token = next_token()
+        if token == ",":
+            pos += 1
+            next_token()
+        elif token == "]":
+            pos += 1
+            break
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+    
+    if next_token() != "":
+        raise json.JSONDecodeError("Extra data", buffer, pos)
+
+
+def read_json_lines(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read a JSON-lines file (one record per line).
+    
+    Args:
+        path: JSON-lines file
+        
+    Returns:
+        Records (dicts) in file order
+    """
+    return read_json_lines_from(path, 0)[0]
+
+
+def read_json_lines_from(path: Path, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read the records of a JSON-lines file from a byte offset.
+    
+    A line that does not parse - an append torn by a crash - is skipped
+    with a warning rather than failing the whole file. An unterminated
+    final line that does not parse may still be being appended, so it is
+    left unconsumed.
+    
+    Args:
+        path: JSON-lines file
+        offset: Byte offset of the first line to read
+        
+    Returns:
+        Tuple of (records in file order, offset after the last consumed line)
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    
+    lines = data.split(b"\n")
+    records = []
+    position = offset
+    
+    for index, line in enumerate(lines):
+        terminated = index < len(lines) - 1
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if not terminated:
+                    break
+                logging.getLogger(__name__).warning(f"Skipping unreadable line at byte {position} of {path}")
+                record = None
+            if isinstance(record, dict):
+                records.append(record)
+        position += len(line) + terminated
+    
+    return records, position
+
+
+class GameFileCache:
+    """
+    Process-level cache of parsed games_*.json files.
+    
+    Files are keyed by path and (mtime, size); each call stats the game
+    files and reparses only the ones that changed. Cached GameData objects
+    are shared between callers and should be treated as read-only.
+    """
+    
+    def __init__(self):
+        # path -> (mtime_ns, size, parsed games, game IDs)
+        self._files: Dict[Path, Tuple[int, int, List[GameData], FrozenSet[str]]] = {}
+        # directory -> (file signature, games in file order, game_id index)
+        self._directories: Dict[Path, Tuple[tuple, List[GameData], Dict[str, GameData]]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def get_games(
+        self, 
+        directory: Path, 
+        parse_game: Callable[[Dict], GameData]
+    ) -> Tuple[List[GameData], Dict[str, GameData]]:
+        """
+        Get parsed games for a data directory.
+        
+        Args:
+            directory: Directory containing games_*.json files
+            parse_game: Converts a game dict to GameData
+            
+        Returns:
+            Tuple of (games in file order, {game_id: first matching game})
+        """
+        directory = directory.resolve()
+        
+        file_stats = []
+        for game_file in directory.glob("games_*.json"):
+            try:
+                stat = game_file.stat()
+            except FileNotFoundError:
+                continue
+            file_stats.append((game_file, stat.st_mtime_ns, stat.st_size))
+        
+        signature = tuple(file_stats)
+        
+        with self._lock:
+            cached = self._directories.get(directory)
+            if cached and cached[0] == signature:
+                return cached[1], cached[2]
+            
+            games: List[GameData] = []
+            games_by_id: Dict[str, GameData] = {}
+            
+            for game_file, mtime_ns, size in file_stats:
+                entry = self._files.get(game_file)
+                if entry is None or entry[0] != mtime_ns or entry[1] != size:
+                    parsed = self._parse_file(game_file, parse_game)
+                    entry = (mtime_ns, size, parsed, frozenset(game.game_id for game in parsed))
+                    self._files[game_file] = entry
+                
+                for game_data in entry[2]:
+                    games.append(game_data)
+                    games_by_id.setdefault(game_data.game_id, game_data)
+            
+            # Forget files that were removed from this directory
+            current_files = {game_file for game_file, _, _ in file_stats}
+            for game_file in [f for f in self._files if f.parent == directory and f not in current_files]:
+                del self._files[game_file]
+            
+            self._directories[directory] = (signature, games, games_by_id)
+            return games, games_by_id
+    
+    def file_game_ids(
+        self, 
+        directory: Path, 
+        parse_game: Callable[[Dict], GameData]
+    ) -> Dict[str, Tuple[tuple, FrozenSet[str]]]:
+        """
+        Get the (mtime, size) signature and game IDs of each games file.
+        
+        Args:
+            directory: Directory containing games_*.json files
+            parse_game: Converts a game dict to GameData
+            
+        Returns:
+            {file path: (signature, game IDs in the file)}
+        """
+        self.get_games(directory, parse_game)
+        directory = directory.resolve()
+        
+        with self._lock:
+            return {
+                str(game_file): ((entry[0], entry[1]), entry[3])
+                for game_file, entry in self._files.items() if game_file.parent == directory
+            }
+    
+    def clear(self):
+        """Drop all cached files."""
+        with self._lock:
+            self._files.clear()
+            self._directories.clear()
+    
+    def _parse_file(self, game_file: Path, parse_game: Callable[[Dict], GameData]) -> List[GameData]:
+        """Parse one games file."""
+        with open(game_file, 'r') as f:
+            games = json.load(f)
+        
+        return [parse_game(game) for game in games]
+
+
+# Shared by every DataInputManager in the process
+GAME_FILE_CACHE = GameFileCache()
+
+
+class MarketRecordCache:
+    """
+    Process-level cache of stored odds, public betting and line movement
+    records.
+    
+    Each source (JSON upload or columnar dataset) is keyed by path and
+    (mtime, size) and reparsed only when it changes, so assembling games
+    costs a stat per source once the records are cached. Line movement
+    segments (.jsonl) are append-only: only the lines appended since the
+    last read are parsed. Records are
+    grouped by game_id in file order, which lets a MarketDataIndex be built
+    for a few games without visiting the others. Cached records are shared
+    between callers and should be treated as read-only.
+    """
+    
+    def __init__(self):
+        # path -> (signature, {game_id: records in file order}, bytes consumed for .jsonl)
+        self._sources: Dict[Path, Tuple[tuple, Dict[str, List[Dict[str, Any]]], Optional[int]]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def get_sources(self, directory: Path, data_type: str) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Get the stored records of one data type.
+        
+        Args:
+            directory: Data directory
+            data_type: "odds", "public_betting" or "line_movements"
+            
+        Returns:
+            One {game_id: records} mapping per source, oldest upload first
+        """
+        return [entry[1] for _, entry in self._refresh(directory, data_type)]
+    
+    def source_game_ids(self, directory: Path, data_type: str) -> Dict[str, Tuple[tuple, Iterable[str]]]:
+        """
+        Get the signature and game IDs of each source of one data type.
+        
+        Args:
+            directory: Data directory
+            data_type: "odds", "public_betting" or "line_movements"
+            
+        Returns:
+            {source path: (signature, game IDs in the source)}
+        """
+        return {
+            str(path): (entry[0], entry[1].keys()) 
+            for path, entry in self._refresh(directory, data_type)
+        }
+    
+    def clear(self):
+        """Drop all cached sources."""
+        with self._lock:
+            self._sources.clear()
+    
+    def _refresh(self, directory: Path, data_type: str) -> List[Tuple[Path, tuple]]:
+        """Stat the sources of a data type and reparse the changed ones."""
+        directory = directory.resolve()
+        
+        sources = [
+            (path.name.replace(COLUMNAR_SUFFIX, ""), path) 
+            for path in find_columnar_datasets(directory, data_type)
+        ]
+        sources += [(path.stem, path) for path in directory.glob(f"{data_type}*.json")]
+        sources += [(path.stem, path) for path in directory.glob(f"{data_type}_*.jsonl")]
+        
+        entries = []
+        current_paths = set()
+        
+        for _, path in sorted(sources):
+            signature = self._signature(path)
+            if signature is None:
+                continue
+            current_paths.add(path)
+            
+            with self._lock:
+                entry = self._sources.get(path)
+            
+            if entry is None or entry[0] != signature:
+                try:
+                    entry = self._read_source(path, signature, entry)
+                except (OSError, json.JSONDecodeError) as e:
+                    self.logger.error(f"Error reading {path}: {str(e)}")
+                    continue
+                
+                with self._lock:
+                    self._sources[path] = entry
+            
+            entries.append((path, entry))
+        
+        # Forget sources that were removed from this directory
+        with self._lock:
+            for path in [
+                p for p in self._sources 
+                if p.parent == directory and p.name.startswith(data_type) and p not in current_paths
+            ]:
+                del self._sources[path]
+        
+        return entries
+    
+    def _signature(self, path: Path) -> Optional[tuple]:
+        """(mtime, size) of a file or of every file in a columnar dataset; (inode, size) of a segment."""
+        try:
+            if path.suffix == ".jsonl":
+                stat = path.stat()
+                return (stat.st_ino, stat.st_size)
+            if path.is_dir():
+                return tuple(sorted(
+                    (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size) 
+                    for entry in os.scandir(path)
+                ))
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_source(self, path: Path, signature: tuple, entry: Optional[tuple]) -> tuple:
+        """Build a cache entry, reading only the appended tail of a grown segment."""
+        if path.suffix != ".jsonl":
+            return (signature, self._parse_source(path), None)
+        
+        inode, size = signature
+        if entry is not None and entry[0][0] == inode and entry[2] <= size:
+            records, consumed = read_json_lines_from(path, entry[2])
+            # Copy-on-write: callers may still hold the previous mapping
+            grouped = dict(entry[1])
+            for record in records:
+                if record.get("game_id"):
+                    grouped[record["game_id"]] = grouped.get(record["game_id"], []) + [record]
+            return (signature, grouped, consumed)
+        
+        records, consumed = read_json_lines_from(path, 0)
+        return (signature, self._group(records), consumed)
+    
+    def _parse_source(self, path: Path) -> Dict[str, List[Dict[str, Any]]]:
+        """Read one source and group its records by game_id."""
+        if path.is_dir():
+            records = ColumnarDataset(path).to_records()
+        else:
+            with open(path, 'r') as f:
+                records = json.load(f)
+            if isinstance(records, dict):
+                records = [records]
+        
+        return self._group(records)
+    
+    def _group(self, records: Iterable[Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group records by game_id, in file order."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            if isinstance(record, dict) and record.get("game_id"):
+                grouped.setdefault(record["game_id"], []).append(record)
+        
+        return grouped
+
+
+# Shared by every DataInputManager in the process
+MARKET_RECORD_CACHE = MarketRecordCache()
+
+
+class DataManifest:
+    """
+    Maintained summary of the files in a data directory.
+    
+    Stored as _manifest.json next to the data and updated on every write,
+    so get_data_summary does not stat or parse the data files. Aggregates
+    (file counts per type, files per sport) are adjusted incrementally as
+    files are added, rewritten or removed. A missing or unreadable
+    manifest is rebuilt from a one-off directory scan.
+    """
+    
+    FILENAME = "_manifest.json"
+    
+    COUNT_KEYS = {
+        "games": "games_count",
+        "odds": "odds_files",
+        "public_betting": "public_betting_files",
+        "line_movements": "line_movement_files"
+    }
+    
+    def __init__(self, data_directory: Path):
+        self.data_directory = Path(data_directory)
+        self.path = self.data_directory / self.FILENAME
+        self.lock_path = self.data_directory / ".manifest.lock"
+        self._manifest: Optional[Dict[str, Any]] = None
+        # (mtime_ns, inode) of the manifest file last read or written
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def record_file(self, data_file: Path, sports: Optional[List[str]] = None):
+        """
+        Add or refresh a data file's entry.
+        
+        Args:
+            data_file: File (or columnar dataset directory) just written
+            sports: Sports contained in the file (games files only)
+        """
+        with self._lock, file_lock(self.lock_path):
+            manifest = self._load()
+            self._remove_entry(manifest, data_file.name)
+            self._add_entry(manifest, self._describe(data_file, sports))
+            self._save(manifest)
+    
+    def remove_file(self, data_file: Path):
+        """
+        Drop a deleted data file's entry.
+        
+        Args:
+            data_file: File that was removed
+        """
+        with self._lock, file_lock(self.lock_path):
+            manifest = self._load()
+            if self._remove_entry(manifest, data_file.name):
+                self._save(manifest)
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build the data summary from the manifest.
+        
+        Returns:
+            Dict in get_data_summary format
+        """
+        with self._lock:
+            manifest = self._load()
+        
+        summary = dict(manifest["counts"])
+        summary["last_upload"] = manifest["last_upload"]
+        summary["sports"] = sorted(manifest["sport_files"])
+        summary["data_files"] = [
+            {"filename": name, "size": entry["size"], "modified": entry["modified"]}
+            for name, entry in manifest["files"].items()
+        ]
+        
+        return summary
+    
+    def rebuild(self):
+        """Rebuild the manifest by scanning the data directory."""
+        with self._lock, file_lock(self.lock_path):
+            self._save(self._scan())
+    
+    def _load(self) -> Dict[str, Any]:
+        """Return the current manifest, rereading it only if it changed on disk."""
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_ino)
+        except FileNotFoundError:
+            signature = None
+        
+        if self._manifest is not None and signature == self._signature:
+            return self._manifest
+        
+        manifest = None
+        if signature is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    manifest = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                self.logger.warning(f"Rebuilding unreadable manifest {self.path}: {str(e)}")
+        
+        if manifest is None:
+            manifest = self._scan()
+            self._save(manifest)
+        else:
+            self._manifest = manifest
+            self._signature = signature
+        
+        return manifest
+    
+    def _save(self, manifest: Dict[str, Any]):
+        """Atomically write the manifest (no fsync - it can be rebuilt)."""
+        atomic_write_text(self.path, json.dumps(manifest, indent=2), fsync=False)
+        
+        stat = self.path.stat()
+        self._manifest = manifest
+        self._signature = (stat.st_mtime_ns, stat.st_ino)
+    
+    def _scan(self) -> Dict[str, Any]:
+        """Build a manifest from the files currently on disk."""
+        manifest = self._empty()
+        data_files = (
+            list(self.data_directory.glob("*.json")) 
+            + list(self.data_directory.glob("*.jsonl")) 
+            + list(self.data_directory.glob(f"*{COLUMNAR_SUFFIX}"))
+        )
+        
+        for data_file in data_files:
+            if data_file.name == self.FILENAME:
+                continue
+            
+            sports = None
+            if "games_" in data_file.name:
+                try:
+                    with open(data_file, 'r') as f:
+                        games = json.load(f)
+                    sports = [game.get("sport", "Unknown") for game in games]
+                except Exception:
+                    sports = []
+            
+            self._add_entry(manifest, self._describe(data_file, sports))
+        
+        return manifest
+    
+    def _empty(self) -> Dict[str, Any]:
+        """An empty manifest."""
+        return {
+            "counts": {key: 0 for key in self.COUNT_KEYS.values()},
+            "sport_files": {},
+            "last_upload": None,
+            "files": {}
+        }
+    
+    def _describe(self, data_file: Path, sports: Optional[List[str]]) -> Dict[str, Any]:
+        """Build a manifest entry for a file."""
+        stat = data_file.stat()
+        size = stat.st_size
+        if data_file.is_dir():
+            size = sum(part.stat().st_size for part in data_file.iterdir())
+        
+        return {
+            "filename": data_file.name,
+            "data_type": self._classify(data_file.name),
+            "size": size,
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "sports": sorted(set(sports or []))
+        }
+    
+    def _classify(self, filename: str) -> Optional[str]:
+        """Data type of a file by name (same rules as the original scan)."""
+        if "games_" in filename:
+            return "games"
+        if "odds_" in filename:
+            return "odds"
+        if "public_betting_" in filename:
+            return "public_betting"
+        if "line_movements" in filename:
+            return "line_movements"
+        return None
+    
+    def _add_entry(self, manifest: Dict[str, Any], entry: Dict[str, Any]):
+        """Add an entry and its contribution to the aggregates."""
+        manifest["files"][entry["filename"]] = entry
+        
+        count_key = self.COUNT_KEYS.get(entry["data_type"])
+        if count_key:
+            manifest["counts"][count_key] += 1
+        
+        for sport in entry["sports"]:
+            manifest["sport_files"][sport] = manifest["sport_files"].get(sport, 0) + 1
+        
+        if manifest["last_upload"] is None or entry["modified"] > manifest["last_upload"]:
+            manifest["last_upload"] = entry["modified"]
+    
+    def _remove_entry(self, manifest: Dict[str, Any], filename: str) -> bool:
+        """Remove an entry and its contribution to the aggregates."""
+        entry = manifest["files"].pop(filename, None)
+        if entry is None:
+            return False
+        
+        count_key = self.COUNT_KEYS.get(entry["data_type"])
+        if count_key:
+            manifest["counts"][count_key] -= 1
+        
+        for sport in entry["sports"]:
+            manifest["sport_files"][sport] -= 1
+            if manifest["sport_files"][sport] <= 0:
+                del manifest["sport_files"][sport]
+        
+        if entry["modified"] == manifest["last_upload"]:
+            manifest["last_upload"] = max(
+                (other["modified"] for other in manifest["files"].values()), default=None
+            )
+        
+        return True
+
+
 class DataInputManager:
     """Manages all data input for the Sharp Betting Predictor."""
     
-    def __init__(self, data_directory: str = "data"):
+    def __init__(
+        self, 
+        data_directory: str = "data", 
+        database_path: Optional[str] = None,
+        storage_format: Optional[str] = None
+    ):
         self.data_directory = Path(data_directory)
         self.data_directory.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
         
+        # "json" or "columnar" (odds, public_betting and line_movements only)
+        self.storage_format = storage_format or DATA_STORAGE_FORMAT
+        
+        # Maintained summary of data files (see get_data_summary)
+        self.manifest = DataManifest(self.data_directory)
+        
+        # Concurrent add_line_movement calls share grouped atomic commits
+        self.line_movement_writer = GroupCommitWriter(
+            self._commit_line_movements, name="line-movements"
+        )
+        # JSON-lines segment this manager appends line movements to
+        self._line_movement_segment: Optional[Path] = None
+        
+        # Indexed game store (None = scan games_*.json files)
+        database_path = database_path or GAME_DATABASE_PATH
+        self.game_store = SQLiteGameStore(database_path) if database_path else None
+        
+        if self.game_store:
+            # Migrate game files that are new or changed since the last import
+            imported = self.game_store.import_json_files(str(self.data_directory))
+            if imported:
+                self.logger.info(f"Imported {imported} games into {database_path}")
+        
         # Validation rules
         self.required_csv_columns = {
             "odds": ["game_id", "book", "bet_type", "odds"],
@@ -75,6 +775,45 @@ class DataInputManager:
             "line_movements": ["game_id", "book", "from_line", "to_line", "timestamp"],
             "games": ["game_id", "sport", "home_team", "away_team", "game_date"]
         }
+        
+        # Rows per chunk for streaming CSV uploads
+        self.csv_chunk_size = 50000
+        
+        # Callbacks notified with changed game IDs (None = unknown/all)
+        self._change_listeners: List[Callable[[Optional[List[str]]], None]] = []
+    
+    def add_change_listener(self, listener: Callable[[Optional[List[str]]], None]):
+        """
+        Register a callback for data changes.
+        
+        Args:
+            listener: Called with the list of changed game IDs after each
+                write, or None when the affected games are unknown
+        """
+        self._change_listeners.append(listener)
+    
+    def _notify_change(self, game_ids: Optional[List[str]]):
+        """Notify change listeners about written game data."""
+        for listener in self._change_listeners:
+            try:
+                listener(game_ids)
+            except Exception as e:
+                self.logger.error(f"Error in change listener: {str(e)}")
+    
+    def _extract_game_ids(self, records: Any) -> Optional[List[str]]:
+        """Collect game IDs from written records (None if any are missing)."""
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list):
+            return None
+        
+        game_ids = []
+        for record in records:
+            if not isinstance(record, dict) or "game_id" not in record:
+                return None
+            game_ids.append(record["game_id"])
+        
+        return sorted(set(game_ids))
     
     def upload_csv_data(self, file_content: str, data_type: str) -> Dict[str, Any]:
         """
@@ -104,11 +843,12 @@ class DataInputManager:
             processed_data = self._process_csv_data(rows, data_type)
             
             # Save to file
-            filename = f"{data_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            filepath = self.data_directory / filename
+            filename = self._save_records(
+                processed_data, data_type, f"{data_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            )
             
-            with open(filepath, 'w') as f:
-                json.dump(processed_data, f, indent=2, default=str)
+            self._store_records(processed_data, data_type)
+            self._notify_change(self._extract_game_ids(processed_data))
             
             return {
                 "success": True,
@@ -125,6 +865,282 @@ class DataInputManager:
                 "error": str(e)
             }
     
+    def _save_records(self, records: Any, data_type: str, stem: str) -> str:
+        """
+        Write processed records in the configured storage format.
+        
+        Args:
+            records: Processed records
+            data_type: Type of data
+            stem: Filename without extension
+            
+        Returns:
+            Name of the written file or dataset directory
+        """
+        if (self.storage_format == "columnar" 
+                and data_type in MARKET_DATA_SCHEMAS 
+                and isinstance(records, list) 
+                and all(isinstance(record, dict) for record in records)):
+            filename = f"{stem}{COLUMNAR_SUFFIX}"
+            write_columnar(records, self.data_directory / filename, data_type)
+        else:
+            filename = f"{stem}.json"
+            atomic_write_text(self.data_directory / filename, json.dumps(records, indent=2, default=str))
+        
+        self.manifest.record_file(self.data_directory / filename, self._extract_sports(records, data_type))
+        return filename
+    
+    def _extract_sports(self, records: Any, data_type: str) -> Optional[List[str]]:
+        """Collect the sports in a games upload (None for other data types)."""
+        if data_type != "games":
+            return None
+        if isinstance(records, dict):
+            records = [records]
+        
+        return sorted({
+            record.get("sport", "Unknown") 
+            for record in records if isinstance(record, dict)
+        })
+    
+    def load_market_data(
+        self, 
+        data_type: str, 
+        columns: Optional[List[str]] = None, 
+        date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load stored odds, public betting or line movement records.
+        
+        Columnar datasets memory-map only the requested columns; JSON files
+        are parsed in full and then narrowed.
+        
+        Args:
+            data_type: "odds", "public_betting" or "line_movements"
+            columns: Columns to load (all if None)
+            date: Upload date as YYYYMMDD (all uploads if None)
+            
+        Returns:
+            DataFrame of the matching records
+        """
+        def in_date(path: Path) -> bool:
+            return date is None or path.name.startswith(f"{data_type}_{date}")
+        
+        frames = []
+        
+        for dataset_path in find_columnar_datasets(self.data_directory, data_type):
+            if not in_date(dataset_path):
+                continue
+            
+            dataset = ColumnarDataset(dataset_path)
+            wanted = [c for c in columns if c in dataset.columns] if columns else None
+            frames.append(dataset.to_dataframe(wanted))
+        
+        data_files = list(self.data_directory.glob(f"{data_type}*.json"))
+        data_files += self.data_directory.glob(f"{data_type}_*.jsonl")
+        
+        for data_file in sorted(data_files):
+            if not in_date(data_file):
+                continue
+            
+            try:
+                if data_file.suffix == ".jsonl":
+                    records = read_json_lines(data_file)
+                else:
+                    with open(data_file, 'r') as f:
+                        records = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                self.logger.error(f"Error reading {data_file}: {str(e)}")
+                continue
+            
+            if isinstance(records, dict):
+                records = [records]
+            
+            frame = pd.DataFrame.from_records(records)
+            if columns:
+                frame = frame[[c for c in columns if c in frame.columns]]
+            frames.append(frame)
+        
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+        
+        return pd.concat(frames, ignore_index=True)
+    
+    def upload_csv_stream(
+        self, 
+        file_obj: Any, 
+        data_type: str, 
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a CSV upload to disk in fixed-size chunks.
+        
+        Rows are converted a chunk at a time with vectorized pandas
+        operations and appended to the output JSON array as they are read,
+        so memory is bounded by the chunk size rather than the upload size.
+        The output file is renamed into place only once complete.
+        
+        Args:
+            file_obj: File-like object (text or binary) with CSV content
+            data_type: Type of data ("odds", "public_betting", "line_movements", "games")
+            chunk_size: Rows per chunk (defaults to self.csv_chunk_size)
+            
+        Returns:
+            Dict with upload id and counts (no row data)
+        """
+        chunk_size = chunk_size or self.csv_chunk_size
+        upload_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        filename = f"{data_type}_{upload_id}.json"
+        filepath = self.data_directory / filename
+        temp_path = self.data_directory / f".{filename}.tmp"
+        
+        processed_rows = 0
+        chunks = 0
+        game_ids = set()
+        sports = set()
+        header_valid = True
+        
+        try:
+            reader = pd.read_csv(
+                file_obj, 
+                dtype=str, 
+                keep_default_na=False, 
+                na_filter=False,
+                chunksize=chunk_size,
+                encoding="utf-8"
+            )
+            
+            with open(temp_path, 'w') as out:
+                out.write("[")
+                
+                for chunk in reader:
+                    if chunks == 0 and not self._validate_csv_header(list(chunk.columns), data_type):
+                        header_valid = False
+                        break
+                    
+                    if chunk.empty:
+                        continue
+                    
+                    processed = self._process_csv_chunk(chunk, data_type)
+                    records_json = processed.to_json(orient="records", double_precision=15)
+                    
+                    if processed_rows:
+                        out.write(",")
+                    out.write(records_json[1:-1])
+                    
+                    if "game_id" in processed.columns:
+                        game_ids.update(processed["game_id"].unique())
+                    if data_type == "games" and "sport" in processed.columns:
+                        sports.update(processed["sport"].unique())
+                    if self.game_store:
+                        self._store_records(json.loads(records_json), data_type)
+                    
+                    processed_rows += len(processed)
+                    chunks += 1
+                
+                out.write("]")
+            
+            if processed_rows == 0:
+                header_valid = False
+            else:
+                temp_path.replace(filepath)
+                self.manifest.record_file(filepath, sorted(sports) if data_type == "games" else None)
+            
+        except pd.errors.EmptyDataError:
+            header_valid = False
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            self.logger.error(f"Error streaming CSV: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        if not header_valid:
+            temp_path.unlink(missing_ok=True)
+            return {
+                "success": False,
+                "error": f"Invalid CSV format for {data_type}",
+                "required_columns": self.required_csv_columns.get(data_type, [])
+            }
+        
+        self._notify_change(sorted(game_ids) if game_ids else None)
+        
+        return {
+            "success": True,
+            "upload_id": upload_id,
+            "data_type": data_type,
+            "filename": filename,
+            "processed_rows": processed_rows,
+            "chunks": chunks
+        }
+    
+    def _validate_csv_header(self, columns: List[str], data_type: str) -> bool:
+        """Validate CSV header has required columns."""
+        required_cols = self.required_csv_columns.get(data_type, [])
+        return set(required_cols).issubset(columns)
+    
+    def _process_csv_chunk(self, chunk: pd.DataFrame, data_type: str) -> pd.DataFrame:
+        """Vectorized equivalent of _process_csv_data for one chunk."""
+        now = datetime.now().isoformat()
+        
+        def column(name: str, default: str) -> pd.Series:
+            if name in chunk.columns:
+                return chunk[name]
+            return pd.Series(default, index=chunk.index, dtype=object)
+        
+        if data_type == "odds":
+            line_value = pd.to_numeric(column("line_value", ""), errors="coerce")
+            odds = pd.DataFrame({
+                "game_id": chunk["game_id"],
+                "book": chunk["book"],
+                "bet_type": chunk["bet_type"],
+                "odds": pd.to_numeric(chunk["odds"], errors="raise").astype("int64"),
+                "line_value": line_value.astype(object).where(line_value.notna(), None),
+                "timestamp": column("timestamp", now)
+            })
+            if "side" in chunk.columns:
+                odds["side"] = chunk["side"].where(chunk["side"] != "", None)
+            return odds
+        
+        elif data_type == "public_betting":
+            bets_pct = pd.to_numeric(chunk["bets_pct"], errors="raise").astype(float)
+            money_pct = pd.to_numeric(chunk["money_pct"], errors="raise").astype(float)
+            return pd.DataFrame({
+                "game_id": chunk["game_id"],
+                "bet_type": chunk["bet_type"],
+                "side": column("side", "home"),
+                "bets_percentage": bets_pct,
+                "money_percentage": money_pct,
+                "split_difference": money_pct - bets_pct,
+                "timestamp": column("timestamp", now)
+            })
+        
+        elif data_type == "line_movements":
+            from_line = pd.to_numeric(chunk["from_line"], errors="raise").astype(float)
+            to_line = pd.to_numeric(chunk["to_line"], errors="raise").astype(float)
+            return pd.DataFrame({
+                "game_id": chunk["game_id"],
+                "book": chunk["book"],
+                "bet_type": column("bet_type", "moneyline"),
+                "from_line": from_line,
+                "to_line": to_line,
+                "movement_size": (to_line - from_line).abs(),
+                "direction": (to_line > from_line).map({True: "up", False: "down"}),
+                "timestamp": column("timestamp", now)
+            })
+        
+        elif data_type == "games":
+            return pd.DataFrame({
+                "game_id": chunk["game_id"],
+                "sport": chunk["sport"],
+                "home_team": chunk["home_team"],
+                "away_team": chunk["away_team"],
+                "game_date": chunk["game_date"],
+                "created_at": now
+            })
+        
+        return chunk
+    
     def upload_json_data(self, json_content: str, data_type: str) -> Dict[str, Any]:
         """
         Upload and process JSON data.
@@ -150,11 +1166,12 @@ class DataInputManager:
             processed_data = self._process_json_data(data, data_type)
             
             # Save to file
-            filename = f"{data_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            filepath = self.data_directory / filename
+            filename = self._save_records(
+                processed_data, data_type, f"{data_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            )
             
-            with open(filepath, 'w') as f:
-                json.dump(processed_data, f, indent=2, default=str)
+            self._store_records(processed_data, data_type)
+            self._notify_change(self._extract_game_ids(processed_data))
             
             return {
                 "success": True,
@@ -175,6 +1192,91 @@ class DataInputManager:
                 "error": str(e)
             }
     
+    def upload_json_stream(self, file_obj: Any, data_type: str) -> Dict[str, Any]:
+        """
+        Stream a large JSON array upload to disk one record at a time.
+        
+        Args:
+            file_obj: File-like object (text or binary) with a JSON array
+                or single JSON object
+            data_type: Type of data
+            
+        Returns:
+            Dict with upload id and counts (no record data)
+        """
+        upload_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        filename = f"{data_type}_{upload_id}.json"
+        filepath = self.data_directory / filename
+        temp_path = self.data_directory / f".{filename}.tmp"
+        
+        processed_records = 0
+        game_ids = set()
+        sports = set()
+        batch = []
+        
+        try:
+            with open(temp_path, 'w') as out:
+                out.write("[")
+                
+                for record in iter_json_records(file_obj):
+                    if not self._validate_json_structure(record, data_type):
+                        raise ValueError(f"Invalid JSON structure for {data_type}")
+                    
+                    record = self._process_json_data(record, data_type)
+                    
+                    if processed_records:
+                        out.write(",")
+                    json.dump(record, out, default=str)
+                    processed_records += 1
+                    
+                    if isinstance(record, dict) and "game_id" in record:
+                        game_ids.add(record["game_id"])
+                    sports.update(self._extract_sports(record, data_type) or [])
+                    
+                    if self.game_store:
+                        batch.append(record)
+                        if len(batch) >= self.csv_chunk_size:
+                            self._store_records(batch, data_type)
+                            batch = []
+                
+                out.write("]")
+            
+            if batch:
+                self._store_records(batch, data_type)
+            
+            temp_path.replace(filepath)
+            self.manifest.record_file(filepath, sorted(sports) if data_type == "games" else None)
+            
+        except json.JSONDecodeError as e:
+            temp_path.unlink(missing_ok=True)
+            return {
+                "success": False,
+                "error": f"Invalid JSON format: {str(e)}"
+            }
+        except ValueError as e:
+            temp_path.unlink(missing_ok=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            self.logger.error(f"Error streaming JSON: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        self._notify_change(sorted(game_ids) if game_ids else None)
+        
+        return {
+            "success": True,
+            "upload_id": upload_id,
+            "data_type": data_type,
+            "filename": filename,
+            "processed_records": processed_records
+        }
+    
     def create_manual_game_entry(
         self,
         sport: str,
@@ -269,25 +1371,62 @@ class DataInputManager:
             "timestamp": timestamp or datetime.now().isoformat()
         }
         
-        # Save to movements file
-        movements_file = self.data_directory / "line_movements.json"
-        
-        if movements_file.exists():
-            with open(movements_file, 'r') as f:
-                movements = json.load(f)
-        else:
-            movements = []
-        
-        movements.append(movement_data)
+        try:
+            self.line_movement_writer.write(movement_data)
+        except Exception as e:
+            self.logger.error(f"Error saving line movement: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
         
-        with open(movements_file, 'w') as f:
-            json.dump(movements, f, indent=2)
+        self._notify_change([game_id])
         
         return {
             "success": True,
             "movement_added": movement_data
         }
     
+    def _commit_line_movements(self, movements: List[Dict[str, Any]]):
+        """
+        Append a batch of line movements in one commit.
+        
+        The batch is appended to this manager's JSON-lines segment
+        (line_movements_<date>_<time>_<id>.jsonl), so a commit writes only
+        its own records; a new segment starts once the current one reaches
+        LINE_MOVEMENT_SEGMENT_BYTES. Compaction (data_compaction.py) folds
+        segments into daily partitions under the same file lock.
+        
+        Args:
+            movements: Movement records from the group-commit writer
+        """
+        with file_lock(self.data_directory / ".line_movements.lock"):
+            segment = self._current_line_movement_segment()
+            append_lines(segment, [json.dumps(movement) for movement in movements])
+        
+        if self.game_store:
+            self.game_store.add_line_movements(movements)
+        
+        self.manifest.record_file(segment)
+    
+    def _current_line_movement_segment(self) -> Path:
+        """Segment for the next line movement batch, starting a new one when needed."""
+        segment = self._line_movement_segment
+        
+        try:
+            reusable = segment is not None and segment.stat().st_size < LINE_MOVEMENT_SEGMENT_BYTES
+        except FileNotFoundError:
+            # Folded into partitions by compaction
+            reusable = False
+        
+        if not reusable:
+            segment = self.data_directory / (
+                f"line_movements_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.jsonl"
+            )
+            self._line_movement_segment = segment
+        
+        return segment
+    
     def get_game_data(self, game_id: str) -> Optional[GameData]:
         """
         Retrieve game data by ID.
@@ -298,39 +1437,291 @@ class DataInputManager:
         Returns:
             GameData object if found, None otherwise
         """
-        # Look through all game files
-        for game_file in self.data_directory.glob("games_*.json"):
-            with open(game_file, 'r') as f:
-                games = json.load(f)
-                
-                for game in games:
-                    if game.get("game_id") == game_id:
-                        return self._dict_to_game_data(game)
+        if self.game_store:
+            game = self.game_store.get_game(game_id)
+            return self._dict_to_game_data(game) if game else None
         
-        return None
+        # O(1) lookup in the parsed game file cache
+        _, games_by_id = GAME_FILE_CACHE.get_games(self.data_directory, self._dict_to_game_data)
+        return games_by_id.get(game_id)
     
-    def get_all_games(self, sport: Optional[str] = None) -> List[GameData]:
+    def get_all_games(
+        self, 
+        sport: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[GameData]:
         """
-        Get all game data, optionally filtered by sport.
+        Get all game data, optionally filtered by sport and game date.
         
         Args:
             sport: Sport filter (optional)
+            start_date: Earliest game date, inclusive (optional)
+            end_date: Latest game date, inclusive (optional)
             
         Returns:
             List of GameData objects
         """
-        all_games = []
+        if self.game_store:
+            return [
+                self._dict_to_game_data(game)
+                for game in self.game_store.get_games(sport, start_date, end_date)
+            ]
         
-        for game_file in self.data_directory.glob("games_*.json"):
-            with open(game_file, 'r') as f:
-                games = json.load(f)
-                
-                for game in games:
-                    game_data = self._dict_to_game_data(game)
-                    if sport is None or game_data.sport.lower() == sport.lower():
-                        all_games.append(game_data)
+        games, _ = GAME_FILE_CACHE.get_games(self.data_directory, self._dict_to_game_data)
+        
+        return [
+            game_data for game_data in games
+            if self._matches_filters(game_data, sport, start_date, end_date)
+        ]
+    
+    def changed_game_ids(
+        self, 
+        since: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Optional[Set[str]]]:
+        """
+        Find the games whose stored data changed since an earlier call.
+        
+        Lets readers that cache derived results (MaterializedOpportunitySet)
+        pick up writes from any process, notified or not, at a cost that
+        follows the size of the change:
+        - Line movement segments are append-only; only bytes appended
+          since the last call are read
+        - The SQLite game store keeps a change log; only entries after the
+          last seen sequence number are read
+        - Other files are replaced by rename, which changes the directory
+          mtime; only then are they statted and diffed by (mtime, size)
+        
+        Args:
+            since: Version returned by a previous call (None for the first)
+            
+        Returns:
+            Tuple of (current version, changed game IDs); the IDs are None
+            on the first call
+        """
+        checked_at = time.time_ns()
+        directory_mtime = self.data_directory.stat().st_mtime_ns
+        changed: Set[str] = set()
+        
+        store_sequence = None
+        if self.game_store:
+            if since is None:
+                store_sequence = self.game_store.change_sequence()
+            else:
+                store_sequence, store_changes = self.game_store.changes_since(since["store_sequence"])
+                changed |= store_changes
+        
+        # A directory mtime within the clock granularity of the last check
+        # may hide a later change, so only trust it once it is old enough
+        if (
+            since is not None 
+            and since["directory_mtime"] == directory_mtime 
+            and since["checked_at"] - directory_mtime > DIRECTORY_MTIME_GRANULARITY_NS
+        ):
+            sources = since["sources"]
+            segment_paths = list(since["segments"])
+        else:
+            sources = self._file_source_game_ids()
+            segment_paths = [str(path) for path in sorted(self.data_directory.glob("line_movements_*.jsonl"))]
+            if since is not None:
+                for path in set(since["sources"]) | set(sources):
+                    old, new = since["sources"].get(path), sources.get(path)
+                    if old is None or new is None or old[0] != new[0]:
+                        changed.update(old[1] if old else ())
+                        changed.update(new[1] if new else ())
+        
+        segments = {}
+        for path in segment_paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            
+            previous = since["segments"].get(path) if since else None
+            if previous is not None and previous[0] == stat.st_ino and previous[1] <= stat.st_size:
+                if previous[1] == stat.st_size:
+                    segments[path] = previous
+                    continue
+                records, consumed = read_json_lines_from(Path(path), previous[1])
+                game_ids = previous[2] | {record["game_id"] for record in records if record.get("game_id")}
+            else:
+                # New or rewritten (compacted) segment
+                records, consumed = read_json_lines_from(Path(path), 0)
+                game_ids = frozenset(record["game_id"] for record in records if record.get("game_id"))
+                changed.update(previous[2] if previous else ())
+            
+            changed.update(record["game_id"] for record in records if record.get("game_id"))
+            segments[path] = (stat.st_ino, consumed, game_ids)
+        
+        if since is not None:
+            for path, previous in since["segments"].items():
+                if path not in segments:
+                    changed.update(previous[2])
+        
+        version = {
+            "checked_at": checked_at,
+            "directory_mtime": directory_mtime,
+            "sources": sources,
+            "segments": segments,
+            "store_sequence": store_sequence
+        }
+        
+        return version, (None if since is None else changed)
+    
+    def _file_source_game_ids(self) -> Dict[str, Tuple[tuple, Iterable[str]]]:
+        """
+        Signature and game IDs of every stored file other than line
+        movement segments (games files only without a game store).
+        """
+        if self.game_store:
+            sources = {}
+        else:
+            sources = GAME_FILE_CACHE.file_game_ids(self.data_directory, self._dict_to_game_data)
+        
+        for data_type in ("odds", "public_betting", "line_movements"):
+            sources.update(
+                (path, entry) 
+                for path, entry in MARKET_RECORD_CACHE.source_game_ids(self.data_directory, data_type).items() 
+                if not path.endswith(".jsonl")
+            )
+        
+        return sources
+    
+    def assemble_games(
+        self, 
+        sport: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        game_ids: Optional[Iterable[str]] = None
+    ) -> List[GameData]:
+        """
+        Get games with separately uploaded odds, public betting and line
+        movement data joined in.
+        
+        Market records are indexed into a MarketDataIndex (hash tables
+        keyed by game_id), restricted to the requested games when game_ids
+        is given, and each game probes it. Market rows for games
+        without a games record are skipped.
+        
+        Args:
+            sport: Sport filter (optional)
+            start_date: Earliest game date, inclusive (optional)
+            end_date: Latest game date, inclusive (optional)
+            game_ids: Only assemble these games (optional)
+            
+        Returns:
+            List of GameData objects with joined market data
+        """
+        if game_ids is not None:
+            games = [game for game in map(self.get_game_data, sorted(set(game_ids))) if game is not None]
+            games = [game for game in games if self._matches_filters(game, sport, start_date, end_date)]
+            index = self.build_market_index(game.game_id for game in games)
+        else:
+            all_games = self.get_all_games()
+            games = [game for game in all_games if self._matches_filters(game, sport, start_date, end_date)]
+            index = self.build_market_index()
+            
+            unmatched = index.game_ids - {game.game_id for game in all_games}
+            if unmatched:
+                self.logger.warning(f"Market data for {len(unmatched)} games without a games record")
+        
+        assembled = []
+        
+        for game in games:
+            joined = index.join(
+                game.game_id, game.odds_data, game.public_betting_data, game.line_movement_data
+            )
+            if joined is None:
+                assembled.append(game)
+            else:
+                odds_data, public_betting_data, line_movement_data = joined
+                assembled.append(replace(
+                    game,
+                    odds_data=odds_data,
+                    public_betting_data=public_betting_data,
+                    line_movement_data=line_movement_data
+                ))
+        
+        return assembled
+    
+    def build_market_index(self, game_ids: Optional[Iterable[str]] = None) -> MarketDataIndex:
+        """
+        Index stored odds, public betting and line movement records.
+        
+        Records come from MARKET_RECORD_CACHE, so only sources that changed
+        since the last call are read again.
+        
+        Args:
+            game_ids: Only index these games (all games if None)
+            
+        Returns:
+            MarketDataIndex keyed by game_id
+        """
+        wanted = None if game_ids is None else set(game_ids)
+        
+        index = MarketDataIndex()
+        index.add_odds(self._iter_market_records("odds", wanted))
+        index.add_public_betting(self._iter_market_records("public_betting", wanted))
+        index.add_line_movements(self._iter_market_records("line_movements", wanted))
+        return index
+    
+    def _iter_market_records(
+        self, 
+        data_type: str, 
+        game_ids: Optional[set] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield stored records of one data type, oldest upload first."""
+        for grouped in MARKET_RECORD_CACHE.get_sources(self.data_directory, data_type):
+            wanted = grouped if game_ids is None else [game_id for game_id in game_ids if game_id in grouped]
+            for game_id in wanted:
+                yield from grouped[game_id]
+    
+    def _matches_filters(
+        self, 
+        game_data: GameData,
+        sport: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> bool:
+        """Check a game against sport/date filters."""
+        if sport is not None and game_data.sport.lower() != sport.lower():
+            return False
+        if start_date is not None and game_data.game_date < start_date:
+            return False
+        if end_date is not None and game_data.game_date > end_date:
+            return False
+        return True
+    
+    def _store_records(self, records: Any, data_type: str):
+        """
+        Write uploaded records to the game store.
+        
+        Odds and public betting rows are folded per game and bet type the
+        same way MarketDataIndex joins them, then merged into the store's
+        child tables.
+        """
+        if not self.game_store:
+            return
+        
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list):
+            return
         
-        return all_games
+        records = [r for r in records if isinstance(r, dict) and "game_id" in r]
+        
+        if data_type == "games":
+            self.game_store.upsert_games([r for r in records if "sport" in r])
+        elif data_type == "line_movements":
+            self.game_store.add_line_movements(records)
+        elif data_type == "odds":
+            index = MarketDataIndex()
+            index.add_odds(records)
+            self.game_store.merge_market_data("odds", index.odds)
+        elif data_type == "public_betting":
+            index = MarketDataIndex()
+            index.add_public_betting(records)
+            self.game_store.merge_market_data("public_betting", index.public_betting)
     
     def _validate_csv_columns(self, rows: List[Dict], data_type: str) -> bool:
         """Validate CSV has required columns."""
@@ -371,6 +1762,8 @@ class DataInputManager:
                     "line_value": float(row.get("line_value", 0)) if row.get("line_value") else None,
                     "timestamp": row.get("timestamp", datetime.now().isoformat())
                 }
+                if "side" in row:
+                    processed_row["side"] = row["side"] or None
             
             elif data_type == "public_betting":
                 processed_row = {
@@ -425,17 +1818,25 @@ class DataInputManager:
         return data
     
     def _dict_to_game_data(self, game_dict: Dict) -> GameData:
-        """Convert dictionary to GameData object."""
+        """Convert dictionary to GameData object (repeated strings interned)."""
+        odds_data = game_dict.get("odds_data", {})
+        for odds_info in odds_data.values():
+            if isinstance(odds_info, dict):
+                intern_categoricals(odds_info)
+        
         return GameData(
-            game_id=game_dict["game_id"],
-            sport=game_dict["sport"],
-            home_team=game_dict["home_team"],
-            away_team=game_dict["away_team"],
+            game_id=sys.intern(game_dict["game_id"]),
+            sport=sys.intern(game_dict["sport"]),
+            home_team=sys.intern(game_dict["home_team"]),
+            away_team=sys.intern(game_dict["away_team"]),
             game_date=datetime.fromisoformat(game_dict["game_date"]) if isinstance(game_dict["game_date"], str) else game_dict["game_date"],
             matchup_data=game_dict.get("matchup_data", {}),
-            odds_data=game_dict.get("odds_data", {}),
+            odds_data=odds_data,
             public_betting_data=game_dict.get("public_betting_data", {}),
-            line_movement_data=game_dict.get("line_movement_data", []),
+            line_movement_data=[
+                intern_categoricals(movement) if isinstance(movement, dict) else movement
+                for movement in game_dict.get("line_movement_data", [])
+            ],
             model_predictions=game_dict.get("model_predictions"),
             sharp_indicators=game_dict.get("sharp_indicators"),
             metadata=game_dict.get("metadata", {})
@@ -453,9 +1854,10 @@ class DataInputManager:
         """
         templates = {
             "odds": [
-                ["game_id", "book", "bet_type", "odds", "line_value", "timestamp"],
-                ["MLB_NYY_BOS_2025-01-15", "DraftKings", "moneyline", "-150", "", "2025-01-15 19:00:00"],
-                ["MLB_NYY_BOS_2025-01-15", "DraftKings", "spread", "-110", "-1.5", "2025-01-15 19:00:00"]
+                ["game_id", "book", "bet_type", "side", "odds", "line_value", "timestamp"],
+                ["MLB_NYY_BOS_2025-01-15", "DraftKings", "moneyline", "home", "-150", "", "2025-01-15 19:00:00"],
+                ["MLB_NYY_BOS_2025-01-15", "DraftKings", "moneyline", "away", "+130", "", "2025-01-15 19:00:00"],
+                ["MLB_NYY_BOS_2025-01-15", "DraftKings", "spread", "", "-110", "-1.5", "2025-01-15 19:00:00"]
             ],
             "public_betting": [
                 ["game_id", "bet_type", "side", "bets_pct", "money_pct", "timestamp"],
@@ -486,51 +1888,23 @@ class DataInputManager:
         
         return output.getvalue()
     
-    def get_data_summary(self) -> Dict[str, Any]:
-        """Get summary of all uploaded data."""
-        summary = {
-            "games_count": 0,
-            "odds_files": 0,
-            "public_betting_files": 0,
-            "line_movement_files": 0,
-            "last_upload": None,
-            "sports": set(),
-            "data_files": []
-        }
-        
-        for data_file in self.data_directory.glob("*.json"):
-            file_info = {
-                "filename": data_file.name,
-                "size": data_file.stat().st_size,
-                "modified": datetime.fromtimestamp(data_file.stat().st_mtime).isoformat()
-            }
-            summary["data_files"].append(file_info)
-            
-            if "games_" in data_file.name:
-                summary["games_count"] += 1
-                
-                # Count sports
-                try:
-                    with open(data_file, 'r') as f:
-                        games = json.load(f)
-                        for game in games:
-                            summary["sports"].add(game.get("sport", "Unknown"))
-                except:
-                    pass
-            
-            elif "odds_" in data_file.name:
-                summary["odds_files"] += 1
-            elif "public_betting_" in data_file.name:
-                summary["public_betting_files"] += 1
-            elif "line_movements" in data_file.name:
-                summary["line_movement_files"] += 1
+    def get_data_summary(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get summary of all uploaded data.
         
-        summary["sports"] = list(summary["sports"])
+        Served from the maintained manifest; files written outside this
+        class are only picked up after a refresh.
         
-        if summary["data_files"]:
-            summary["last_upload"] = max(f["modified"] for f in summary["data_files"])
+        Args:
+            refresh: Rebuild the manifest from a directory scan first
+            
+        Returns:
+            Dict with file counts, sports, last upload time and file list
+        """
+        if refresh:
+            self.manifest.rebuild()
         
-        return summary
+        return self.manifest.summary()
 
 
 # Helper functions for easy data creation
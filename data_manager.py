@@ -17,6 +17,7 @@ import os
 import json
 import time
 import requests
+import shutil
 import zipfile
 import pandas as pd
 from datetime import datetime, timedelta
@@ -33,9 +34,15 @@ from footystats_config import (
     LEAGUE_BY_COUNTRY,
     FOOTYSTATS_BASE_URL,
     FOOTYSTATS_ENDPOINTS,
-    get_league_teams_url,
-    get_league_season_url
+    get_league_matches_url,
+    get_league_teams_url
 )
+from download_manifest import DownloadManifest, season_is_finished
+from columnar_store import COLUMNAR_SUFFIX
+from data_sidecars import StatusIndex, time_range
+from historical_dataset import SCHEMA_VERSION, flatten_mlb_game, flatten_soccer_match, write_partition
+from processing_state import ProcessingState
+from rate_limiter import RateLimitedSession, download_concurrently
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,6 +53,7 @@ DATA_DIR = Path("data")
 MLB_DATA_DIR = DATA_DIR / "mlb"
 SOCCER_DATA_DIR = DATA_DIR / "soccer"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
+PROCESSING_STATE_FILE = PROCESSED_DATA_DIR / ".processing_state.json"
 
 # Create directories
 for dir_path in [DATA_DIR, MLB_DATA_DIR, SOCCER_DATA_DIR, PROCESSED_DATA_DIR]:
@@ -53,6 +61,14 @@ for dir_path in [DATA_DIR, MLB_DATA_DIR, SOCCER_DATA_DIR, PROCESSED_DATA_DIR]:
 
 # API Configuration
 SPORTSDATA_API_KEY = os.getenv("SPORTSDATA_API_KEY", "demo_key")
+SPORTSDATA_MLB_URL = "https://api.sportsdata.io/v3/mlb/scores/json"
+
+# Season-independent SportsData.io MLB resources, fetched once per run
+MLB_REFERENCE_ENDPOINTS = {
+    'teams': f'{SPORTSDATA_MLB_URL}/teams',
+    'players': f'{SPORTSDATA_MLB_URL}/Players',
+    'stadiums': f'{SPORTSDATA_MLB_URL}/Stadiums'
+}
 
 # Soccer Leagues Configuration (Updated with correct 2025 FootyStats League IDs)
 SOCCER_LEAGUES = LEAGUE_BY_COUNTRY
@@ -68,22 +84,32 @@ class DataManager:
     
     def __init__(self):
         """Initialize the data manager."""
-        self.session = requests.Session()
+        # Requests are throttled per provider, so downloads can run concurrently
+        self.session = RateLimitedSession()
         self.session.headers.update({
             'User-Agent': 'Universal-Betting-Dashboard/1.0',
             'Accept': 'application/json'
         })
+        
+        # Hashes/validators of downloaded resources; finished seasons are immutable
+        self.manifest = DownloadManifest(DATA_DIR / "download_manifest.json")
+        
+        # Sidecar metadata of every write; status calls read only these indexes
+        self.mlb_index = StatusIndex(MLB_DATA_DIR, ['*/*.json'])
+        self.soccer_index = StatusIndex(SOCCER_DATA_DIR, ['*/*/*.json'])
+        self.processed_index = StatusIndex(PROCESSED_DATA_DIR, [f'mlb/*{COLUMNAR_SUFFIX}', f'soccer/*/*/*{COLUMNAR_SUFFIX}'])
     
     # ========================================================================
     # Core Data Management Methods
     # ========================================================================
     
-    def download_all_historical_data(self, years: int = 3) -> Dict[str, bool]:
+    def download_all_historical_data(self, years: int = 3, force: bool = False) -> Dict[str, bool]:
         """
         Download all historical data for both MLB and Soccer.
         
         Args:
             years: Number of years to download (default: 3)
+            force: Re-download finished and unchanged seasons too
         
         Returns:
             Dict[str, bool]: Success status for each data source
@@ -94,11 +120,11 @@ class DataManager:
         
         # Download MLB data
         logger.info("⚾ Starting MLB data download...")
-        results['mlb'] = self.download_mlb_historical_data(years)
+        results['mlb'] = self.download_mlb_historical_data(years, force)
         
         # Download Soccer data
         logger.info("⚽ Starting Soccer data download...")
-        results['soccer'] = self.download_soccer_historical_data(years)
+        results['soccer'] = self.download_soccer_historical_data(years, force)
         
         # Process all downloaded data
         logger.info("🔄 Processing downloaded data...")
@@ -125,12 +151,17 @@ class DataManager:
     # ========================================================================
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def download_mlb_historical_data(self, years: int = 3) -> bool:
+    def download_mlb_historical_data(self, years: int = 3, force: bool = False) -> bool:
         """
         Download MLB historical data from SportsData.io.
         
+        Finished seasons already on disk are skipped; the current season and
+        the season-independent resources (teams, players, stadiums) are only
+        rewritten when their content changed.
+        
         Args:
             years: Number of years to download (default: 3)
+            force: Re-download everything, ignoring the download manifest
         
         Returns:
             bool: Success status
@@ -144,17 +175,19 @@ class DataManager:
         try:
             current_year = datetime.now().year
             
+            # Season-independent resources, once rather than once per season
+            reference_dir = MLB_DATA_DIR / "reference"
+            reference_dir.mkdir(exist_ok=True)
+            for data_type, url in MLB_REFERENCE_ENDPOINTS.items():
+                self._download_resource(f"mlb/reference/{data_type}", url, reference_dir / f"{data_type}.json", force=force)
+            
             for year_offset in range(years):
                 season = current_year - year_offset
                 
                 # Download season data
-                success = self._download_mlb_season(season)
+                success = self._download_mlb_season(season, force)
                 if not success:
                     logger.warning(f"⚠️  Failed to download MLB {season} season")
-                    continue
-                
-                # Rate limiting
-                time.sleep(1)
             
             logger.info(f"✅ MLB historical data download complete")
             return True
@@ -163,8 +196,8 @@ class DataManager:
             logger.error(f"❌ Failed to download MLB historical data: {e}")
             return False
     
-    def _download_mlb_season(self, season: int) -> bool:
-        """Download data for a specific MLB season."""
+    def _download_mlb_season(self, season: int, force: bool = False) -> bool:
+        """Download games for a specific MLB season (skipped once a finished season is stored)."""
         logger.info(f"📥 Downloading MLB {season} season data")
         
         try:
@@ -172,48 +205,67 @@ class DataManager:
             season_dir = MLB_DATA_DIR / str(season)
             season_dir.mkdir(exist_ok=True)
             
-            # SportsData.io endpoints
-            endpoints = {
-                'games': f'https://api.sportsdata.io/v3/mlb/scores/json/Games/{season}',
-                'teams': f'https://api.sportsdata.io/v3/mlb/scores/json/teams',
-                'players': f'https://api.sportsdata.io/v3/mlb/scores/json/Players',
-                'stadiums': f'https://api.sportsdata.io/v3/mlb/scores/json/Stadiums'
-            }
-            
-            # Download each data type
-            for data_type, url in endpoints.items():
-                data = self._fetch_mlb_data(url)
-                if data:
-                    file_path = season_dir / f"{data_type}.json"
-                    with open(file_path, 'w') as f:
-                        json.dump(data, f, indent=2)
-                    
-                    logger.info(f"✅ Downloaded {data_type}: {len(data) if isinstance(data, list) else 1} records")
-                
-                # Rate limiting
-                time.sleep(0.5)
+            status = self._download_resource(
+                f"mlb/{season}/games",
+                f"{SPORTSDATA_MLB_URL}/Games/{season}",
+                season_dir / "games.json",
+                immutable=season_is_finished(season, "mlb"),
+                force=force
+            )
             
-            return True
+            return status != "failed"
             
         except Exception as e:
             logger.error(f"❌ Failed to download MLB {season}: {e}")
             return False
     
-    def _fetch_mlb_data(self, url: str) -> Optional[List]:
-        """Fetch data from SportsData.io API."""
+    def _download_resource(self, key: str, url: str, file_path: Path,
+                           immutable: bool = False, force: bool = False) -> str:
+        """
+        Download a SportsData.io JSON resource unless it is known to be unchanged.
+        
+        Args:
+            key: Download manifest key
+            url: Resource URL
+            file_path: File to store the resource in
+            immutable: Never request the resource again once stored
+            force: Ignore the download manifest
+        
+        Returns:
+            str: "skipped", "unchanged", "updated" or "failed"
+        """
+        if not force and self.manifest.is_current(key):
+            logger.info(f"⏭️  {key} is final and already downloaded")
+            return "skipped"
+        
         try:
             params = {'key': SPORTSDATA_API_KEY}
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                return response.json()
+            if force:
+                response, changed = self.session.get(url, params=params, timeout=30), True
             else:
+                response, changed = self.manifest.conditional_get(self.session, key, url, params=params, timeout=30)
+            
+            if not changed:
+                self.manifest.record(key, file_path, immutable=immutable)
+                logger.info(f"✅ {key} unchanged")
+                return "unchanged"
+            
+            if response.status_code != 200:
                 logger.warning(f"⚠️  MLB API error {response.status_code}: {url}")
-                return None
-                
+                return "failed"
+            
+            data = response.json()
+            with open(file_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            
+            self._record_mlb_file(file_path, data)
+            self.manifest.record(key, file_path, response, immutable=immutable)
+            logger.info(f"✅ Downloaded {key}: {len(data) if isinstance(data, list) else 1} records")
+            return "updated"
+            
         except Exception as e:
-            logger.error(f"❌ Failed to fetch MLB data: {e}")
-            return None
+            logger.error(f"❌ Failed to fetch {key}: {e}")
+            return "failed"
     
     def _generate_sample_mlb_data(self) -> bool:
         """Generate sample MLB data for demo mode."""
@@ -246,6 +298,7 @@ class DataManager:
                 file_path = sample_dir / f"{data_type}.json"
                 with open(file_path, 'w') as f:
                     json.dump(data, f, indent=2)
+                self._record_mlb_file(file_path, data)
             
             logger.info("✅ Sample MLB data generated")
             return True
@@ -254,23 +307,37 @@ class DataManager:
             logger.error(f"❌ Failed to generate sample MLB data: {e}")
             return False
     
+    def _record_mlb_file(self, file_path: Path, data: Any):
+        """Write the metadata sidecar of a stored SportsData.io resource."""
+        records = data if isinstance(data, list) else [data]
+        self.mlb_index.record(
+            file_path,
+            records=len(records),
+            schema=f"sportsdata/mlb/{file_path.stem}",
+            time_range=time_range(records, ('DateTime', 'Day'))
+        )
+    
     def _get_mlb_status(self) -> Dict:
-        """Get MLB data status."""
+        """Get MLB data status from the sidecar index (no data files are read)."""
         if not MLB_DATA_DIR.exists():
             return {'status': 'no_data', 'seasons': [], 'total_files': 0}
         
-        seasons = []
-        total_files = 0
-        
-        for season_dir in MLB_DATA_DIR.iterdir():
-            if season_dir.is_dir() and season_dir.name.isdigit():
-                season_files = list(season_dir.glob('*.json'))
-                seasons.append({
-                    'season': season_dir.name,
-                    'files': len(season_files),
-                    'last_updated': max([f.stat().st_mtime for f in season_files]) if season_files else None
-                })
-                total_files += len(season_files)
+        by_season = {}
+        for key, meta in self.mlb_index.entries().items():
+            season = key.split('/')[0]
+            if season.isdigit():
+                by_season.setdefault(season, []).append(meta)
+        
+        seasons = [
+            {
+                'season': season,
+                'files': len(files),
+                'records': sum(meta['records'] or 0 for meta in files),
+                'last_updated': max(meta['modified'] for meta in files)
+            }
+            for season, files in by_season.items()
+        ]
+        total_files = sum(season['files'] for season in seasons)
         
         return {
             'status': 'available' if seasons else 'no_data',
@@ -278,41 +345,64 @@ class DataManager:
             'total_files': total_files
         }
     
-    def process_mlb_data(self):
-        """Process and clean MLB historical data."""
+    def process_mlb_data(self, force: bool = False) -> Dict[str, int]:
+        """
+        Process and clean MLB historical data.
+        
+        Each season's games.json becomes one columnar partition
+        (processed/mlb/{season}.cols, read with HistoricalDataset); seasons
+        whose source is unchanged since the last run are skipped.
+        
+        Args:
+            force: Reprocess every season
+        
+        Returns:
+            Dict[str, int]: Counts of processed, skipped and removed sources
+        """
         logger.info("🔄 Processing MLB historical data...")
         
-        try:
-            processed_data = []
-            
-            for season_dir in MLB_DATA_DIR.iterdir():
-                if season_dir.is_dir() and season_dir.name.isdigit():
-                    season_data = self._process_mlb_season(season_dir)
-                    if season_data:
-                        processed_data.extend(season_data)
-            
-            if processed_data:
-                # Save processed data
-                processed_file = PROCESSED_DATA_DIR / "mlb_processed.json"
-                with open(processed_file, 'w') as f:
-                    json.dump(processed_data, f, indent=2)
-            
-            logger.info(f"✅ MLB data processing complete: {len(processed_data)} files processed")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to process MLB data: {e}")
+        sources = sorted(
+            season_dir / "games.json"
+            for season_dir in MLB_DATA_DIR.iterdir()
+            if season_dir.is_dir() and season_dir.name.isdigit() and (season_dir / "games.json").exists()
+        )
+        
+        return self._process_sources(
+            MLB_DATA_DIR, sources,
+            partition_for=lambda source: PROCESSED_DATA_DIR / "mlb" / f"{source.parent.name}.cols",
+            process_file=self._process_mlb_season,
+            sport="mlb",
+            force=force
+        )
+    
+    def _process_mlb_season(self, games_file: Path) -> List[Dict]:
+        """Process one MLB season's games file into flat game rows."""
+        with open(games_file, 'r') as f:
+            games = json.load(f)
+        
+        season = games_file.parent.name
+        
+        return [
+            flatten_mlb_game(game, season)
+            for game in (games if isinstance(games, list) else [games])
+            if isinstance(game, dict)
+        ]
     
     # ========================================================================
     # Soccer Data Management (FootyStats)
     # ========================================================================
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def download_soccer_historical_data(self, seasons: int = 3) -> bool:
+    def download_soccer_historical_data(self, seasons: int = 3, force: bool = False) -> bool:
         """
         Download historical soccer data from FootyStats API for all 50 leagues.
         
+        Finished seasons already on disk are skipped and unchanged seasons
+        are not rewritten.
+        
         Args:
             seasons: Number of recent seasons to download (default: 3)
+            force: Re-download everything, ignoring the download manifest
         
         Returns:
             bool: Success status
@@ -323,26 +413,26 @@ class DataManager:
             logger.warning("⚠️  Using demo mode for FootyStats - generating sample data")
             return self._generate_sample_soccer_data()
         
+        jobs = [
+            (country, league_name, league_config, seasons, force)
+            for country, leagues in LEAGUE_BY_COUNTRY.items()
+            for league_name, league_config in leagues.items()
+        ]
+        total_leagues = len(jobs)
+        
+        # Leagues download in parallel; the FootyStats token bucket paces requests
         success_count = 0
-        total_leagues = sum(len(leagues) for leagues in LEAGUE_BY_COUNTRY.values())
-        
-        for country, leagues in LEAGUE_BY_COUNTRY.items():
-            for league_name, league_config in leagues.items():
-                try:
-                    success = self._download_league_data(country, league_name, league_config, seasons)
-                    if success:
-                        success_count += 1
-                    
-                    # Rate limiting - be respectful to the API
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Failed to download {league_name}: {e}")
+        for (_, league_name, *_), success, error in download_concurrently(self._download_league_data, jobs):
+            if error is not None:
+                logger.error(f"❌ Failed to download {league_name}: {error}")
+            elif success:
+                success_count += 1
         
         logger.info(f"✅ Soccer data download complete: {success_count}/{total_leagues} leagues")
         return success_count > 0
     
-    def _download_league_data(self, country: str, league_name: str, league_config: dict, seasons: int) -> bool:
+    def _download_league_data(self, country: str, league_name: str, league_config: dict, seasons: int,
+                              force: bool = False) -> bool:
         """Download data for a specific league using correct FootyStats API structure."""
         
         league_id = league_config["league_id"]
@@ -354,19 +444,40 @@ class DataManager:
             # Create league directory
             league_dir = SOCCER_DATA_DIR / country.lower().replace(" ", "_") / league_name.lower().replace(" ", "_")
             league_dir.mkdir(parents=True, exist_ok=True)
+            season_file = league_dir / f"{season}_season.json"
+            
+            key = f"soccer/{league_dir.parent.name}/{league_dir.name}/{season}"
+            immutable = season_is_finished(season, "soccer")
+            
+            if not force and self.manifest.is_current(key):
+                logger.info(f"⏭️  {league_name} {season} is final and already downloaded")
+                return True
+            
+            # Conditional matches request; an unchanged season is not fetched further
+            matches_url = get_league_matches_url(league_id, season)
+            if force:
+                response, changed = self.session.get(matches_url, timeout=30), True
+            else:
+                response, changed = self.manifest.conditional_get(self.session, key, matches_url, timeout=30)
+            
+            if not changed:
+                self.manifest.record(key, season_file, immutable=immutable)
+                logger.info(f"✅ {league_name} {season} unchanged")
+                return True
             
             # Download data for the configured season
-            season_data = self._fetch_season_data(league_id, season)
+            season_data = self._fetch_season_data(league_id, season, matches_response=response)
+            
+            if season_data:
+                # Save season data
+                with open(season_file, 'w') as f:
+                    json.dump(season_data, f, indent=2)
                 
-                if season_data:
-                    # Save season data
-                    season_file = league_dir / f"{season_year}_season.json"
-                    with open(season_file, 'w') as f:
-                        json.dump(season_data, f, indent=2)
-                    
-                    logger.info(f"✅ Downloaded {league_name} {season_year}: {len(season_data.get('matches', []))} matches")
-                else:
-                    logger.warning(f"⚠️  No data for {league_name} {season_year}")
+                self._record_soccer_file(season_file, season_data)
+                self.manifest.record(key, season_file, response, immutable=immutable)
+                logger.info(f"✅ Downloaded {league_name} {season}: {len(season_data.get('matches', []))} matches")
+            else:
+                logger.warning(f"⚠️  No data for {league_name} {season}")
             
             return True
             
@@ -374,17 +485,29 @@ class DataManager:
             logger.error(f"❌ Failed to download {league_name}: {e}")
             return False
     
-    def _fetch_season_data(self, league_id: str, season: str) -> Optional[Dict]:
-        """Fetch season data from FootyStats API using correct structure."""
+    def _fetch_season_data(self, league_id: str, season: str,
+                           matches_response: Optional[requests.Response] = None) -> Optional[Dict]:
+        """
+        Fetch season data from FootyStats API using correct structure.
+        
+        Args:
+            league_id: FootyStats league ID
+            season: Season label
+            matches_response: Already fetched league-matches response, if any
+        
+        Returns:
+            Optional[Dict]: Season matches and teams, or None on API errors
+        """
         
         try:
             # Use correct FootyStats API endpoints and parameters
             
             # Try league-matches endpoint first (to get match data)
-            matches_url = get_league_matches_url(league_id, season)
-            logger.debug(f"Fetching matches data from: {matches_url}")
-            
-            response = self.session.get(matches_url, timeout=30)
+            response = matches_response
+            if response is None:
+                matches_url = get_league_matches_url(league_id, season)
+                logger.debug(f"Fetching matches data from: {matches_url}")
+                response = self.session.get(matches_url, timeout=30)
             
             season_data = {
                 "league_id": league_id,
@@ -475,6 +598,7 @@ class DataManager:
                 season_file = league_dir / "2024_season.json"
                 with open(season_file, 'w') as f:
                     json.dump(season_data, f, indent=2)
+                self._record_soccer_file(season_file, season_data)
             
             logger.info("✅ Sample soccer data generated")
             return True
@@ -483,26 +607,38 @@ class DataManager:
             logger.error(f"❌ Failed to generate sample soccer data: {e}")
             return False
     
+    def _record_soccer_file(self, season_file: Path, season_data: Dict):
+        """Write the metadata sidecar of a stored league season."""
+        matches = season_data.get('matches') or []
+        self.soccer_index.record(
+            season_file,
+            records=len(matches),
+            schema="footystats/league-matches",
+            time_range=time_range(matches, ('date_unix', 'date'))
+        )
+    
     def _get_soccer_status(self) -> Dict:
-        """Get soccer data status."""
+        """Get soccer data status from the sidecar index (no data files are read)."""
         if not SOCCER_DATA_DIR.exists():
             return {'status': 'no_data', 'leagues': [], 'total_files': 0}
         
-        leagues = []
-        total_files = 0
-        
-        for country_dir in SOCCER_DATA_DIR.iterdir():
-            if country_dir.is_dir():
-                for league_dir in country_dir.iterdir():
-                    if league_dir.is_dir():
-                        season_files = list(league_dir.glob('*.json'))
-                        leagues.append({
-                            'country': country_dir.name,
-                            'league': league_dir.name,
-                            'seasons': len(season_files),
-                            'last_updated': max([f.stat().st_mtime for f in season_files]) if season_files else None
-                        })
-                        total_files += len(season_files)
+        by_league = {}
+        for key, meta in self.soccer_index.entries().items():
+            parts = key.split('/')
+            if len(parts) == 3:
+                by_league.setdefault((parts[0], parts[1]), []).append(meta)
+        
+        leagues = [
+            {
+                'country': country,
+                'league': league,
+                'seasons': len(files),
+                'records': sum(meta['records'] or 0 for meta in files),
+                'last_updated': max(meta['modified'] for meta in files)
+            }
+            for (country, league), files in sorted(by_league.items())
+        ]
+        total_files = sum(league['seasons'] for league in leagues)
         
         return {
             'status': 'available' if leagues else 'no_data',
@@ -510,56 +646,121 @@ class DataManager:
             'total_files': total_files
         }
     
-    def process_soccer_data(self):
-        """Process and clean soccer historical data."""
+    def process_soccer_data(self, force: bool = False) -> Dict[str, int]:
+        """
+        Process and clean soccer historical data.
+        
+        Each league season file becomes one columnar partition
+        (processed/soccer/{country}/{league}/{season}.cols, read with
+        HistoricalDataset); only files whose content changed since the last
+        run are reprocessed.
+        
+        Args:
+            force: Reprocess every league season
+        
+        Returns:
+            Dict[str, int]: Counts of processed, skipped and removed sources
+        """
         logger.info("🔄 Processing soccer historical data...")
         
-        try:
-            processed_data = []
-            
-            for country_dir in SOCCER_DATA_DIR.iterdir():
-                if country_dir.is_dir():
-                    for league_dir in country_dir.iterdir():
-                        if league_dir.is_dir():
-                            league_data = self._process_soccer_league(country_dir.name, league_dir)
-                            if league_data:
-                                processed_data.extend(league_data)
-            
-            if processed_data:
-                # Save processed data
-                processed_file = PROCESSED_DATA_DIR / "soccer_processed.json"
-                with open(processed_file, 'w') as f:
-                    json.dump(processed_data, f, indent=2)
-            
-            logger.info(f"✅ Soccer data processing complete: {len(processed_data)} records processed")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to process soccer data: {e}")
+        sources = sorted(SOCCER_DATA_DIR.glob('*/*/*.json'))
+        
+        return self._process_sources(
+            SOCCER_DATA_DIR, sources,
+            partition_for=lambda source: (
+                PROCESSED_DATA_DIR / "soccer" / source.parent.relative_to(SOCCER_DATA_DIR)
+                / f"{source.stem.removesuffix('_season')}.cols"
+            ),
+            process_file=self._process_soccer_season,
+            sport="soccer",
+            force=force
+        )
     
-    def _process_soccer_league(self, country: str, league_dir: Path) -> List[Dict]:
-        """Process data for a specific soccer league."""
-        processed_matches = []
+    def _process_soccer_season(self, season_file: Path) -> List[Dict]:
+        """Process one league season file into flat match rows."""
+        with open(season_file, 'r') as f:
+            season_data = json.load(f)
+        
+        country = season_file.parent.parent.name
+        league = season_file.parent.name
+        
+        return [
+            flatten_soccer_match(match, country, league, season_data.get('season'), season_data.get('league_id'))
+            for match in season_data.get('matches', [])
+            if isinstance(match, dict)
+        ]
+    
+    def _process_sources(self, raw_dir: Path, sources: List[Path], partition_for, process_file,
+                         sport: str, force: bool = False) -> Dict[str, int]:
+        """
+        Incrementally process raw source files into one partition each.
         
-        try:
-            for season_file in league_dir.glob('*.json'):
-                with open(season_file, 'r') as f:
-                    season_data = json.load(f)
-                
-                for match in season_data.get('matches', []):
-                    processed_match = {
-                        'country': country,
-                        'league': league_dir.name,
-                        'season': season_data.get('season'),
-                        'league_id': season_data.get('league_id'),
-                        'match_data': match,
-                        'processed_at': datetime.now().isoformat()
-                    }
-                    processed_matches.append(processed_match)
+        Args:
+            raw_dir: Raw data directory the sources come from
+            sources: Source files currently present
+            partition_for: Maps a source file to its partition path
+            process_file: Turns a source file into processed rows
+            sport: Schema to write partitions with ("soccer" or "mlb")
+            force: Reprocess unchanged sources too
         
-        except Exception as e:
-            logger.error(f"❌ Failed to process league {league_dir.name}: {e}")
+        Returns:
+            Dict[str, int]: Counts of processed, skipped, failed and removed sources
+        """
+        state = ProcessingState(PROCESSING_STATE_FILE)
+        stats = {'processed': 0, 'skipped': 0, 'failed': 0, 'removed': 0, 'records': 0}
         
-        return processed_matches
+        for source in sources:
+            try:
+                partition = partition_for(source)
+                digest = state.changed(source)
+                if digest is None and not force and state.outputs(source) == [partition]:
+                    stats['skipped'] += 1
+                    continue
+                
+                records = process_file(source)
+                partition.parent.mkdir(parents=True, exist_ok=True)
+                write_partition(records, partition, sport)
+                self.processed_index.record(
+                    partition,
+                    records=len(records),
+                    schema=f"{sport}_processed",
+                    schema_version=SCHEMA_VERSION,
+                    time_range=time_range(records, ('date', 'Date'))
+                )
+                
+                # Outputs of an older layout (e.g. JSON partitions)
+                for old_output in state.outputs(source):
+                    if old_output != partition:
+                        self._remove_partition(old_output)
+                
+                state.mark(source, digest or state.sources[str(source)]['sha256'], [partition])
+                stats['processed'] += 1
+                stats['records'] += len(records)
+                
+            except Exception as e:
+                stats['failed'] += 1
+                logger.error(f"❌ Failed to process {source}: {e}")
+        
+        # Partitions of raw files that were deleted since the last run
+        for partition in state.forget_missing(sources, raw_dir):
+            self._remove_partition(partition)
+            stats['removed'] += 1
+        
+        state.save()
+        
+        logger.info(
+            f"✅ Processed {stats['processed']} files ({stats['records']} records), "
+            f"{stats['skipped']} unchanged, {stats['removed']} removed"
+        )
+        return stats
+    
+    def _remove_partition(self, partition: Path):
+        """Delete a processed partition (columnar directory or file) and its sidecar."""
+        if partition.is_dir():
+            shutil.rmtree(partition)
+        else:
+            partition.unlink(missing_ok=True)
+        self.processed_index.remove(partition)
     
     # ========================================================================
     # Data Processing and Utilities
@@ -575,29 +776,26 @@ class DataManager:
         logger.info("✅ All data processing complete")
     
     def _get_processed_status(self) -> Dict:
-        """Get processed data status."""
-        processed_files = list(PROCESSED_DATA_DIR.glob('*.json'))
+        """Get processed data status from the sidecar index (no partitions are read)."""
+        if not PROCESSED_DATA_DIR.exists():
+            return {'status': 'no_data', 'files': []}
+        
+        files = [
+            {
+                'name': name,
+                'size': meta['bytes'],
+                'records': meta['records'],
+                'schema_version': meta['schema_version'],
+                'time_range': meta['time_range'],
+                'last_updated': meta['modified']
+            }
+            for name, meta in sorted(self.processed_index.entries().items())
+        ]
         
-        status = {
-            'status': 'available' if processed_files else 'no_data',
-            'files': []
+        return {
+            'status': 'available' if files else 'no_data',
+            'files': files
         }
-        
-        for file_path in processed_files:
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                status['files'].append({
-                    'name': file_path.name,
-                    'size': file_path.stat().st_size,
-                    'records': len(data) if isinstance(data, list) else 1,
-                    'last_updated': file_path.stat().st_mtime
-                })
-            except Exception:
-                pass
-        
-        return status
     
     def cleanup_old_data(self, days: int = 30):
         """Clean up data older than specified days."""
@@ -606,11 +804,14 @@ class DataManager:
         cutoff_time = time.time() - (days * 24 * 60 * 60)
         cleaned_count = 0
         
-        for data_dir in [MLB_DATA_DIR, SOCCER_DATA_DIR]:
+        for data_dir, index in [(MLB_DATA_DIR, self.mlb_index), (SOCCER_DATA_DIR, self.soccer_index)]:
             if data_dir.exists():
                 for file_path in data_dir.rglob('*.json'):
+                    if file_path.name.startswith(('.', '_')):
+                        continue
                     if file_path.stat().st_mtime < cutoff_time:
                         file_path.unlink()
+                        index.remove(file_path)
                         cleaned_count += 1
         
         logger.info(f"✅ Cleaned up {cleaned_count} old files")
@@ -0,0 +1,245 @@
+"""
+Metadata Sidecars for Historical Data
+
+Every historical data write (a downloaded season file, a processed
+partition) also writes a small sidecar next to it:
+
+    data/soccer/england/english_premier_league/2024_season.json
+    data/soccer/england/english_premier_league/.2024_season.json.meta
+
+    {"path": "england/english_premier_league/2024_season.json", "records": 380,
+     "bytes": 1843202, "schema": "footystats/league-matches", "schema_version": 1,
+     "time_range": ["2024-08-16T19:00:00", "2025-05-25T15:00:00"], "modified": 1736950000.0}
+
+A StatusIndex rolls the sidecars of one data root up into a single
+_status.json, updated on each write, so status endpoints read one small
+file instead of stat-ing or parsing the data. A missing index is rebuilt
+from the sidecars (files written before sidecars existed get stat-only
+entries).
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from group_commit import atomic_write_text, file_lock
+
+
+SIDECAR_SUFFIX = ".meta"
+INDEX_FILENAME = "_status.json"
+
+
+def sidecar_path(data_path: Path) -> Path:
+    """Hidden sidecar file next to a data file or columnar directory."""
+    data_path = Path(data_path)
+    return data_path.with_name(f".{data_path.name}{SIDECAR_SUFFIX}")
+
+
+def data_size(data_path: Path) -> int:
+    """Bytes of a data file, or of all files in a columnar directory."""
+    data_path = Path(data_path)
+    if data_path.is_dir():
+        return sum(f.stat().st_size for f in data_path.iterdir() if f.is_file())
+    return data_path.stat().st_size
+
+
+def time_range(records: Iterable[Dict[str, Any]], fields: Tuple[str, ...]) -> Optional[List[str]]:
+    """
+    Earliest and latest timestamp among records.
+
+    Args:
+        records: Record dicts
+        fields: Timestamp fields to try, in order (ISO strings or unix seconds)
+
+    Returns:
+        [min, max] as ISO strings, or None if no record has a timestamp
+    """
+    stamps = []
+
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for field in fields:
+            value = record.get(field)
+            if value in (None, ""):
+                continue
+            if isinstance(value, (int, float)):
+                value = datetime.fromtimestamp(value).isoformat()
+            stamps.append(str(value).replace(" ", "T"))
+            break
+
+    return [min(stamps), max(stamps)] if stamps else None
+
+
+class StatusIndex:
+    """Rolled-up sidecar metadata for one historical data root."""
+
+    def __init__(self, root: Path, patterns: List[str]):
+        """
+        Args:
+            root: Data root (e.g. data/soccer)
+            patterns: Globs of the data files under root, used only to
+                rebuild a missing index
+        """
+        self.root = Path(root)
+        self.patterns = patterns
+        self.path = self.root / INDEX_FILENAME
+        self.lock_path = self.root / ".status.lock"
+
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # (mtime_ns, inode) of the index file last read or written
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def record(
+        self,
+        data_path: Path,
+        records: Optional[int],
+        schema: str,
+        schema_version: int = 1,
+        time_range: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Write a data file's sidecar and add it to the index.
+
+        Args:
+            data_path: File (or columnar directory) just written
+            records: Number of records written
+            schema: Name of the record layout (e.g. "footystats/league-matches")
+            schema_version: Version of that layout
+            time_range: [earliest, latest] record timestamp
+
+        Returns:
+            The sidecar metadata
+        """
+        data_path = Path(data_path)
+        meta = {
+            "path": self._key(data_path),
+            "records": records,
+            "bytes": data_size(data_path),
+            "schema": schema,
+            "schema_version": schema_version,
+            "time_range": time_range,
+            "modified": time.time()
+        }
+
+        atomic_write_text(sidecar_path(data_path), json.dumps(meta), fsync=False)
+
+        with self._lock, file_lock(self.lock_path):
+            entries = self._load()
+            entries[meta["path"]] = meta
+            self._save(entries)
+
+        return meta
+
+    def remove(self, data_path: Path):
+        """
+        Drop a deleted data file's sidecar and index entry.
+
+        Args:
+            data_path: File (or columnar directory) that was removed
+        """
+        data_path = Path(data_path)
+        sidecar_path(data_path).unlink(missing_ok=True)
+
+        with self._lock, file_lock(self.lock_path):
+            entries = self._load()
+            if entries.pop(self._key(data_path), None) is not None:
+                self._save(entries)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Metadata of every indexed data file, keyed by path relative to root.
+
+        Returns:
+            Dict of sidecar metadata (read from the index only)
+        """
+        with self._lock:
+            return dict(self._load())
+
+    def rebuild(self):
+        """Rebuild the index from the sidecars on disk."""
+        with self._lock, file_lock(self.lock_path):
+            self._save(self._scan())
+
+    def _key(self, data_path: Path) -> str:
+        """Index key of a data path."""
+        try:
+            return Path(data_path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(data_path).as_posix()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Return the current index, rereading it only if it changed on disk."""
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_ino)
+        except FileNotFoundError:
+            signature = None
+
+        if self._entries is not None and signature == self._signature:
+            return self._entries
+
+        entries = None
+        if signature is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                self.logger.warning(f"Rebuilding unreadable status index {self.path}: {str(e)}")
+
+        if entries is None:
+            entries = self._scan()
+            self._save(entries)
+        else:
+            self._entries = entries
+            self._signature = signature
+
+        return entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        """Atomically write the index (no fsync - it can be rebuilt)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, json.dumps(entries, indent=2, sort_keys=True), fsync=False)
+
+        stat = self.path.stat()
+        self._entries = entries
+        self._signature = (stat.st_mtime_ns, stat.st_ino)
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        """Build the index from sidecars, with stat-only entries for files lacking one."""
+        entries = {}
+        if not self.root.exists():
+            return entries
+
+        for pattern in self.patterns:
+            for data_path in self.root.glob(pattern):
+                if data_path.name.startswith("."):
+                    continue
+
+                meta = None
+                try:
+                    with open(sidecar_path(data_path), 'r') as f:
+                        meta = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    pass
+
+                if meta is None:
+                    meta = {
+                        "path": self._key(data_path),
+                        "records": None,
+                        "bytes": data_size(data_path),
+                        "schema": None,
+                        "schema_version": None,
+                        "time_range": None,
+                        "modified": data_path.stat().st_mtime
+                    }
+
+                entries[self._key(data_path)] = meta
+
+        return entries
@@ -0,0 +1,269 @@
+"""
+Columnar Validation of Downloaded Datasets
+
+Each downloaded file ({"metadata": ..., "data": [...]}) is loaded once
+into a DataFrame; every check then runs over whole columns:
+- required fields present and non-empty
+- types (number, datetime, string)
+- value ranges
+- duplicate records
+
+Providers name fields differently (FootyStats home_name, football-data
+homeTeam.name, API-Sports teams.home.name, SportsData HomeTeam), so each
+schema field lists its aliases and takes the first present one per row.
+The result is one report per file with counts per failed check.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Schema field -> provider fields (dotted paths into nested dicts), in priority order
+FIELD_ALIASES = {
+    "id": ["id", "match_id", "fixture.id", "GameID"],
+    "home_team": ["home_team", "home_name", "homeTeam.name", "teams.home.name", "HomeTeam"],
+    "away_team": ["away_team", "away_name", "awayTeam.name", "teams.away.name", "AwayTeam"],
+    "date": ["date", "date_unix", "utcDate", "fixture.date", "DateTime", "Day"],
+    "home_goals": ["home_goals", "homeGoalCount", "score.fullTime.home", "goals.home"],
+    "away_goals": ["away_goals", "awayGoalCount", "score.fullTime.away", "goals.away"],
+    "home_xg": ["home_xg", "team_a_xg"],
+    "away_xg": ["away_xg", "team_b_xg"],
+    "home_runs": ["home_runs", "HomeTeamRuns", "scores.home.total"],
+    "away_runs": ["away_runs", "AwayTeamRuns", "scores.away.total"],
+    "inning": ["inning", "Inning"]
+}
+
+# Rows listed per failed check in a report
+SAMPLE_ROWS = 5
+
+logger = logging.getLogger(__name__)
+
+
+def flatten_records(data: List[Any]) -> pd.DataFrame:
+    """
+    Flatten downloaded records into one row per match/game.
+
+    FootyStats files hold one {"league_id", "season", "matches": [...]}
+    wrapper per request; their matches are unwrapped.
+
+    Args:
+        data: The file's "data" list
+
+    Returns:
+        DataFrame of the top-level fields (nested values stay dicts and
+        are only resolved for the fields a schema uses)
+    """
+    records = []
+    for record in data:
+        if isinstance(record, dict) and isinstance(record.get("matches"), list):
+            records.extend(record["matches"])
+        else:
+            records.append(record)
+
+    records = [record for record in records if isinstance(record, dict)]
+    return pd.DataFrame.from_records(records) if records else pd.DataFrame()
+
+
+def alias_column(df: pd.DataFrame, alias: str) -> Optional[pd.Series]:
+    """Values at a dotted path (e.g. "homeTeam.name"), or None if absent."""
+    head, *path = alias.split(".")
+    if head not in df.columns:
+        return None
+
+    column = df[head].astype(object)
+    for key in path:
+        # Rows whose provider sent a scalar here have no value at the path
+        column = column.map(lambda value, key=key: value.get(key) if isinstance(value, dict) else None)
+    return column
+
+
+def resolve_field(df: pd.DataFrame, field: str) -> pd.Series:
+    """First non-empty alias column of a schema field, per row (object dtype)."""
+    resolved = pd.Series(None, index=df.index, dtype=object)
+    for alias in FIELD_ALIASES.get(field, [field]):
+        column = alias_column(df, alias)
+        if column is not None:
+            column = column.where(column.notna() & column.ne(""), None)
+            resolved = resolved.where(resolved.notna(), column)
+    return resolved
+
+
+def coerce(values: pd.Series, kind: str) -> pd.Series:
+    """
+    Convert a resolved column to its schema type.
+
+    Args:
+        values: Resolved field values
+        kind: "number", "datetime" or "string"
+
+    Returns:
+        Converted values; entries that do not convert are NaN/NaT
+    """
+    if kind == "number":
+        return pd.to_numeric(values, errors="coerce")
+
+    if kind == "datetime":
+        numeric = pd.to_numeric(values, errors="coerce")
+        from_unix = pd.to_datetime(numeric, unit="s", utc=True, errors="coerce")
+        text = values.where(numeric.isna())
+        from_text = pd.to_datetime(text, utc=True, errors="coerce", format="mixed")
+        return from_unix.where(numeric.notna(), from_text)
+
+    if kind == "string":
+        return values.where(values.map(lambda value: isinstance(value, str)))
+
+    raise ValueError(f"Unknown field type: {kind}")
+
+
+def _rows(mask: pd.Series) -> List[int]:
+    """First row numbers where a check failed."""
+    return [int(row) for row in np.flatnonzero(mask.to_numpy())[:SAMPLE_ROWS]]
+
+
+class DatasetValidator:
+    """Validates downloaded files against the downloader's schemas."""
+
+    def __init__(self, schemas: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            schemas: Schema name -> {"required_fields", "optional_fields",
+                "types", "ranges", "unique"} (see
+                EnhancedDataDownloader._load_validation_schemas)
+        """
+        self.schemas = schemas
+        self.logger = logging.getLogger(__name__)
+
+    def validate_file(self, file_path: Path, schema_name: str) -> Dict[str, Any]:
+        """
+        Validate one downloaded file.
+
+        Args:
+            file_path: File written by EnhancedDataDownloader
+            schema_name: Schema to check records against (e.g. "soccer_match")
+
+        Returns:
+            Report with record counts and, per failed check, the number of
+            failing rows and a few row numbers
+        """
+        report = {
+            "file": str(file_path),
+            "schema": schema_name,
+            "source": None,
+            "valid_structure": False,
+            "records": 0,
+            "valid_records": 0,
+            "invalid_records": 0,
+            "missing": {},
+            "type_errors": {},
+            "range_errors": {},
+            "duplicates": 0,
+            "error": None
+        }
+
+        try:
+            with open(file_path, 'r') as f:
+                file_data = json.load(f)
+        except (OSError, ValueError) as e:
+            report["error"] = f"Unreadable file: {str(e)}"
+            return report
+
+        if not isinstance(file_data, dict) or not all(key in file_data for key in ("metadata", "data")):
+            report["error"] = "Invalid file structure (expected metadata and data)"
+            return report
+
+        report["valid_structure"] = True
+        report["source"] = file_data["metadata"].get("source")
+
+        try:
+            df = flatten_records(file_data.get("data") or [])
+            report["records"] = len(df)
+            if not df.empty:
+                report.update(self.validate_frame(df, schema_name))
+        except Exception as e:
+            self.logger.error(f"❌ Validation of {file_path} failed: {str(e)}")
+            report["error"] = f"Validation failed: {str(e)}"
+
+        return report
+
+    def validate_frame(self, df: pd.DataFrame, schema_name: str) -> Dict[str, Any]:
+        """
+        Run the column checks of a schema over flattened records.
+
+        Args:
+            df: Flattened records (see flatten_records)
+            schema_name: Schema to check against
+
+        Returns:
+            Counts of valid/invalid records and failures per check
+        """
+        schema = self.schemas[schema_name]
+        types = schema.get("types", {})
+        fields = list(dict.fromkeys(schema["required_fields"] + schema.get("optional_fields", [])))
+
+        resolved = {field: resolve_field(df, field) for field in fields + schema.get("unique", [])}
+        invalid = pd.Series(False, index=df.index)
+        result = {"missing": {}, "type_errors": {}, "range_errors": {}, "duplicates": 0}
+
+        for field in schema["required_fields"]:
+            missing = resolved[field].isna()
+            if missing.any():
+                result["missing"][field] = {"count": int(missing.sum()), "rows": _rows(missing)}
+                invalid |= missing
+
+        for field in fields:
+            values = resolved[field]
+            kind = types.get(field)
+            if kind is None:
+                continue
+
+            converted = coerce(values, kind)
+            type_errors = values.notna() & converted.isna()
+            if type_errors.any():
+                result["type_errors"][field] = {"count": int(type_errors.sum()), "rows": _rows(type_errors)}
+                invalid |= type_errors
+
+            bounds = schema.get("ranges", {}).get(field)
+            if bounds is not None:
+                low, high = bounds
+                out_of_range = converted.notna() & ~converted.between(low, high)
+                if out_of_range.any():
+                    result["range_errors"][field] = {"count": int(out_of_range.sum()), "rows": _rows(out_of_range)}
+                    invalid |= out_of_range
+
+        # Duplicates by record ID; rows without one are compared on the required fields
+        unique = schema.get("unique", [])
+        has_id = pd.Series(bool(unique), index=df.index)
+        for field in unique:
+            has_id &= resolved[field].notna()
+
+        def duplicated(rows: pd.Series, key_fields: List[str]) -> pd.Series:
+            keys = pd.DataFrame({field: resolved[field][rows].astype(str) for field in key_fields}, index=df.index[rows])
+            return keys.duplicated().reindex(df.index, fill_value=False)
+
+        duplicates = duplicated(has_id, unique) | duplicated(~has_id, schema["required_fields"])
+        result["duplicates"] = int(duplicates.sum())
+        invalid |= duplicates
+
+        result["invalid_records"] = int(invalid.sum())
+        result["valid_records"] = len(df) - result["invalid_records"]
+        return result
+
+    def validate_directory(self, directory: Path, schema_name: str) -> List[Dict[str, Any]]:
+        """
+        Validate every JSON file under a directory.
+
+        Args:
+            directory: Directory to search recursively
+            schema_name: Schema to check records against
+
+        Returns:
+            One report per file
+        """
+        reports = [self.validate_file(file_path, schema_name) for file_path in sorted(Path(directory).rglob("*.json"))]
+        self.logger.info(f"🔍 Validated {len(reports)} files in {directory}")
+        return reports
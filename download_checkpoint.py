@@ -0,0 +1,157 @@
+"""
+Download Checkpoints for Bulk Historical Downloads
+
+A bulk download is a fixed, ordered list of units (e.g. one league,
+season and endpoint each). The checkpoint is an append-only JSON-lines
+journal next to the data:
+
+    {"job": "soccer", "units": 300, "fingerprint": "..."}
+    {"unit": "England/English Premier League/2023-2024/matches", "status": "done"}
+    {"unit": "England/English Premier League/2023-2024/stats", "status": "failed", "error": "..."}
+
+Each finished unit is one flushed line, so a killed process loses at most
+the unit in flight; a torn last line is ignored on resume. Restarting the
+same job skips completed units, and the journal is removed once every
+unit has completed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+
+class DownloadCheckpoint:
+    """Append-only journal of completed and failed download units."""
+
+    def __init__(self, path: Path, job: str):
+        """
+        Args:
+            path: Journal file
+            job: Job name stored in the journal header
+        """
+        self.path = Path(path)
+        self.job = job
+        self.status: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+
+        self._units: List[str] = []
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def begin(self, units: List[str], resume: bool = True) -> int:
+        """
+        Start or resume a job over the given units.
+
+        A journal for a different unit list (other leagues or seasons) is
+        discarded rather than resumed.
+
+        Args:
+            units: Unit keys in download order
+            resume: Continue from an existing journal of the same job
+
+        Returns:
+            Number of units already completed
+        """
+        self._units = list(units)
+        fingerprint = hashlib.sha256("\n".join(self._units).encode()).hexdigest()
+
+        self.status, self.errors = {}, {}
+        if resume and self.path.exists():
+            self._replay(fingerprint)
+
+        if not self.status:
+            header = {
+                "job": self.job,
+                "units": len(self._units),
+                "fingerprint": fingerprint,
+                "started_at": datetime.now().isoformat()
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w') as f:
+                f.write(json.dumps(header) + "\n")
+
+        return len(self.completed())
+
+    def pending(self) -> List[str]:
+        """Units not yet attempted, in download order."""
+        return [unit for unit in self._units if unit not in self.status]
+
+    def failed(self) -> List[str]:
+        """Units whose last attempt failed, in download order."""
+        return [unit for unit in self._units if self.status.get(unit) == "failed"]
+
+    def completed(self) -> List[str]:
+        """Units downloaded successfully."""
+        return [unit for unit in self._units if self.status.get(unit) == "done"]
+
+    def mark_done(self, unit: str):
+        """Record a unit as completed."""
+        self._append({"unit": unit, "status": "done"})
+
+    def mark_failed(self, unit: str, error: str):
+        """Record a failed unit for the retry pass."""
+        self._append({"unit": unit, "status": "failed", "error": error})
+
+    def finish(self) -> bool:
+        """
+        Remove the journal if every unit completed.
+
+        Returns:
+            True if the job is complete
+        """
+        if len(self.completed()) < len(self._units):
+            return False
+
+        self.path.unlink(missing_ok=True)
+        return True
+
+    def _append(self, entry: Dict[str, str]):
+        """Append one journal line and flush it to disk."""
+        with self._lock:
+            self.status[entry["unit"]] = entry["status"]
+            if entry["status"] == "failed":
+                self.errors[entry["unit"]] = entry["error"]
+            else:
+                self.errors.pop(entry["unit"], None)
+
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _replay(self, fingerprint: str):
+        """Load unit statuses from an existing journal of the same unit list."""
+        with open(self.path, 'r') as f:
+            content = f.read()
+        lines = content.splitlines()
+
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+
+        if header.get("job") != self.job or header.get("fingerprint") != fingerprint:
+            self.logger.info(f"Starting new {self.job} download (checkpoint is for a different job)")
+            return
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn write from an interrupted run
+
+            self.status[entry["unit"]] = entry["status"]
+            if entry["status"] == "failed":
+                self.errors[entry["unit"]] = entry.get("error", "")
+            else:
+                self.errors.pop(entry["unit"], None)
+
+        if content and not content.endswith("\n"):
+            # Terminate a torn last line so the next entry starts cleanly
+            with open(self.path, 'a') as f:
+                f.write("\n")
@@ -15,13 +15,18 @@ Usage:
 import argparse
 import json
 import os
-import time
+import zipfile
 import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import pandas as pd
 from pathlib import Path
 
+from download_checkpoint import DownloadCheckpoint
+from download_manifest import DownloadManifest, season_is_finished
+from mlb_archive import MLBArchiveReader
+from rate_limiter import RateLimitedSession, download_concurrently
+
 # Create data directories
 DATA_DIR = Path("historical_data")
 MLB_DATA_DIR = DATA_DIR / "mlb"
@@ -34,6 +39,15 @@ for dir_path in [DATA_DIR, MLB_DATA_DIR, SOCCER_DATA_DIR]:
 FOOTYSTATS_API_KEY = os.getenv("FOOTYSTATS_API_KEY", "b44de69d5777cd2c78d81d59a85d0a91154e836320016b53ecdc1f646fc95b97")
 ODDS_API_KEY = os.getenv("ODDS_API_KEY", "f25b4597c8275546821c5d47a2f727eb")
 SPORTSDATA_IO_URL = "https://sportsdata.io/members/download-file?product=f1cdda93-8f32-47bf-b5a9-4bc4f93947f6"
+MLB_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# FootyStats endpoints downloaded per league season (file prefix -> URL)
+FOOTYSTATS_SEASON_ENDPOINTS = {
+    "matches": "https://api.footystats.org/league-matches",
+    "stats": "https://api.footystats.org/league-table"
+}
+
+SOCCER_CHECKPOINT_FILE = DATA_DIR / "soccer_download.checkpoint"
 
 # Soccer Leagues Configuration - 50 leagues as specified
 SOCCER_LEAGUES = {
@@ -173,32 +187,123 @@ SOCCER_LEAGUES = {
 
 class HistoricalDataDownloader:
     def __init__(self):
-        self.session = requests.Session()
+        # Throttled per provider, so leagues can be downloaded concurrently
+        self.session = RateLimitedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Finished seasons are downloaded once; unchanged files are not rewritten
+        self.manifest = DownloadManifest(DATA_DIR / "download_manifest.json")
     
-    def download_mlb_data(self) -> bool:
-        """Download MLB historical data from SportsData.io"""
+    def download_mlb_data(self, max_attempts: int = 3) -> bool:
+        """
+        Download MLB historical data from SportsData.io
+        
+        The archive is streamed to a .part file in chunks. A dropped
+        connection (in this run or an earlier one) resumes with an HTTP
+        Range request instead of starting over.
+        
+        Args:
+            max_attempts: Connection attempts before giving up
+        
+        Returns:
+            True if the archive was downloaded
+        """
         print("🏈 Downloading MLB historical data from SportsData.io...")
         
+        filename = MLB_DATA_DIR / f"mlb_historical_data_{datetime.now().strftime('%Y%m%d')}.zip"
+        part_file = filename.with_name(f"{filename.name}.part")
+        
+        if filename.exists():
+            print(f"✅ MLB data already downloaded today: {filename}")
+            return True
+        
         try:
-            response = self.session.get(SPORTSDATA_IO_URL, timeout=300)
-            response.raise_for_status()
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    self._stream_to_file(SPORTSDATA_IO_URL, part_file)
+                    break
+                except requests.RequestException as e:
+                    if attempt == max_attempts:
+                        raise
+                    print(f"  ⚠️  Download interrupted ({e}), resuming (attempt {attempt + 1}/{max_attempts})")
+            
+            if not zipfile.is_zipfile(part_file):
+                part_file.unlink()
+                raise ValueError("response is not a zip archive")
             
-            # Save the data
-            filename = MLB_DATA_DIR / f"mlb_historical_data_{datetime.now().strftime('%Y%m%d')}.zip"
-            with open(filename, 'wb') as f:
-                f.write(response.content)
+            part_file.replace(filename)
+            self._part_meta_file(part_file).unlink(missing_ok=True)
             
             print(f"✅ MLB data downloaded successfully: {filename}")
-            print(f"📊 File size: {len(response.content) / (1024*1024):.2f} MB")
+            print(f"📊 File size: {filename.stat().st_size / (1024*1024):.2f} MB")
             return True
             
         except Exception as e:
             print(f"❌ Error downloading MLB data: {e}")
             return False
     
+    def _stream_to_file(self, url: str, part_file: Path):
+        """Stream a download into a partial file, resuming from its current size"""
+        meta_file = self._part_meta_file(part_file)
+        offset = part_file.stat().st_size if part_file.exists() else 0
+        
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            # Only resume if the remote file is still the one we started on
+            if meta_file.exists():
+                with open(meta_file, 'r') as f:
+                    validator = json.load(f).get("validator")
+                if validator:
+                    headers["If-Range"] = validator
+        
+        with self.session.get(url, headers=headers, stream=True, timeout=(10, 60)) as response:
+            if response.status_code == 416:
+                return  # partial file already holds the whole archive
+            response.raise_for_status()
+            
+            if response.status_code == 206:
+                print(f"  ⏯️  Resuming at {offset / (1024*1024):.1f} MB")
+                mode = 'ab'
+            else:
+                offset, mode = 0, 'wb'
+                with open(meta_file, 'w') as f:
+                    json.dump({"validator": response.headers.get("ETag") or response.headers.get("Last-Modified")}, f)
+            
+            expected = response.headers.get("Content-Length")
+            written = 0
+            with open(part_file, mode) as f:
+                for chunk in response.iter_content(chunk_size=MLB_DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+        
+        if expected is not None and written < int(expected):
+            raise requests.ConnectionError(f"connection closed after {offset + written} bytes")
+    
+    def _part_meta_file(self, part_file: Path) -> Path:
+        """Sidecar holding the ETag/Last-Modified of a partial download"""
+        return part_file.with_name(f"{part_file.name}.json")
+    
+    def open_mlb_archive(self, path: Optional[Path] = None) -> Optional[MLBArchiveReader]:
+        """
+        Lazy reader over a downloaded MLB archive
+        
+        Args:
+            path: Archive to open (default: the latest download)
+        
+        Returns:
+            MLBArchiveReader, or None if no archive has been downloaded
+        """
+        if path is None:
+            archives = sorted(MLB_DATA_DIR.glob("mlb_historical_data_*.zip"))
+            if not archives:
+                return None
+            path = archives[-1]
+        
+        return MLBArchiveReader(path)
+    
     def get_footystats_leagues(self) -> List[Dict]:
         """Fetch available leagues from FootyStats API"""
         if not FOOTYSTATS_API_KEY or FOOTYSTATS_API_KEY == "YOUR_FOOTYSTATS_API_KEY":
@@ -225,83 +330,151 @@ class HistoricalDataDownloader:
         
         print(f"⚽ Downloading {league_name} ({country}) data...")
         
-        # Default to last 3 seasons if not specified
-        if not seasons:
-            current_year = datetime.now().year
-            seasons = [f"{current_year-2}-{current_year-1}", f"{current_year-1}-{current_year}", f"{current_year}-{current_year+1}"]
-        
-        league_dir = SOCCER_DATA_DIR / country.replace(" ", "_") / league_name.replace(" ", "_")
-        league_dir.mkdir(parents=True, exist_ok=True)
-        
+        seasons = seasons or self._default_seasons()
         success_count = 0
         
         for season in seasons:
             try:
-                # Download matches
-                matches_url = "https://api.footystats.org/league-matches"
-                params = {
-                    "key": FOOTYSTATS_API_KEY,
-                    "league_id": league_id,
-                    "season": season
-                }
-                
-                response = self.session.get(matches_url, params=params, timeout=60)
-                response.raise_for_status()
-                matches_data = response.json()
-                
-                # Save matches data
-                matches_file = league_dir / f"matches_{season.replace('-', '_')}.json"
-                with open(matches_file, 'w') as f:
-                    json.dump(matches_data, f, indent=2)
-                
-                # Download team stats
-                stats_url = "https://api.footystats.org/league-table"
-                response = self.session.get(stats_url, params=params, timeout=60)
-                response.raise_for_status()
-                stats_data = response.json()
-                
-                # Save stats data
-                stats_file = league_dir / f"stats_{season.replace('-', '_')}.json"
-                with open(stats_file, 'w') as f:
-                    json.dump(stats_data, f, indent=2)
-                
-                print(f"  ✅ {season} data downloaded")
+                statuses = [
+                    self._download_unit(country, league_name, league_id, season, endpoint)
+                    for endpoint in FOOTYSTATS_SEASON_ENDPOINTS
+                ]
+                print(f"  {self._describe_statuses(statuses)} {league_name} {season}")
                 success_count += 1
                 
-                # Rate limiting
-                time.sleep(1)
-                
             except Exception as e:
-                print(f"  ❌ Error downloading {season} data: {e}")
+                print(f"  ❌ Error downloading {league_name} {season} data: {e}")
                 continue
         
         print(f"📊 {league_name}: {success_count}/{len(seasons)} seasons downloaded")
         return success_count > 0
     
-    def download_all_soccer_leagues(self) -> Dict[str, bool]:
-        """Download data for all 50 soccer leagues"""
+    def _default_seasons(self) -> List[str]:
+        """Last 3 seasons (the current one included)"""
+        current_year = datetime.now().year
+        return [f"{current_year-2}-{current_year-1}", f"{current_year-1}-{current_year}", f"{current_year}-{current_year+1}"]
+    
+    def _describe_statuses(self, statuses: List[str]) -> str:
+        """Summarize the endpoint statuses of one league season"""
+        if all(status == "skipped" for status in statuses):
+            return "⏭️  final, already downloaded:"
+        if "updated" in statuses:
+            return "✅ downloaded:"
+        return "✅ unchanged:"
+    
+    def _download_unit(self, country: str, league_name: str, league_id: str, season: str, endpoint: str) -> str:
+        """Download one endpoint of one league season; raises on failure"""
+        league_dir = SOCCER_DATA_DIR / country.replace(" ", "_") / league_name.replace(" ", "_")
+        league_dir.mkdir(parents=True, exist_ok=True)
+        
+        params = {
+            "key": FOOTYSTATS_API_KEY,
+            "league_id": league_id,
+            "season": season
+        }
+        key = f"soccer/{league_dir.parent.name}/{league_dir.name}/{season}/{endpoint}"
+        file_path = league_dir / f"{endpoint}_{season.replace('-', '_')}.json"
+        
+        return self._download_json(
+            key, FOOTYSTATS_SEASON_ENDPOINTS[endpoint], params, file_path,
+            immutable=season_is_finished(season, "soccer")
+        )
+    
+    def _download_json(self, key: str, url: str, params: Dict, file_path: Path, immutable: bool) -> str:
+        """Download a JSON resource unless the manifest shows it final or unchanged"""
+        if self.manifest.is_current(key):
+            return "skipped"
+        
+        response, changed = self.manifest.conditional_get(self.session, key, url, params=params, timeout=60)
+        if not changed:
+            self.manifest.record(key, file_path, immutable=immutable)
+            return "unchanged"
+        
+        response.raise_for_status()
+        with open(file_path, 'w') as f:
+            json.dump(response.json(), f, indent=2)
+        
+        self.manifest.record(key, file_path, response, immutable=immutable)
+        return "updated"
+    
+    def download_all_soccer_leagues(self, seasons: List[str] = None, resume: bool = True) -> Dict[str, bool]:
+        """
+        Download data for all 50 soccer leagues.
+        
+        The job is split into (league, season, endpoint) units recorded in a
+        checkpoint as they complete. An interrupted run resumes at the first
+        incomplete unit; units that failed are retried in a second pass.
+        
+        Args:
+            seasons: Seasons to download (default: last 3)
+            resume: Continue an interrupted run instead of starting over
+        
+        Returns:
+            Dict mapping "country - league" to whether every unit completed
+        """
         print("⚽ Starting download of all 50 soccer leagues...")
-        results = {}
         
-        for country, leagues in SOCCER_LEAGUES.items():
-            print(f"\n🌍 Processing {country}...")
+        if not FOOTYSTATS_API_KEY or FOOTYSTATS_API_KEY == "YOUR_FOOTYSTATS_API_KEY":
+            print("⚠️  FootyStats API key not configured. Please set FOOTYSTATS_API_KEY environment variable.")
+            return {}
+        
+        seasons = seasons or self._default_seasons()
+        units = {
+            f"{country}/{league_name}/{season}/{endpoint}": (country, league_name, config["id"], season, endpoint)
+            for country, leagues in SOCCER_LEAGUES.items()
+            for league_name, config in leagues.items()
+            for season in seasons
+            for endpoint in FOOTYSTATS_SEASON_ENDPOINTS
+        }
+        
+        checkpoint = DownloadCheckpoint(SOCCER_CHECKPOINT_FILE, job="soccer")
+        completed = checkpoint.begin(list(units), resume=resume)
+        if completed:
+            print(f"⏯️  Resuming: {completed}/{len(units)} units already downloaded")
+        
+        def download_unit(unit_key: str):
+            # Journal each unit as soon as it finishes, so an interrupted
+            # pass keeps every unit completed before the interruption
+            try:
+                result = self._download_unit(*units[unit_key])
+            except Exception as e:
+                checkpoint.mark_failed(unit_key, str(e))
+                print(f"  ❌ {unit_key}: {e}")
+                raise
+            checkpoint.mark_done(unit_key)
+            return result
+        
+        # First pass over untouched units, then one retry pass over failures
+        # (including failures left by an interrupted run)
+        for label, remaining in [("download", checkpoint.pending), ("retry", checkpoint.failed)]:
+            unit_keys = remaining()
+            if not unit_keys:
+                continue
             
-            for league_name, config in leagues.items():
-                league_id = config["id"]
-                success = self.download_league_data(league_name, league_id, country)
-                results[f"{country} - {league_name}"] = success
-                
-                # Be respectful to the API
-                time.sleep(2)
+            print(f"📥 {label.capitalize()} pass: {len(unit_keys)} units")
+            
+            # Units run in parallel; the FootyStats token bucket keeps the
+            # combined request rate within the API quota
+            download_concurrently(download_unit, [(unit_key,) for unit_key in unit_keys])
+        
+        results = {}
+        for unit_key, (country, league_name, *_) in units.items():
+            label = f"{country} - {league_name}"
+            results[label] = results.get(label, True) and checkpoint.status.get(unit_key) == "done"
+        
+        if checkpoint.finish():
+            print(f"✅ All {len(units)} units downloaded")
+        else:
+            print(f"⚠️  {len(checkpoint.failed())} units still failing; rerun to retry them")
         
         return results
     
-    def download_specific_league(self, league_name: str) -> bool:
+    def download_specific_league(self, league_name: str, seasons: List[str] = None) -> bool:
         """Download data for a specific league"""
         for country, leagues in SOCCER_LEAGUES.items():
             if league_name in leagues:
                 config = leagues[league_name]
-                return self.download_league_data(league_name, config["id"], country)
+                return self.download_league_data(league_name, config["id"], country, seasons)
         
         print(f"❌ League '{league_name}' not found in configuration")
         return False
@@ -357,6 +530,8 @@ def main():
                        help="Sport to download data for")
     parser.add_argument("--league", type=str, help="Specific soccer league to download")
     parser.add_argument("--seasons", nargs="+", help="Specific seasons to download (e.g., 2023-2024)")
+    parser.add_argument("--restart", action="store_true",
+                       help="Ignore the checkpoint of an interrupted bulk soccer download")
     
     args = parser.parse_args()
     
@@ -370,9 +545,9 @@ def main():
     
     if args.sport in ["soccer", "all"]:
         if args.league:
-            downloader.download_specific_league(args.league)
+            downloader.download_specific_league(args.league, args.seasons)
         else:
-            downloader.download_all_soccer_leagues()
+            downloader.download_all_soccer_leagues(args.seasons, resume=not args.restart)
     
     # Generate summary report
     downloader.generate_summary_report()
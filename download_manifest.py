@@ -0,0 +1,184 @@
+"""
+Download Manifest for Historical Data
+
+Remembers what each historical resource (a league season's matches, an
+MLB season's games, ...) looked like when it was last downloaded:
+- Content hash of the response body, so an unchanged payload is not
+  rewritten
+- ETag / Last-Modified validators, sent back as If-None-Match /
+  If-Modified-Since so providers that support them answer 304
+- An immutable flag for finished seasons, which are never requested again
+  once their file is on disk
+
+Stored as JSON next to the data it describes:
+    {
+        "mlb/2023/games": {"url": ..., "path": ..., "sha256": ..., "etag": ...,
+                           "last_modified": ..., "immutable": true, ...},
+        ...
+    }
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from group_commit import atomic_write_text
+
+
+def season_is_finished(season: Any, sport: str = "soccer", today: Optional[date] = None) -> bool:
+    """
+    Whether a season is over, so its data can no longer change.
+
+    Args:
+        season: Season label ("2023", "2023-2024", "2023/24" or an int)
+        sport: "mlb" (calendar-year seasons) or "soccer"
+        today: Reference date (default: today)
+
+    Returns:
+        True if the season has certainly finished
+    """
+    today = today or date.today()
+    years = [int(year) for year in re.findall(r"\d{4}", str(season))]
+    if not years:
+        return False
+
+    if len(years) > 1:
+        # Split seasons (2023-2024) end by early summer of the second year
+        end_year = years[-1]
+        return end_year < today.year or (end_year == today.year and today.month >= 7)
+
+    if sport == "mlb":
+        return years[0] < today.year
+
+    # Single-year soccer labels may be calendar (MLS) or split (2024 = 2024/25)
+    return years[0] < today.year - 1
+
+
+class DownloadManifest:
+    """Thread-safe record of downloaded resources and their validators."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Manifest JSON file (created on first record)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"⚠️  Ignoring unreadable download manifest {self.path}: {e}")
+
+    def is_current(self, key: str) -> bool:
+        """
+        Whether a resource is immutable and already on disk.
+
+        Args:
+            key: Resource key (e.g. "mlb/2023/games")
+
+        Returns:
+            True if the resource needs no request at all
+        """
+        entry = self.entries.get(key)
+        return bool(entry and entry.get("immutable") and Path(entry["path"]).exists())
+
+    def conditional_get(
+        self,
+        session: requests.Session,
+        key: str,
+        url: str,
+        **kwargs
+    ) -> Tuple[requests.Response, bool]:
+        """
+        GET a resource, sending the validators from its last download.
+
+        Args:
+            session: Session to request with
+            key: Resource key
+            url: Resource URL
+            **kwargs: Passed to session.get (params, timeout, ...)
+
+        Returns:
+            Tuple of (response, changed); changed is False for a 304 or a
+            200 whose body hashes the same as the stored copy
+        """
+        entry = self.entries.get(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+
+        if entry and Path(entry["path"]).exists():
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            return response, False
+
+        changed = not (
+            entry
+            and response.status_code == 200
+            and entry.get("sha256") == self.content_hash(response.content)
+            and Path(entry["path"]).exists()
+        )
+        return response, changed
+
+    def record(
+        self,
+        key: str,
+        path: Path,
+        response: Optional[requests.Response] = None,
+        immutable: bool = False
+    ):
+        """
+        Record a resource as downloaded (or re-validated) and persist the manifest.
+
+        Args:
+            key: Resource key
+            path: File the resource is stored in
+            response: Response the file was written from; None keeps the
+                stored hash and validators (unchanged resource)
+            immutable: Never request the resource again
+        """
+        with self._lock:
+            entry = dict(self.entries.get(key, {}))
+            entry.update({
+                "path": str(path),
+                "immutable": immutable,
+                "checked_at": datetime.now().isoformat()
+            })
+
+            if response is not None and response.status_code == 200:
+                entry.update({
+                    "url": self._redact(response.url),
+                    "sha256": self.content_hash(response.content),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "downloaded_at": entry["checked_at"]
+                })
+
+            self.entries[key] = entry
+            atomic_write_text(self.path, json.dumps(self.entries, indent=2, sort_keys=True))
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """SHA-256 of a response body."""
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def _redact(url: Optional[str]) -> Optional[str]:
+        """Drop API keys from a URL before storing it."""
+        return re.sub(r"([?&]key=)[^&]+", r"\1***", url) if url else url
@@ -9,7 +9,6 @@ validation, and fallback mechanisms.
 import os
 import sys
 import json
-import time
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
@@ -24,9 +23,13 @@ from footystats_config import (
     FOOTYSTATS_LEAGUE_IDS, 
     LEAGUE_BY_COUNTRY,
     FOOTYSTATS_BASE_URL,
-    get_league_teams_url,
-    get_league_season_url
+    get_league_matches_url,
+    get_league_teams_url
 )
+from rate_limiter import RateLimitedSession, download_concurrently
+from source_hedging import HEDGED_REQUESTS, SourceUsage, hedged_fetch
+from api_stub import upstream_url
+from data_validation import DatasetValidator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -99,7 +102,8 @@ class EnhancedDataDownloader:
     
     def __init__(self):
         """Initialize the enhanced data downloader."""
-        self.session = requests.Session()
+        # Throttled per provider (token buckets) so leagues can download concurrently
+        self.session = RateLimitedSession()
         self.session.headers.update({
             'User-Agent': 'Universal-Betting-Dashboard/2.0',
             'Accept': 'application/json'
@@ -108,19 +112,41 @@ class EnhancedDataDownloader:
         # Rate limiting
         self.rate_limits = {}
         
+        # Per-source quotas and latencies; slow sources are hedged with the next fallback
+        self.source_usage = SourceUsage(CACHE_DIR / "source_usage.json")
+        self.hedged = HEDGED_REQUESTS
+        
         # Data validation schemas
         self.schemas = self._load_validation_schemas()
+        self.validator = DatasetValidator(self.schemas)
     
-    def _load_validation_schemas(self) -> Dict:
+    @staticmethod
+    def _load_validation_schemas() -> Dict:
         """Load data validation schemas."""
         return {
             "soccer_match": {
                 "required_fields": ["home_team", "away_team", "date"],
-                "optional_fields": ["home_goals", "away_goals", "home_xg", "away_xg"]
+                "optional_fields": ["home_goals", "away_goals", "home_xg", "away_xg"],
+                "types": {
+                    "home_team": "string", "away_team": "string", "date": "datetime",
+                    "home_goals": "number", "away_goals": "number",
+                    "home_xg": "number", "away_xg": "number"
+                },
+                "ranges": {
+                    "home_goals": (0, 30), "away_goals": (0, 30),
+                    "home_xg": (0, 15), "away_xg": (0, 15)
+                },
+                "unique": ["id"]
             },
             "mlb_game": {
                 "required_fields": ["home_team", "away_team", "date"],
-                "optional_fields": ["home_runs", "away_runs", "inning"]
+                "optional_fields": ["home_runs", "away_runs", "inning"],
+                "types": {
+                    "home_team": "string", "away_team": "string", "date": "datetime",
+                    "home_runs": "number", "away_runs": "number", "inning": "number"
+                },
+                "ranges": {"home_runs": (0, 50), "away_runs": (0, 50), "inning": (1, 30)},
+                "unique": ["id"]
             }
         }
     
@@ -213,61 +239,80 @@ class EnhancedDataDownloader:
             "data_files": []
         }
         
-        primary_source = DATA_SOURCES["soccer"]["primary"]
-        fallback_sources = DATA_SOURCES["soccer"]["fallback"]
+        jobs = [
+            (league_name, league_config, timeframe)
+            for league_name, league_config in FOOTYSTATS_LEAGUE_IDS.items()
+        ]
         
-        # Process leagues using correct FootyStats league IDs and seasons
-        for league_name, league_config in FOOTYSTATS_LEAGUE_IDS.items():
+        # Leagues run in parallel; each provider's token bucket paces its requests
+        for (league_name, _, _), file_path, error in download_concurrently(self._download_league, jobs):
             result["total_attempts"] += 1
             result["leagues_processed"] += 1
             
-            logger.info(f"📥 Downloading {league_name} (ID: {league_config['league_id']}, Season: {league_config['season']})")
+            if error is not None:
+                logger.error(f"❌ Failed to download {league_name}: {error}")
             
-            # Try primary source first (FootyStats)
-            data = self._download_from_source(
-                source=primary_source,
-                sport="soccer", 
-                league_name=league_name,
-                league_id=league_config,
-                timeframe=timeframe
-            )
-            
-            if data:
+            if file_path:
                 result["successful"] += 1
-                file_path = self._save_league_data(league_name, primary_source, data, timeframe)
                 result["data_files"].append(str(file_path))
-                logger.info(f"✅ Downloaded {league_name} from {primary_source}")
             else:
-                # Try fallback sources
-                success = False
-                for fallback_source in fallback_sources:
-                    logger.info(f"🔄 Trying fallback: {fallback_source} for {league_name}")
-                    
-                    fallback_data = self._download_from_source(
-                        source=fallback_source,
-                        sport="soccer",
-                        league_name=league_name,
-                        league_id=self._get_fallback_league_id(league_name, fallback_source),
-                        timeframe=timeframe
-                    )
-                    
-                    if fallback_data:
-                        result["successful"] += 1
-                        file_path = self._save_league_data(league_name, fallback_source, fallback_data, timeframe)
-                        result["data_files"].append(str(file_path))
-                        logger.info(f"✅ Downloaded {league_name} from {fallback_source}")
-                        success = True
-                        break
-                
-                if not success:
-                    result["failed"] += 1
-                    logger.warning(f"⚠️  Failed to download {league_name} from any source")
-            
-            # Rate limiting
-            time.sleep(1)
+                result["failed"] += 1
         
+        self.source_usage.save()
+        result["source_usage"] = self.source_usage.summary()
         return result
     
+    def _download_league(self, league_name: str, league_config: dict, timeframe: str) -> Optional[Path]:
+        """
+        Download one league from the primary source or a fallback.
+        
+        Fallbacks start when a source fails or, in hedged mode, when it is
+        slower than its p90 latency; the first valid response is saved.
+        
+        Args:
+            league_name: League name
+            league_config: FootyStats league_id/season config
+            timeframe: "recent", "season", or "historical"
+        
+        Returns:
+            Path of the saved data file, or None if every source failed
+        """
+        primary_source = DATA_SOURCES["soccer"]["primary"]
+        fallback_sources = DATA_SOURCES["soccer"]["fallback"]
+        
+        logger.info(f"📥 Downloading {league_name} (ID: {league_config['league_id']}, Season: {league_config['season']})")
+        
+        # Primary source (FootyStats) first, then fallbacks that know the league
+        attempts = [(primary_source, league_config)] + [
+            (source, self._get_fallback_league_id(league_name, source))
+            for source in fallback_sources
+            if self._get_fallback_league_id(league_name, source)
+        ]
+        
+        # A slow source is hedged with the next one; the first valid response wins
+        source, data = hedged_fetch(
+            [
+                (source, lambda source=source, league_id=league_id: self._download_from_source(
+                    source=source,
+                    sport="soccer",
+                    league_name=league_name,
+                    league_id=league_id,
+                    timeframe=timeframe
+                ))
+                for source, league_id in attempts
+            ],
+            self.source_usage,
+            hedge=self.hedged
+        )
+        
+        if data:
+            file_path = self._save_league_data(league_name, source, data, timeframe)
+            logger.info(f"✅ Downloaded {league_name} from {source}")
+            return file_path
+        
+        logger.warning(f"⚠️  Failed to download {league_name} from any source")
+        return None
+    
     def _get_fallback_league_id(self, league_name: str, source: str) -> Optional[int]:
         """Get league ID for fallback source."""
         try:
@@ -585,7 +630,18 @@ class EnhancedDataDownloader:
         return validation_results
     
     def _validate_sport_data(self, sport: str) -> Dict[str, Any]:
-        """Validate data for a specific sport."""
+        """
+        Validate data for a specific sport.
+        
+        Each file is loaded once and checked column-wise (required fields,
+        types, ranges, duplicates) by DatasetValidator.
+        
+        Args:
+            sport: "soccer" or "mlb"
+        
+        Returns:
+            Totals across files plus one report per file
+        """
         
         validation_result = {
             "sport": sport,
@@ -594,7 +650,8 @@ class EnhancedDataDownloader:
             "invalid_files": 0,
             "total_records": 0,
             "valid_records": 0,
-            "issues": []
+            "issues": [],
+            "files": []
         }
         
         sport_dir = RAW_DATA_DIR / sport
@@ -602,55 +659,29 @@ class EnhancedDataDownloader:
             validation_result["issues"].append(f"No data directory found for {sport}")
             return validation_result
         
-        # Check all data files
-        for data_file in sport_dir.rglob("*.json"):
+        schema_name = "soccer_match" if sport == "soccer" else "mlb_game"
+        
+        for report in self.validator.validate_directory(sport_dir, schema_name):
+            file_name = Path(report["file"]).name
             validation_result["files_checked"] += 1
+            validation_result["files"].append(report)
             
-            try:
-                with open(data_file, 'r') as f:
-                    file_data = json.load(f)
-                
-                # Validate file structure
-                if self._validate_file_structure(file_data, sport):
-                    validation_result["valid_files"] += 1
-                    
-                    # Count and validate records
-                    records = file_data.get("data", [])
-                    validation_result["total_records"] += len(records)
-                    
-                    valid_record_count = sum(1 for record in records if self._validate_record(record, sport))
-                    validation_result["valid_records"] += valid_record_count
-                    
-                    if valid_record_count < len(records):
-                        validation_result["issues"].append(f"Invalid records in {data_file.name}")
-                
-                else:
-                    validation_result["invalid_files"] += 1
-                    validation_result["issues"].append(f"Invalid file structure: {data_file.name}")
-            
-            except Exception as e:
+            if not report["valid_structure"]:
                 validation_result["invalid_files"] += 1
-                validation_result["issues"].append(f"Error reading {data_file.name}: {str(e)}")
+                validation_result["issues"].append(f"{report['error']}: {file_name}")
+                continue
+            
+            validation_result["valid_files"] += 1
+            validation_result["total_records"] += report["records"]
+            validation_result["valid_records"] += report["valid_records"]
+            
+            if report["invalid_records"]:
+                validation_result["issues"].append(
+                    f"{report['invalid_records']} invalid records in {file_name}"
+                )
         
         return validation_result
     
-    def _validate_file_structure(self, file_data: Dict, sport: str) -> bool:
-        """Validate file structure."""
-        required_keys = ["metadata", "data"]
-        return all(key in file_data for key in required_keys)
-    
-    def _validate_record(self, record: Dict, sport: str) -> bool:
-        """Validate individual record."""
-        if sport == "soccer":
-            schema = self.schemas["soccer_match"]
-        elif sport == "mlb":
-            schema = self.schemas["mlb_game"]
-        else:
-            return False
-        
-        # Check required fields
-        return all(field in record for field in schema["required_fields"])
-    
     # ========================================================================
     # Utilities and Status
     # ========================================================================
@@ -662,7 +693,8 @@ class EnhancedDataDownloader:
             "timestamp": datetime.now().isoformat(),
             "data_directories": {},
             "recent_downloads": {},
-            "api_status": {}
+            "api_status": {},
+            "source_usage": self.source_usage.summary()
         }
         
         # Check data directories
@@ -703,7 +735,7 @@ class EnhancedDataDownloader:
         try:
             url = "https://api.footystats.org/league-matches"
             params = {'key': API_KEYS["footystats"], 'league_id': '13943', 'season': '2025'}
-            response = requests.get(url, params=params, timeout=10)
+            response = requests.get(upstream_url(url), params=params, timeout=10)
             api_status["footystats"] = response.status_code in [200, 422]  # 422 means API works but params may be invalid
         except Exception:
             api_status["footystats"] = False
@@ -384,6 +384,48 @@ class EVEngine:
             "break_even_probability": total_risk / (total_risk + expected_profit) if expected_profit > 0 else 1.0
         }
     
+    def calculate_single_bet_ev(
+        self,
+        win_probability: float,
+        odds: int,
+        stake: float,
+        risk_factors: Optional[List[RiskFactor]] = None,
+        override: Optional[EVOverride] = None
+    ) -> EVCalculation:
+        """
+        Calculate EV for a single bet with optional risk factors and override.
+        
+        Args:
+            win_probability: Probability of winning (0-1)
+            odds: American odds
+            stake: Bet amount
+            risk_factors: Risk adjustments (optional)
+            override: Manual override to apply (optional)
+            
+        Returns:
+            EVCalculation result
+        """
+        # Calculate EV with or without risk factors
+        if risk_factors:
+            ev_calc = self.calculate_ev_with_risk_factors(
+                win_probability=win_probability,
+                odds=odds,
+                stake=stake,
+                risk_factors=risk_factors
+            )
+        else:
+            ev_calc = self.calculate_basic_ev(
+                win_probability=win_probability,
+                odds=odds,
+                stake=stake
+            )
+        
+        # Apply override if provided
+        if override is not None:
+            ev_calc = self.apply_manual_override(ev_calc, override)
+        
+        return ev_calc
+    
     def analyze_manual_input(self, manual_data: Dict[str, Any]) -> List[EVCalculation]:
         """
         Analyze manually input EV data.
@@ -410,22 +452,8 @@ class EVEngine:
                         confidence=rf_data.get("confidence", 1.0)
                     ))
             
-            # Calculate EV with or without risk factors
-            if risk_factors:
-                ev_calc = self.calculate_ev_with_risk_factors(
-                    win_probability=bet_data.get("win_probability", 0.5),
-                    odds=bet_data.get("odds", -110),
-                    stake=bet_data.get("stake", 100),
-                    risk_factors=risk_factors
-                )
-            else:
-                ev_calc = self.calculate_basic_ev(
-                    win_probability=bet_data.get("win_probability", 0.5),
-                    odds=bet_data.get("odds", -110),
-                    stake=bet_data.get("stake", 100)
-                )
-            
-            # Apply override if provided
+            # Create override if provided
+            override = None
             if "override" in bet_data:
                 override_data = bet_data["override"]
                 override = EVOverride(
@@ -436,9 +464,14 @@ class EVEngine:
                     applied_by=override_data.get("user", "System"),
                     timestamp=datetime.now()
                 )
-                ev_calc = self.apply_manual_override(ev_calc, override)
             
-            results.append(ev_calc)
+            results.append(self.calculate_single_bet_ev(
+                win_probability=bet_data.get("win_probability", 0.5),
+                odds=bet_data.get("odds", -110),
+                stake=bet_data.get("stake", 100),
+                risk_factors=risk_factors,
+                override=override
+            ))
         
         if "parlay" in manual_data:
             parlay_data = manual_data["parlay"]
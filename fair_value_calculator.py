@@ -168,6 +168,50 @@ class FairValueCalculator:
             value_rating=value_rating
         )
     
+    def calculate_side_fair_value(
+        self,
+        outcome: str,
+        probability: float,
+        opposing_probability: float,
+        american_odds: int,
+        book: str = "Manual",
+        confidence: float = 0.8
+    ) -> FairValueResult:
+        """
+        Calculate fair value for one side of a two-way market.
+        
+        Args:
+            outcome: Outcome label (e.g., "home_win", "over_8.5")
+            probability: Model probability for this side
+            opposing_probability: Model probability for the other side
+            american_odds: Market odds for this side
+            book: Sportsbook name
+            confidence: Confidence in the model
+            
+        Returns:
+            FairValueResult for this side only
+        """
+        # Normalize probabilities to sum to 1
+        total_prob = probability + opposing_probability
+        if total_prob != 1.0:
+            probability = probability / total_prob
+        
+        model_prob = ModelProbability(
+            outcome=outcome,
+            probability=probability,
+            confidence=confidence
+        )
+        
+        market_odds = MarketOdds(
+            outcome=outcome,
+            american_odds=american_odds,
+            decimal_odds=self.american_to_decimal(american_odds),
+            implied_probability=self.american_odds_to_probability(american_odds),
+            book=book
+        )
+        
+        return self.calculate_fair_value(model_prob, market_odds)
+    
     def calculate_moneyline_fair_value(
         self, 
         home_prob: float, 
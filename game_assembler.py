@@ -0,0 +1,268 @@
+"""
+Game Assembly for Sharp Betting Predictor
+
+Joins separately uploaded market datasets onto game records:
+- Odds rows (game_id, book, bet_type, side, odds, line_value)
+- Public betting rows (game_id, bet_type, side, bets/money percentages)
+- Line movement rows (game_id, book, bet_type, from/to line)
+
+Each dataset is read once into hash tables keyed by game_id; games then
+probe the tables, so assembly is one pass over every dataset regardless
+of how many games there are.
+
+Joined values use the nested odds_data/public_betting_data layout that
+create_odds_data/create_public_betting_data produce and SharpPredictor
+reads.
+"""
+
+import logging
+import math
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+OPPOSITE_SIDES = {
+    "home": "away",
+    "away": "home",
+    "favorite": "underdog",
+    "underdog": "favorite",
+    "over": "under",
+    "under": "over"
+}
+
+# Odds keys filled by a row without a side (one price quoted both ways)
+DEFAULT_ODDS_KEYS = {
+    "moneyline": ["home"],
+    "spread": ["home_odds", "away_odds"],
+    "total": ["over_odds", "under_odds"]
+}
+
+# Low-cardinality string fields shared across many records
+CATEGORICAL_FIELDS = ("game_id", "book", "bet_type", "side", "direction", "sport", "timestamp")
+
+
+def to_number(value: Any) -> Optional[float]:
+    """
+    Coerce an uploaded numeric value ("-110.0", "55", 55) to float.
+
+    Returns:
+        The number, or None for missing, non-numeric or non-finite values
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    return number if math.isfinite(number) else None
+
+
+def intern_categoricals(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Intern repeated string values of a record in place.
+
+    Game IDs, books, bet types, sides and snapshot timestamps repeat
+    across thousands of records; interning makes every record share one
+    string object per distinct value.
+
+    Args:
+        record: Flat record dict
+
+    Returns:
+        The same record
+    """
+    for field in CATEGORICAL_FIELDS:
+        value = record.get(field)
+        if type(value) is str:
+            record[field] = sys.intern(value)
+
+    return record
+
+
+class MarketDataIndex:
+    """Hash tables of uploaded market data keyed by game_id."""
+
+    def __init__(self):
+        # game_id -> bet_type -> odds info (latest row wins)
+        self.odds: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # game_id -> bet_type -> public betting info
+        self.public_betting: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # game_id -> movement rows in upload order
+        self.line_movements: Dict[str, List[Dict[str, Any]]] = {}
+
+        # (game_id, bet_type, side) pairs set explicitly, not as a complement
+        self._explicit_sides: Set[Tuple[str, str, str]] = set()
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def game_ids(self) -> Set[str]:
+        """Game IDs with any indexed market data."""
+        return set(self.odds) | set(self.public_betting) | set(self.line_movements)
+
+    def add_odds(self, records: Iterable[Dict[str, Any]]):
+        """
+        Index odds rows.
+
+        Args:
+            records: Flat odds records as written by DataInputManager
+        """
+        invalid = 0
+
+        for record in records:
+            game_id = record.get("game_id")
+            bet_type = str(record.get("bet_type") or "").lower()
+            if not game_id or not bet_type or record.get("odds") is None:
+                continue
+
+            price = to_number(record["odds"])
+            raw_line = record.get("line_value")
+            line = None if raw_line in (None, "") else to_number(raw_line)
+            if price is None or (line is None and raw_line not in (None, "")):
+                invalid += 1
+                continue
+
+            side = str(record.get("side") or "").lower()
+            if bet_type == "moneyline" and side:
+                keys = [side]
+            elif side:
+                keys = [f"{side}_odds"]
+            else:
+                keys = DEFAULT_ODDS_KEYS.get(bet_type, ["odds"])
+
+            book = record.get("book") or "Unknown"
+            price = int(round(price))
+
+            info = self.odds.setdefault(game_id, {}).setdefault(bet_type, {"books": {}})
+            book_info = info["books"].setdefault(book, {})
+
+            for key in keys:
+                info[key] = price
+                book_info[key] = price
+
+            info["book"] = book
+            if line is not None:
+                info["line"] = line
+                book_info["line"] = line
+
+        if invalid:
+            self.logger.warning(f"⚠️ Skipped {invalid} odds rows with non-numeric odds or line values")
+
+    def add_public_betting(self, records: Iterable[Dict[str, Any]]):
+        """
+        Index public betting rows.
+
+        The opposite side is filled as the complement (100 - pct) unless
+        it was uploaded explicitly.
+
+        Args:
+            records: Flat public betting records as written by DataInputManager
+        """
+        invalid = 0
+
+        for record in records:
+            game_id = record.get("game_id")
+            bet_type = str(record.get("bet_type") or "").lower()
+            side = str(record.get("side") or "home").lower()
+            if not game_id or not bet_type:
+                continue
+            if record.get("bets_percentage") is None or record.get("money_percentage") is None:
+                continue
+
+            bets_pct = to_number(record["bets_percentage"])
+            money_pct = to_number(record["money_percentage"])
+            if bets_pct is None or money_pct is None:
+                invalid += 1
+                continue
+
+            info = self.public_betting.setdefault(game_id, {}).setdefault(bet_type, {})
+            info[f"{side}_bets_pct"] = bets_pct
+            info[f"{side}_money_pct"] = money_pct
+            self._explicit_sides.add((game_id, bet_type, side))
+
+            opposite = OPPOSITE_SIDES.get(side)
+            if opposite and (game_id, bet_type, opposite) not in self._explicit_sides:
+                info[f"{opposite}_bets_pct"] = 100 - bets_pct
+                info[f"{opposite}_money_pct"] = 100 - money_pct
+
+        if invalid:
+            self.logger.warning(f"⚠️ Skipped {invalid} public betting rows with non-numeric percentages")
+
+    def add_line_movements(self, records: Iterable[Dict[str, Any]]):
+        """
+        Index line movement rows.
+
+        Args:
+            records: Line movement records as written by DataInputManager
+        """
+        for record in records:
+            game_id = record.get("game_id")
+            if game_id:
+                self.line_movements.setdefault(game_id, []).append(intern_categoricals(record))
+
+    def join(
+        self,
+        game_id: str,
+        odds_data: Dict[str, Any],
+        public_betting_data: Dict[str, Any],
+        line_movement_data: List[Dict[str, Any]]
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Merge indexed market data into a game's embedded data.
+
+        Indexed values override embedded ones per bet type; movements
+        already embedded in the game are not duplicated.
+
+        Args:
+            game_id: Game identifier
+            odds_data: Odds embedded in the game record
+            public_betting_data: Public betting data embedded in the game record
+            line_movement_data: Line movements embedded in the game record
+
+        Returns:
+            Tuple of merged (odds_data, public_betting_data, line_movement_data),
+            or None if nothing is indexed for the game
+        """
+        odds = self.odds.get(game_id)
+        public = self.public_betting.get(game_id)
+        movements = self.line_movements.get(game_id)
+
+        if odds is None and public is None and movements is None:
+            return None
+
+        merged_odds = dict(odds_data or {})
+        for bet_type, info in (odds or {}).items():
+            merged_odds[bet_type] = {**merged_odds.get(bet_type, {}), **info}
+
+        merged_public = dict(public_betting_data or {})
+        for bet_type, info in (public or {}).items():
+            merged_public[bet_type] = {**merged_public.get(bet_type, {}), **info}
+
+        merged_movements = list(line_movement_data or [])
+        if movements:
+            seen = {self._movement_key(movement) for movement in merged_movements}
+            for movement in movements:
+                key = self._movement_key(movement)
+                if key not in seen:
+                    seen.add(key)
+                    merged_movements.append(movement)
+
+            merged_movements.sort(key=lambda movement: self._timestamp_key(movement.get("timestamp")))
+
+        return merged_odds, merged_public, merged_movements
+
+    def _movement_key(self, movement: Dict[str, Any]) -> tuple:
+        """Identity of a movement row for de-duplication."""
+        return (
+            movement.get("book"),
+            movement.get("bet_type"),
+            movement.get("from_line"),
+            movement.get("to_line"),
+            self._timestamp_key(movement.get("timestamp"))
+        )
+
+    def _timestamp_key(self, timestamp: Any) -> str:
+        """Sortable timestamp string ("2025-01-15 18:00:00" == "2025-01-15T18:00:00")."""
+        return "" if timestamp is None else str(timestamp).replace(" ", "T")
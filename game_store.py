@@ -0,0 +1,456 @@
+"""
+SQLite Game Store for Sharp Betting Predictor
+
+Indexed embedded-database storage for game data:
+- Games table indexed on game_id, sport and game_date
+- Odds, public betting and line movements as child tables
+- Sport/date filters pushed into the query
+- A change log of written game IDs, so readers in any process can find
+  what changed since they last looked
+
+Returns plain game dicts in the same shape as games_*.json records, so
+DataInputManager can convert them with _dict_to_game_data.
+"""
+
+import json
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    sport TEXT NOT NULL COLLATE NOCASE,
+    home_team TEXT,
+    away_team TEXT,
+    game_date TEXT,
+    matchup_data TEXT,
+    model_predictions TEXT,
+    sharp_indicators TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_sport_date ON games (sport, game_date);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games (game_date);
+
+CREATE TABLE IF NOT EXISTS odds (
+    game_id TEXT NOT NULL,
+    bet_type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (game_id, bet_type)
+);
+
+CREATE TABLE IF NOT EXISTS public_betting (
+    game_id TEXT NOT NULL,
+    bet_type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (game_id, bet_type)
+);
+
+CREATE TABLE IF NOT EXISTS line_movements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL,
+    book TEXT,
+    bet_type TEXT,
+    from_line REAL,
+    to_line REAL,
+    timestamp TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_line_movements_game ON line_movements (game_id, timestamp);
+
+-- Change log: one row per written game, read by changes_since
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS imported_files (
+    filename TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteGameStore:
+    """SQLite-backed game storage with indexed lookups."""
+
+    def __init__(self, database_path: str = "data/games.db"):
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation (commits on success)."""
+        conn = sqlite3.connect(str(self.database_path), timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def upsert_games(self, games: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update game records.
+
+        Odds and public betting data are replaced only when the record
+        includes that key. Line movements are merged: a movement replaces a
+        stored one with the same timestamp, book and bet type, and other
+        stored movements (e.g. from add_line_movements) are kept.
+
+        Args:
+            games: Game dicts in games_*.json format
+
+        Returns:
+            Number of games written
+        """
+        with self._connect() as conn:
+            for game in games:
+                game_id = game["game_id"]
+
+                conn.execute(
+                    """
+                    INSERT INTO games (game_id, sport, home_team, away_team, game_date,
+                                       matchup_data, model_predictions, sharp_indicators, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(game_id) DO UPDATE SET
+                        sport = excluded.sport,
+                        home_team = excluded.home_team,
+                        away_team = excluded.away_team,
+                        game_date = excluded.game_date,
+                        matchup_data = excluded.matchup_data,
+                        model_predictions = excluded.model_predictions,
+                        sharp_indicators = excluded.sharp_indicators,
+                        metadata = excluded.metadata
+                    """,
+                    (
+                        game_id,
+                        game["sport"],
+                        game.get("home_team"),
+                        game.get("away_team"),
+                        self._normalize_date(game.get("game_date")),
+                        self._dumps(game.get("matchup_data", {})),
+                        self._dumps(game.get("model_predictions")),
+                        self._dumps(game.get("sharp_indicators")),
+                        self._dumps(game.get("metadata", {}))
+                    )
+                )
+
+                if "odds_data" in game:
+                    self._replace_children(conn, "odds", game_id, game["odds_data"] or {})
+
+                if "public_betting_data" in game:
+                    self._replace_children(conn, "public_betting", game_id, game["public_betting_data"] or {})
+
+                if game.get("line_movement_data"):
+                    movements = [dict(movement, game_id=game_id) for movement in game["line_movement_data"]]
+                    conn.executemany(
+                        "DELETE FROM line_movements WHERE game_id = ? AND timestamp = ? AND book IS ? AND bet_type IS ?",
+                        [
+                            (game_id, str(movement.get("timestamp", "")), movement.get("book"), movement.get("bet_type"))
+                            for movement in movements
+                        ]
+                    )
+                    self._insert_movements(conn, movements)
+
+            self._log_changes(conn, [game["game_id"] for game in games])
+
+        return len(games)
+
+    def merge_market_data(self, table: str, market_data: Dict[str, Dict[str, Dict[str, Any]]]) -> int:
+        """
+        Merge uploaded odds or public betting into the child tables.
+
+        A stored bet type is updated key by key (per-book prices under
+        "books" as well), so an upload covering one book or side keeps the
+        rest. Games need not exist yet.
+
+        Args:
+            table: "odds" or "public_betting"
+            market_data: game_id -> bet_type -> info, as built by MarketDataIndex
+
+        Returns:
+            Number of (game, bet type) rows written
+        """
+        if table not in ("odds", "public_betting"):
+            raise ValueError(f"Unknown market data table: {table}")
+
+        written = 0
+
+        with self._connect() as conn:
+            for game_id, bet_types in market_data.items():
+                for bet_type, info in bet_types.items():
+                    row = conn.execute(
+                        f"SELECT data FROM {table} WHERE game_id = ? AND bet_type = ?", (game_id, bet_type)
+                    ).fetchone()
+                    merged = (self._loads(row[0]) if row else None) or {}
+
+                    books = dict(merged.get("books") or {})
+                    for book, prices in (info.get("books") or {}).items():
+                        books[book] = {**books.get(book, {}), **prices}
+
+                    merged.update(info)
+                    if books:
+                        merged["books"] = books
+
+                    conn.execute(
+                        f"""
+                        INSERT INTO {table} (game_id, bet_type, data) VALUES (?, ?, ?)
+                        ON CONFLICT(game_id, bet_type) DO UPDATE SET data = excluded.data
+                        """,
+                        (game_id, bet_type, self._dumps(merged))
+                    )
+                    written += 1
+
+            self._log_changes(conn, market_data)
+
+        return written
+
+    def add_line_movements(self, movements: List[Dict[str, Any]]) -> int:
+        """
+        Append line movements (games need not exist yet).
+
+        Args:
+            movements: Movement dicts with game_id
+
+        Returns:
+            Number of movements written
+        """
+        with self._connect() as conn:
+            self._insert_movements(conn, movements)
+            self._log_changes(conn, [movement["game_id"] for movement in movements])
+
+        return len(movements)
+
+    def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a game by ID (primary key lookup).
+
+        Args:
+            game_id: Game identifier
+
+        Returns:
+            Game dict if found, None otherwise
+        """
+        games = self._query_games("WHERE game_id = ?", (game_id,))
+        return games[0] if games else None
+
+    def get_games(
+        self,
+        sport: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get games with sport/date filters applied in SQL.
+
+        Args:
+            sport: Sport filter, case-insensitive (optional)
+            start_date: Earliest game date, inclusive (optional)
+            end_date: Latest game date, inclusive (optional)
+
+        Returns:
+            List of game dicts ordered by game date
+        """
+        conditions = []
+        params: List[Any] = []
+
+        if sport is not None:
+            conditions.append("sport = ?")
+            params.append(sport)
+        if start_date is not None:
+            conditions.append("game_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append("game_date <= ?")
+            params.append(end_date.isoformat())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query_games(where, tuple(params))
+
+    def change_sequence(self) -> int:
+        """Sequence number of the latest change log entry (0 if none)."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def changes_since(self, sequence: int) -> Tuple[int, Set[str]]:
+        """
+        Games written by any process after a change log position.
+
+        Args:
+            sequence: Sequence number from change_sequence or a previous call
+
+        Returns:
+            Tuple of (latest sequence number, changed game IDs)
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT seq, game_id FROM changes WHERE seq > ?", (sequence,)).fetchall()
+
+        return max((seq for seq, _ in rows), default=sequence), {game_id for _, game_id in rows}
+
+    def count_games(self) -> int:
+        """Count stored games."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def import_json_files(self, data_directory: str) -> int:
+        """
+        Import games_*.json files that are new or changed since their last import.
+
+        Imported files are tracked by name, mtime and size, so files added
+        to a directory after the store was created are picked up too.
+
+        Args:
+            data_directory: Directory containing games_*.json files
+
+        Returns:
+            Number of games imported
+        """
+        imported = 0
+
+        with self._connect() as conn:
+            known = {
+                filename: (mtime_ns, size)
+                for filename, mtime_ns, size in conn.execute("SELECT filename, mtime_ns, size FROM imported_files")
+            }
+
+        for game_file in sorted(Path(data_directory).glob("games_*.json")):
+            try:
+                stat = game_file.stat()
+                if known.get(game_file.name) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                with open(game_file, 'r') as f:
+                    games = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                self.logger.error(f"Error reading {game_file}: {str(e)}")
+                continue
+
+            if isinstance(games, dict):
+                games = [games]
+
+            imported += self.upsert_games([g for g in games if isinstance(g, dict) and "game_id" in g])
+
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO imported_files (filename, mtime_ns, size) VALUES (?, ?, ?)",
+                    (game_file.name, stat.st_mtime_ns, stat.st_size)
+                )
+
+        return imported
+
+    def _query_games(self, where: str, params: tuple) -> List[Dict[str, Any]]:
+        """Load games matching a WHERE clause along with their child rows."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT game_id, sport, home_team, away_team, game_date,
+                       matchup_data, model_predictions, sharp_indicators, metadata
+                FROM games {where}
+                ORDER BY game_date, game_id
+                """,
+                params
+            ).fetchall()
+
+            if not rows:
+                return []
+
+            games: Dict[str, Dict[str, Any]] = {}
+            for row in rows:
+                games[row[0]] = {
+                    "game_id": row[0],
+                    "sport": row[1],
+                    "home_team": row[2],
+                    "away_team": row[3],
+                    "game_date": row[4],
+                    "matchup_data": self._loads(row[5]) or {},
+                    "odds_data": {},
+                    "public_betting_data": {},
+                    "line_movement_data": [],
+                    "model_predictions": self._loads(row[6]),
+                    "sharp_indicators": self._loads(row[7]),
+                    "metadata": self._loads(row[8]) or {}
+                }
+
+            # Child rows for the same game set, one query per table
+            subquery = f"SELECT game_id FROM games {where}"
+
+            for table, key in (("odds", "odds_data"), ("public_betting", "public_betting_data")):
+                for game_id, bet_type, data in conn.execute(
+                    f"SELECT game_id, bet_type, data FROM {table} WHERE game_id IN ({subquery})",
+                    params
+                ):
+                    games[game_id][key][bet_type] = self._loads(data)
+
+            for game_id, data in conn.execute(
+                f"SELECT game_id, data FROM line_movements WHERE game_id IN ({subquery}) "
+                f"ORDER BY game_id, timestamp, id",
+                params
+            ):
+                games[game_id]["line_movement_data"].append(self._loads(data))
+
+        return list(games.values())
+
+    def _replace_children(self, conn: sqlite3.Connection, table: str, game_id: str, data: Dict[str, Any]):
+        """Replace a game's per-bet-type child rows."""
+        conn.execute(f"DELETE FROM {table} WHERE game_id = ?", (game_id,))
+        conn.executemany(
+            f"INSERT INTO {table} (game_id, bet_type, data) VALUES (?, ?, ?)",
+            [(game_id, bet_type, self._dumps(value)) for bet_type, value in data.items()]
+        )
+
+    def _log_changes(self, conn: sqlite3.Connection, game_ids: Iterable[str]):
+        """Append written games to the change log."""
+        conn.executemany("INSERT INTO changes (game_id) VALUES (?)", [(game_id,) for game_id in set(game_ids)])
+
+    def _insert_movements(self, conn: sqlite3.Connection, movements: List[Dict[str, Any]]):
+        """Insert line movement rows."""
+        conn.executemany(
+            """
+            INSERT INTO line_movements (game_id, book, bet_type, from_line, to_line, timestamp, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    movement["game_id"],
+                    movement.get("book"),
+                    movement.get("bet_type"),
+                    movement.get("from_line"),
+                    movement.get("to_line"),
+                    str(movement.get("timestamp", "")),
+                    self._dumps(movement)
+                )
+                for movement in movements
+            ]
+        )
+
+    def _normalize_date(self, value: Any) -> Optional[str]:
+        """Store dates as ISO strings so range filters compare correctly."""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).isoformat()
+            except ValueError:
+                return value
+        return None if value is None else str(value)
+
+    def _dumps(self, value: Any) -> Optional[str]:
+        """Serialize a JSON column."""
+        return None if value is None else json.dumps(value, default=str)
+
+    def _loads(self, value: Optional[str]) -> Any:
+        """Deserialize a JSON column."""
+        return None if value is None else json.loads(value)
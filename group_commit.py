@@ -0,0 +1,222 @@
+"""
+Group Commit Writer for Sharp Betting Predictor
+
+Batches records submitted concurrently (e.g. from several Flask request
+threads) into single atomic commits:
+- Callers block until the batch holding their record is committed, so an
+  acknowledged write is durable
+- Records arriving while a commit is running form the next batch
+- A batch is flushed at most max_delay seconds after its first record
+
+file_lock serializes read-modify-write commits across processes sharing
+a data directory (several web workers); append_lines appends a batch to
+a JSON-lines log without rewriting it.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - in-process locking only
+    fcntl = None
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on a lock file.
+
+    Args:
+        lock_path: Lock file (created if missing)
+    """
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, text: str, fsync: bool = True):
+    """
+    Replace a file's contents atomically (temp file + rename).
+
+    Args:
+        path: Destination file
+        text: New contents
+        fsync: Flush the temp file to disk before the rename
+    """
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        with open(temp_path, 'w') as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        temp_path.replace(path)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def append_lines(path: Path, lines: List[str], fsync: bool = True):
+    """
+    Append newline-terminated lines to a file.
+
+    A torn final line left by an interrupted append is terminated first,
+    so it stays one unreadable line instead of absorbing the first new one.
+
+    Args:
+        path: File to append to (created if missing)
+        lines: Lines without trailing newlines
+        fsync: Flush the file to disk before returning
+    """
+    with open(path, 'a+b') as f:
+        text = "".join(f"{line}\n" for line in lines)
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                text = "\n" + text
+        f.write(text.encode("utf-8"))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class GroupCommitWriter:
+    """Batches concurrently submitted records into grouped commits."""
+
+    def __init__(
+        self,
+        commit: Callable[[List[Any]], None],
+        max_batch_size: int = 1000,
+        max_delay: float = 0.001,
+        name: str = "group-commit"
+    ):
+        """
+        Args:
+            commit: Writes one batch atomically; raising fails every
+                record in the batch
+            max_batch_size: Most records per commit
+            max_delay: Seconds to wait for more records after the first
+                one of a batch arrives
+            name: Writer thread name
+        """
+        self.commit = commit
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.name = name
+
+        self._queue: List[Tuple[Any, Future]] = []
+        self._pending = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        self.commits = 0
+        self.records_committed = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def submit(self, record: Any) -> Future:
+        """
+        Queue a record for the next commit.
+
+        Args:
+            record: Record to write
+
+        Returns:
+            Future resolved once the record is committed
+        """
+        future: Future = Future()
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"{self.name} writer is closed")
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+            self._queue.append((record, future))
+            self._pending += 1
+            self._condition.notify_all()
+
+        return future
+
+    def write(self, record: Any, timeout: Optional[float] = None):
+        """
+        Write a record, blocking until its batch is committed.
+
+        Args:
+            record: Record to write
+            timeout: Seconds to wait (None = no limit)
+        """
+        self.submit(record).result(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted record is committed.
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue drained in time
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush outstanding records and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        """Writer loop: collect a batch, commit it, resolve its futures."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+
+                deadline = time.monotonic() + self.max_delay
+                while len(self._queue) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+
+            try:
+                self.commit([record for record, _ in batch])
+            except Exception as e:
+                self.logger.error(f"{self.name} commit of {len(batch)} records failed: {str(e)}")
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                self.commits += 1
+                self.records_committed += len(batch)
+                for _, future in batch:
+                    future.set_result(None)
+
+            with self._condition:
+                self._pending -= len(batch)
+                self._condition.notify_all()
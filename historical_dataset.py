@@ -0,0 +1,254 @@
+"""
+Processed Historical Dataset
+
+DataManager writes processed historical data as a partitioned columnar
+dataset (see columnar_store):
+
+    data/processed/
+        soccer/{country}/{league}/{season}.cols/
+        mlb/{season}.cols/
+
+Each partition holds flat, typed match/game rows. HistoricalDataset loads
+only the partitions (league/season) and columns a caller asks for, so a
+single-league model never opens the other leagues' files and unused
+columns are never read from disk.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from columnar_store import COLUMNAR_SUFFIX, ColumnarDataset, META_FILENAME, write_columnar
+
+
+# Bumped whenever the processed row layout changes (recorded in each partition sidecar)
+SCHEMA_VERSION = 1
+
+# Column kinds of processed rows ("category", "float", "datetime")
+SOCCER_MATCH_SCHEMA = {
+    "date": "datetime",
+    "country": "category",
+    "league": "category",
+    "league_name": "category",
+    "season": "category",
+    "league_id": "category",
+    "match_id": "category",
+    "home_team": "category",
+    "away_team": "category",
+    "home_goals": "float",
+    "away_goals": "float",
+    "home_xg": "float",
+    "away_xg": "float",
+    "possession_home": "float",
+    "possession_away": "float",
+    "shots_home": "float",
+    "shots_away": "float",
+    "status": "category"
+}
+
+MLB_GAME_SCHEMA = {
+    "Date": "datetime",
+    "Season": "category",
+    "GameID": "category",
+    "HomeTeam": "category",
+    "AwayTeam": "category",
+    "HomeRuns": "float",
+    "AwayRuns": "float",
+    "Status": "category"
+}
+
+SCHEMAS = {"soccer": SOCCER_MATCH_SCHEMA, "mlb": MLB_GAME_SCHEMA}
+
+
+def _first(record: Dict[str, Any], *keys: str) -> Any:
+    """First present, non-empty value among alternative field names."""
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def flatten_soccer_match(match: Dict[str, Any], country: str, league: str,
+                         season: Any, league_id: Any) -> Dict[str, Any]:
+    """
+    Flatten a FootyStats (or sample) match into a processed row.
+
+    Args:
+        match: Raw match dict
+        country: Country partition key
+        league: League partition key (directory name)
+        season: Season label
+        league_id: Provider league ID
+
+    Returns:
+        Row matching SOCCER_MATCH_SCHEMA
+    """
+    date = _first(match, "date", "date_unix")
+    if isinstance(date, (int, float)):
+        date = datetime.fromtimestamp(date).isoformat()
+
+    return {
+        "date": date,
+        "country": country,
+        "league": league,
+        "league_name": league.replace("_", " ").title(),
+        "season": None if season is None else str(season),
+        "league_id": None if league_id is None else str(league_id),
+        "match_id": _first(match, "id", "match_id"),
+        "home_team": _first(match, "home_team", "home_name"),
+        "away_team": _first(match, "away_team", "away_name"),
+        "home_goals": _first(match, "home_goals", "homeGoalCount"),
+        "away_goals": _first(match, "away_goals", "awayGoalCount"),
+        "home_xg": _first(match, "home_xg", "team_a_xg"),
+        "away_xg": _first(match, "away_xg", "team_b_xg"),
+        "possession_home": _first(match, "possession_home", "team_a_possession"),
+        "possession_away": _first(match, "possession_away", "team_b_possession"),
+        "shots_home": _first(match, "shots_home", "team_a_shots"),
+        "shots_away": _first(match, "shots_away", "team_b_shots"),
+        "status": match.get("status")
+    }
+
+
+def flatten_mlb_game(game: Dict[str, Any], season: Any) -> Dict[str, Any]:
+    """
+    Flatten a SportsData.io game into a processed row.
+
+    Args:
+        game: Raw game dict
+        season: Season partition key
+
+    Returns:
+        Row matching MLB_GAME_SCHEMA
+    """
+    return {
+        "Date": _first(game, "DateTime", "Day", "Date"),
+        "Season": str(_first(game, "Season") or season),
+        "GameID": game.get("GameID"),
+        "HomeTeam": game.get("HomeTeam"),
+        "AwayTeam": game.get("AwayTeam"),
+        "HomeRuns": _first(game, "HomeTeamRuns", "HomeRuns"),
+        "AwayRuns": _first(game, "AwayTeamRuns", "AwayRuns"),
+        "Status": game.get("Status")
+    }
+
+
+def write_partition(rows: List[Dict[str, Any]], path: Path, sport: str) -> Path:
+    """
+    Write processed rows as one columnar partition.
+
+    Args:
+        rows: Flat rows from flatten_soccer_match/flatten_mlb_game
+        path: Partition directory (ending in .cols)
+        sport: "soccer" or "mlb"
+
+    Returns:
+        Path of the written partition
+    """
+    return write_columnar(rows, path, f"{sport}_processed", schema=SCHEMAS[sport])
+
+
+def partition_key(name: Any) -> str:
+    """Normalize a league/country/season name to its directory form."""
+    return str(name).lower().replace(" ", "_").replace("/", "_")
+
+
+class HistoricalDataset:
+    """Partition- and column-selective reader of processed historical data."""
+
+    def __init__(self, processed_dir: Path, sport: str):
+        """
+        Args:
+            processed_dir: Processed data root (data/processed)
+            sport: "soccer" or "mlb"
+        """
+        self.root = Path(processed_dir) / sport
+        self.sport = sport
+        self.logger = logging.getLogger(__name__)
+
+    def partitions(
+        self,
+        countries: Optional[Iterable[str]] = None,
+        leagues: Optional[Iterable[str]] = None,
+        seasons: Optional[Iterable[Any]] = None
+    ) -> List[Path]:
+        """
+        List partitions matching the filters, using directory names only.
+
+        Args:
+            countries: Countries to include (soccer; all if None)
+            leagues: Leagues to include, by name or directory name (soccer; all if None)
+            seasons: Seasons to include (all if None)
+
+        Returns:
+            Partition directories
+        """
+        if not self.root.exists():
+            return []
+
+        wanted = {
+            "country": {partition_key(c) for c in countries} if countries else None,
+            "league": {partition_key(l) for l in leagues} if leagues else None,
+            "season": {partition_key(s) for s in seasons} if seasons else None
+        }
+
+        pattern = f"*/*/*{COLUMNAR_SUFFIX}" if self.sport == "soccer" else f"*{COLUMNAR_SUFFIX}"
+        selected = []
+
+        for path in sorted(self.root.glob(pattern)):
+            keys = {"season": path.name[:-len(COLUMNAR_SUFFIX)]}
+            if self.sport == "soccer":
+                keys.update({"country": path.parent.parent.name, "league": path.parent.name})
+
+            if all(values is None or keys.get(name) in values for name, values in wanted.items()):
+                if (path / META_FILENAME).exists():
+                    selected.append(path)
+
+        return selected
+
+    def load(
+        self,
+        columns: Optional[List[str]] = None,
+        countries: Optional[Iterable[str]] = None,
+        leagues: Optional[Iterable[str]] = None,
+        seasons: Optional[Iterable[Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Load selected columns of selected partitions.
+
+        Args:
+            columns: Columns to read (all schema columns if None)
+            countries: Countries to include (soccer)
+            leagues: Leagues to include (soccer)
+            seasons: Seasons to include
+
+        Returns:
+            DataFrame of the matching rows (empty if none)
+        """
+        columns = list(columns or SCHEMAS[self.sport])
+        frames = []
+
+        for path in self.partitions(countries, leagues, seasons):
+            dataset = ColumnarDataset(path)
+            present = [column for column in columns if column in dataset.columns]
+            frame = dataset.to_dataframe(present)
+            for column in columns:
+                if column not in frame.columns:
+                    frame[column] = None
+            frames.append(frame[columns])
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+
+        df = pd.concat(frames, ignore_index=True)
+
+        # Per-partition dictionaries differ; decode categories to plain strings
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(object)
+
+        self.logger.info(f"Loaded {len(df)} {self.sport} rows from {len(frames)} partitions")
+        return df
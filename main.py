@@ -32,6 +32,8 @@ import requests
 from scipy import stats
 from tenacity import retry, stop_after_attempt, wait_fixed
 
+from api_stub import upstream_url
+
 warnings.filterwarnings('ignore')
 
 # ---------------------------------------------------------------------------
@@ -80,7 +82,7 @@ class BettingCandidate:
 def fetch_json(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Any:
     """Fetch JSON data with error handling."""
     try:
-        response = requests.get(url, params=params or {}, headers=headers or {}, timeout=10)
+        response = requests.get(upstream_url(url), params=params or {}, headers=headers or {}, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -24,6 +24,8 @@ from typing import Dict, List, Optional, Tuple, Any
 import logging
 from dataclasses import dataclass
 
+from historical_dataset import HistoricalDataset
+
 # ML Libraries
 try:
     from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
@@ -47,6 +49,13 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 MODELS_DIR = Path("models")
 MODELS_DIR.mkdir(exist_ok=True)
 
+# Processed columns the models train on (identifiers like GameID/season stay on disk)
+MLB_TRAINING_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'HomeRuns', 'AwayRuns']
+SOCCER_TRAINING_COLUMNS = [
+    'date', 'league_name', 'country', 'home_team', 'away_team', 'home_goals', 'away_goals',
+    'home_xg', 'away_xg', 'possession_home', 'possession_away', 'shots_home', 'shots_away'
+]
+
 @dataclass
 class ModelPrediction:
     """Model prediction result."""
@@ -70,10 +79,29 @@ class MLBPredictor:
         # Auto-load existing models if available
         self._load_models()
         
-    def load_historical_data(self) -> pd.DataFrame:
-        """Load processed MLB historical data."""
+    def load_historical_data(self, seasons: Optional[List[Any]] = None,
+                             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load processed MLB historical data.
+        
+        Reads only the requested season partitions and columns of the
+        processed dataset; unplayed games are dropped.
+        
+        Args:
+            seasons: Seasons to load (all if None)
+            columns: Columns to load (default: MLB_TRAINING_COLUMNS)
+        
+        Returns:
+            pd.DataFrame: Historical games
+        """
         
         try:
+            df = HistoricalDataset(PROCESSED_DATA_DIR, "mlb").load(columns or MLB_TRAINING_COLUMNS, seasons=seasons)
+            df = df.dropna(subset=[col for col in ['HomeRuns', 'AwayRuns'] if col in df.columns])
+            if len(df) > 0:
+                logger.info(f"✅ Loaded MLB data: {len(df)} records")
+                return df
+            
             data_file = PROCESSED_DATA_DIR / "mlb_ml_dataset.csv"
             
             if not data_file.exists():
@@ -351,10 +379,38 @@ class SoccerPredictor:
         # Auto-load existing models if available
         self._load_models()
     
-    def load_historical_data(self) -> pd.DataFrame:
-        """Load processed soccer historical data."""
+    def load_historical_data(self, leagues: Optional[List[str]] = None, seasons: Optional[List[Any]] = None,
+                             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load processed soccer historical data.
+        
+        Reads only the requested league/season partitions and columns of
+        the processed dataset; unplayed matches are dropped and the match
+        result is derived from the score.
+        
+        Args:
+            leagues: Leagues to load, e.g. ["English Premier League"] (all if None)
+            seasons: Seasons to load (all if None)
+            columns: Columns to load (default: SOCCER_TRAINING_COLUMNS)
+        
+        Returns:
+            pd.DataFrame: Historical matches
+        """
         
         try:
+            df = HistoricalDataset(PROCESSED_DATA_DIR, "soccer").load(
+                columns or SOCCER_TRAINING_COLUMNS, leagues=leagues, seasons=seasons
+            )
+            if 'home_goals' in df.columns and 'away_goals' in df.columns:
+                df = df.dropna(subset=['home_goals', 'away_goals'])
+                df['result'] = np.select(
+                    [df['home_goals'] > df['away_goals'], df['home_goals'] < df['away_goals']],
+                    ['home_win', 'away_win'], default='draw'
+                )
+            if len(df) > 0:
+                logger.info(f"✅ Loaded soccer data: {len(df)} records")
+                return df
+            
             data_file = PROCESSED_DATA_DIR / "soccer_ml_dataset.csv"
             
             if not data_file.exists():
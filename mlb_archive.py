@@ -0,0 +1,107 @@
+"""
+Lazy Reader for the SportsData.io MLB Archive
+
+The bulk MLB download is a zip of JSON and CSV files (games, box scores,
+player stats, ...) that is much larger decompressed than on disk.
+MLBArchiveReader parses one member at a time straight from the zip
+stream, so only the member being read is ever decompressed, and large
+CSV members can be read in DataFrame chunks.
+
+Usage:
+    reader = MLBArchiveReader("historical_data/mlb/mlb_historical_data_20250115.zip")
+    for name, games in reader.iter_members("*Games*.json"):
+        ...
+    for chunk in reader.iter_csv_chunks("PlayerGameStats.csv", chunksize=50000):
+        ...
+"""
+
+import fnmatch
+import io
+import json
+import logging
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+
+class MLBArchiveReader:
+    """Reads members of the MLB archive on demand."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Zip archive downloaded by HistoricalDataDownloader.download_mlb_data
+        """
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+
+    def members(self, pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List data members without decompressing them.
+
+        Args:
+            pattern: Shell-style filter on member names (e.g. "*.csv")
+
+        Returns:
+            List of dicts with name, compressed_size and size
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            return [
+                {"name": info.filename, "compressed_size": info.compress_size, "size": info.file_size}
+                for info in archive.infolist()
+                if not info.is_dir() and self._matches(info.filename, pattern)
+            ]
+
+    def iter_members(self, pattern: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Parse members one at a time.
+
+        JSON members yield the parsed object, CSV members a DataFrame;
+        other members are skipped.
+
+        Args:
+            pattern: Shell-style filter on member names
+
+        Yields:
+            Tuples of (member name, parsed data)
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or not self._matches(name, pattern):
+                    continue
+
+                suffix = Path(name).suffix.lower()
+                if suffix not in (".json", ".csv"):
+                    continue
+
+                with archive.open(info) as member:
+                    if suffix == ".json":
+                        data = json.load(io.TextIOWrapper(member, encoding="utf-8-sig"))
+                    else:
+                        data = pd.read_csv(member)
+
+                yield name, data
+
+    def iter_csv_chunks(self, name: str, chunksize: int = 50000, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV member in DataFrame chunks.
+
+        Args:
+            name: Member name
+            chunksize: Rows per chunk
+            **read_csv_kwargs: Passed to pandas.read_csv (usecols, dtype, ...)
+
+        Yields:
+            DataFrame chunks
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            with archive.open(name) as member:
+                for chunk in pd.read_csv(member, chunksize=chunksize, **read_csv_kwargs):
+                    yield chunk
+
+    def _matches(self, name: str, pattern: Optional[str]) -> bool:
+        """Whether a member name (or its base name) matches a filter."""
+        return pattern is None or fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(Path(name).name, pattern)
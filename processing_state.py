@@ -0,0 +1,133 @@
+"""
+Incremental Processing State for Historical Data
+
+Tracks which raw source files (one league season, one MLB season, ...)
+have been processed into which output partitions, keyed by a content
+hash of the source:
+- A source whose size and mtime are unchanged is skipped without reading it
+- A touched source is re-hashed; only a changed hash triggers reprocessing
+- Partitions of sources that disappeared are reported for removal
+
+State file layout:
+    {
+        "data/soccer/england/english_premier_league/2024_season.json": {
+            "sha256": "...", "size": 48213, "mtime_ns": ..., "outputs": ["..."]
+        },
+        ...
+    }
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from group_commit import atomic_write_text
+
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ProcessingState:
+    """Source file hashes and the partitions produced from them."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: State JSON file (created on first save)
+        """
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+
+        self.sources: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.sources = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"⚠️  Reprocessing everything, unreadable state {self.path}: {e}")
+
+    def changed(self, source: Path) -> Optional[str]:
+        """
+        Check a source file against its last processed version.
+
+        Args:
+            source: Raw source file
+
+        Returns:
+            The source's new hash if it needs processing, None if unchanged
+        """
+        entry = self.sources.get(str(source))
+        stat = source.stat()
+
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            if all(Path(output).exists() for output in entry["outputs"]):
+                return None
+
+        digest = file_hash(source)
+        if entry and entry["sha256"] == digest and all(Path(output).exists() for output in entry["outputs"]):
+            # Touched but identical (e.g. re-downloaded): refresh the stat shortcut
+            entry.update({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+            return None
+
+        return digest
+
+    def mark(self, source: Path, digest: str, outputs: List[Path]):
+        """
+        Record a source as processed.
+
+        Args:
+            source: Raw source file
+            digest: Hash returned by changed()
+            outputs: Partitions written from the source
+        """
+        stat = source.stat()
+        self.sources[str(source)] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "outputs": [str(output) for output in outputs],
+            "processed_at": datetime.now().isoformat()
+        }
+
+    def outputs(self, source: Path) -> List[Path]:
+        """Partitions last written from a source."""
+        return [Path(output) for output in self.sources.get(str(source), {}).get("outputs", [])]
+
+    def forget_missing(self, sources: List[Path], prefix: Path) -> List[Path]:
+        """
+        Drop sources under a directory that no longer exist.
+
+        Args:
+            sources: Source files currently present
+            prefix: Raw data directory the sources were found in
+
+        Returns:
+            Partitions of the removed sources (to be deleted by the caller)
+        """
+        present = {str(source) for source in sources}
+        stale = [
+            key for key in self.sources
+            if key not in present and Path(key).is_relative_to(prefix)
+        ]
+
+        outputs = []
+        for key in stale:
+            outputs.extend(Path(output) for output in self.sources.pop(key)["outputs"])
+
+        return outputs
+
+    def save(self):
+        """Persist the state atomically."""
+        atomic_write_text(self.path, json.dumps(self.sources, indent=2, sort_keys=True))
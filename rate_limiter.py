@@ -0,0 +1,219 @@
+"""
+API Rate Limiting for Historical Data Downloads
+
+Per-provider token buckets shared by every downloader in the process, so
+league downloads can run concurrently while each API still sees no more
+than its quota:
+- FootyStats (api.footystats.org)
+- football-data (api.football-data.org)
+- API-Sports (*.api-sports.io)
+- SportsData (sportsdata.io)
+
+RateLimitedSession routes each request through the bucket of the host it
+targets and backs off on 429 responses, replacing fixed sleeps between
+requests.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api_stub import upstream_url
+
+
+# Requests per minute (overridable via {PROVIDER}_RATE_LIMIT) and burst size
+PROVIDER_RATE_LIMITS = {
+    "footystats": {"requests_per_minute": 30, "burst": 5},
+    "football_data": {"requests_per_minute": 10, "burst": 2},
+    "api_sports": {"requests_per_minute": 10, "burst": 2},
+    "sportsdata": {"requests_per_minute": 60, "burst": 5}
+}
+
+# Host suffix -> provider
+PROVIDER_HOSTS = {
+    "api.footystats.org": "footystats",
+    "api.football-data.org": "football_data",
+    "api-sports.io": "api_sports",
+    "sportsdata.io": "sportsdata"
+}
+
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", "8"))
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens, waiting for the bucket to refill if needed.
+
+        Waiters reserve their tokens up front (the balance may go
+        negative), so concurrent callers are served in arrival order.
+
+        Args:
+            tokens: Tokens to take
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+    def pause(self, seconds: float):
+        """
+        Hold off every caller for at least the given time (e.g. Retry-After).
+
+        Args:
+            seconds: Seconds before the next token is granted
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+    def _refill(self):
+        """Add tokens for the time elapsed since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> Optional[TokenBucket]:
+    """
+    Process-wide token bucket for a provider.
+
+    Args:
+        provider: Provider name (key of PROVIDER_RATE_LIMITS)
+
+    Returns:
+        The provider's bucket, or None for providers without a limit
+    """
+    limits = PROVIDER_RATE_LIMITS.get(provider)
+    if limits is None:
+        return None
+
+    with _buckets_lock:
+        if provider not in _buckets:
+            per_minute = float(os.getenv(f"{provider.upper()}_RATE_LIMIT", limits["requests_per_minute"]))
+            _buckets[provider] = TokenBucket(per_minute / 60.0, min(limits["burst"], per_minute))
+        return _buckets[provider]
+
+
+def provider_for_url(url: str) -> Optional[str]:
+    """Provider whose quota a URL counts against (None if unknown)."""
+    host = (urlparse(url).hostname or "").lower()
+
+    for suffix, provider in PROVIDER_HOSTS.items():
+        if host == suffix or host.endswith(f".{suffix}"):
+            return provider
+
+    return None
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session that throttles each request by its provider's bucket."""
+
+    def __init__(self, pool_size: int = DOWNLOAD_WORKERS, max_429_retries: int = 3):
+        """
+        Args:
+            pool_size: Connections kept per host (one per download worker)
+            max_429_retries: Retries of a request answered with 429
+        """
+        super().__init__()
+        self.max_429_retries = max_429_retries
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        bucket = get_rate_limiter(provider_for_url(url))
+
+        for attempt in range(self.max_429_retries + 1):
+            if bucket is not None:
+                bucket.acquire()
+
+            # Sent to the local stub instead when UPSTREAM_STUB_URL is set
+            response = super().request(method, upstream_url(url), *args, **kwargs)
+
+            if response.status_code != 429 or bucket is None or attempt == self.max_429_retries:
+                return response
+
+            retry_after = self._retry_after(response, default=2 ** attempt)
+            logger.warning(f"⚠️  Rate limited by {urlparse(url).hostname}, retrying in {retry_after:.0f}s")
+            bucket.pause(retry_after)
+
+        return response
+
+    def _retry_after(self, response: requests.Response, default: float) -> float:
+        """Seconds from a Retry-After header (delta-seconds form only)."""
+        try:
+            return max(float(response.headers.get("Retry-After", default)), 0.0)
+        except ValueError:
+            return default
+
+
+def download_concurrently(
+    download: Callable[..., Any],
+    jobs: Iterable[Tuple],
+    max_workers: int = DOWNLOAD_WORKERS
+) -> List[Tuple[Tuple, Any, Optional[Exception]]]:
+    """
+    Run download jobs on a thread pool.
+
+    Throughput is bounded by the provider token buckets, not the pool;
+    workers only overlap the time spent waiting on the network.
+
+    Args:
+        download: Callable run once per job
+        jobs: Argument tuples, one per job
+        max_workers: Threads (1 = run sequentially in the caller)
+
+    Returns:
+        (job, result, error) per job in submission order; error is the
+        exception raised, if any
+    """
+    jobs = list(jobs)
+
+    def run(job: Tuple) -> Tuple[Tuple, Any, Optional[Exception]]:
+        try:
+            return job, download(*job), None
+        except Exception as e:
+            return job, None, e
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [run(job) for job in jobs]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix="download") as executor:
+        return list(executor.map(run, jobs))
@@ -14,6 +14,8 @@ Supports both manual input and automated detection.
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+from collections import Counter
+import heapq
 import json
 
 
@@ -48,6 +50,19 @@ class SharpIndicator:
     confidence: float  # 0-1
 
 
+@dataclass
+class ConsensusSnapshot:
+    """Current consensus state for a single market."""
+    market: str
+    book_count: int
+    median_line: float
+    mean_line: float
+    low_line: float
+    high_line: float
+    line_range: float
+    is_tight: bool
+
+
 class SharpDetector:
     """Enhanced sharp betting detection system."""
     
@@ -109,7 +124,8 @@ class SharpDetector:
     def detect_steam_move(
         self, 
         line_movements: List[LineMovement], 
-        time_window_minutes: int = 15
+        time_window_minutes: int = 15,
+        reference_time: Optional[datetime] = None
     ) -> Optional[SharpIndicator]:
         """
         Detect steam moves - rapid line movement across multiple books.
@@ -117,6 +133,8 @@ class SharpDetector:
         Args:
             line_movements: List of recent line movements
             time_window_minutes: Time window to check for steam
+            reference_time: End of the time window (defaults to now; set
+                when replaying historical movements)
             
         Returns:
             SharpIndicator if steam detected, None otherwise
@@ -124,10 +142,12 @@ class SharpDetector:
         if len(line_movements) < 2:
             return None
         
+        reference_time = reference_time or datetime.now()
+        
         # Check for rapid movement across books
         recent_movements = [
             lm for lm in line_movements 
-            if (datetime.now() - lm.timestamp).total_seconds() <= time_window_minutes * 60
+            if (reference_time - lm.timestamp).total_seconds() <= time_window_minutes * 60
         ]
         
         if len(recent_movements) < 2:
@@ -228,6 +248,89 @@ class SharpDetector:
         
         return None
     
+    def build_line_movement(
+        self, 
+        open_line: float, 
+        current_line: float, 
+        books: List[str],
+        timestamp: Optional[datetime] = None
+    ) -> LineMovement:
+        """
+        Build a LineMovement from open/current lines.
+        
+        Args:
+            open_line: Opening line
+            current_line: Current line
+            books: Books that moved
+            timestamp: When the movement occurred (defaults to now)
+            
+        Returns:
+            LineMovement with direction and size derived
+        """
+        return LineMovement(
+            open_line=open_line,
+            current_line=current_line,
+            movement_direction="up" if current_line > open_line else "down",
+            movement_size=abs(current_line - open_line),
+            timestamp=timestamp or datetime.now(),
+            books_moved=books
+        )
+    
+    def build_public_data(self, bets_pct: float, money_pct: float) -> PublicBettingData:
+        """
+        Build PublicBettingData from ticket and handle percentages.
+        
+        Args:
+            bets_pct: % of tickets
+            money_pct: % of handle
+            
+        Returns:
+            PublicBettingData with split difference derived
+        """
+        return PublicBettingData(
+            bets_percentage=bets_pct,
+            money_percentage=money_pct,
+            split_difference=money_pct - bets_pct
+        )
+    
+    def analyze_signals(
+        self,
+        line_movement: Optional[LineMovement] = None,
+        public_data: Optional[PublicBettingData] = None,
+        steam_movements: Optional[List[LineMovement]] = None
+    ) -> List[SharpIndicator]:
+        """
+        Analyze typed betting data for sharp indicators.
+        
+        Args:
+            line_movement: Line movement for RLM (requires public_data)
+            public_data: Public betting percentages
+            steam_movements: Recent movements across books for steam
+            
+        Returns:
+            List of detected sharp indicators
+        """
+        indicators = []
+        
+        if line_movement is not None and public_data is not None:
+            # Check for RLM
+            rlm_indicator = self.detect_reverse_line_movement(line_movement, public_data)
+            if rlm_indicator:
+                indicators.append(rlm_indicator)
+            
+            # Check for sharp money split
+            sharp_money_indicator = self.detect_sharp_money_split(public_data)
+            if sharp_money_indicator:
+                indicators.append(sharp_money_indicator)
+        
+        # Check for steam if multiple movements provided
+        if steam_movements is not None:
+            steam_indicator = self.detect_steam_move(steam_movements)
+            if steam_indicator:
+                indicators.append(steam_indicator)
+        
+        return indicators
+    
     def analyze_manual_input(
         self, 
         manual_data: Dict[str, Any]
@@ -241,57 +344,37 @@ class SharpDetector:
         Returns:
             List of detected sharp indicators
         """
-        indicators = []
+        line_movement = None
+        public_data = None
+        steam_movements = None
         
         # Parse manual input
         if "line_movement" in manual_data:
             line_info = manual_data["line_movement"]
-            line_movement = LineMovement(
+            line_movement = self.build_line_movement(
                 open_line=line_info.get("open", 0),
                 current_line=line_info.get("current", 0),
-                movement_direction="up" if line_info.get("current", 0) > line_info.get("open", 0) else "down",
-                movement_size=abs(line_info.get("current", 0) - line_info.get("open", 0)),
-                timestamp=datetime.now(),
-                books_moved=line_info.get("books", [])
+                books=line_info.get("books", [])
+            )
+        
+        if "public_data" in manual_data:
+            public_info = manual_data["public_data"]
+            public_data = self.build_public_data(
+                bets_pct=public_info.get("bets_pct", 50),
+                money_pct=public_info.get("money_pct", 50)
             )
-            
-            if "public_data" in manual_data:
-                public_info = manual_data["public_data"]
-                public_data = PublicBettingData(
-                    bets_percentage=public_info.get("bets_pct", 50),
-                    money_percentage=public_info.get("money_pct", 50),
-                    split_difference=public_info.get("money_pct", 50) - public_info.get("bets_pct", 50)
-                )
-                
-                # Check for RLM
-                rlm_indicator = self.detect_reverse_line_movement(line_movement, public_data)
-                if rlm_indicator:
-                    indicators.append(rlm_indicator)
-                
-                # Check for sharp money split
-                sharp_money_indicator = self.detect_sharp_money_split(public_data)
-                if sharp_money_indicator:
-                    indicators.append(sharp_money_indicator)
         
-        # Check for steam if multiple movements provided
         if "steam_data" in manual_data:
-            steam_info = manual_data["steam_data"]
-            movements = []
-            for movement in steam_info:
-                movements.append(LineMovement(
+            steam_movements = [
+                self.build_line_movement(
                     open_line=movement.get("from", 0),
                     current_line=movement.get("to", 0),
-                    movement_direction="up" if movement.get("to", 0) > movement.get("from", 0) else "down",
-                    movement_size=abs(movement.get("to", 0) - movement.get("from", 0)),
-                    timestamp=datetime.now(),
-                    books_moved=movement.get("books", [])
-                ))
-            
-            steam_indicator = self.detect_steam_move(movements)
-            if steam_indicator:
-                indicators.append(steam_indicator)
+                    books=movement.get("books", [])
+                )
+                for movement in manual_data["steam_data"]
+            ]
         
-        return indicators
+        return self.analyze_signals(line_movement, public_data, steam_movements)
     
     def get_flag_emojis(self, indicators: List[SharpIndicator]) -> Dict[str, str]:
         """
@@ -339,6 +422,259 @@ class SharpDetector:
         return min(10.0, total_score)
 
 
+class _LazyHeap:
+    """Min-heap with lazy deletion - removed values are dropped when they surface."""
+    
+    def __init__(self):
+        self._heap: List[float] = []
+        self._removed: Counter = Counter()
+        self.size = 0  # Live values
+    
+    def push(self, value: float):
+        heapq.heappush(self._heap, value)
+        self.size += 1
+    
+    def remove(self, value: float):
+        """Mark one occurrence of a value (known to be present) as removed."""
+        self._removed[value] += 1
+        self.size -= 1
+        if len(self._heap) > 2 * self.size + 16:
+            self._compact()
+    
+    def top(self) -> float:
+        self._prune()
+        return self._heap[0]
+    
+    def pop(self) -> float:
+        self._prune()
+        self.size -= 1
+        return heapq.heappop(self._heap)
+    
+    def _prune(self):
+        """Drop removed values from the top of the heap."""
+        while self._heap and self._removed[self._heap[0]]:
+            self._removed[heapq.heappop(self._heap)] -= 1
+    
+    def _compact(self):
+        """Rebuild without removed values so churn doesn't grow the heap."""
+        live = []
+        for value in self._heap:
+            if self._removed[value]:
+                self._removed[value] -= 1
+            else:
+                live.append(value)
+        heapq.heapify(live)
+        self._heap = live
+        self._removed.clear()
+
+
+class _MarketLines:
+    """
+    Running median, range and mean of one market's book lines.
+    
+    The median is kept with two heaps (lower half as a max-heap, upper half
+    as a min-heap) and the range with a min-heap and a max-heap over all
+    lines, all with lazy deletion, so adding or removing a line is
+    O(log books).
+    """
+    
+    def __init__(self):
+        self._lower = _LazyHeap()  # Negated lines <= median
+        self._upper = _LazyHeap()  # Lines >= median
+        self._lows = _LazyHeap()
+        self._highs = _LazyHeap()  # Negated
+        self.total = 0.0
+    
+    @property
+    def count(self) -> int:
+        return self._lower.size + self._upper.size
+    
+    def add(self, line: float):
+        if self._lower.size == 0 or line <= -self._lower.top():
+            self._lower.push(-line)
+        else:
+            self._upper.push(line)
+        self._rebalance()
+        
+        self._lows.push(line)
+        self._highs.push(-line)
+        self.total += line
+    
+    def remove(self, line: float):
+        # Every lower-half line is <= every upper-half line, so equal lines
+        # are interchangeable between the halves
+        if line <= -self._lower.top():
+            self._lower.remove(-line)
+        else:
+            self._upper.remove(line)
+        self._rebalance()
+        
+        self._lows.remove(line)
+        self._highs.remove(-line)
+        self.total -= line
+    
+    def median(self) -> float:
+        if self._lower.size > self._upper.size:
+            return -self._lower.top()
+        return (-self._lower.top() + self._upper.top()) / 2
+    
+    def low(self) -> float:
+        return self._lows.top()
+    
+    def high(self) -> float:
+        return -self._highs.top()
+    
+    def _rebalance(self):
+        """Keep the lower half equal to, or one larger than, the upper half."""
+        if self._lower.size > self._upper.size + 1:
+            self._upper.push(-self._lower.pop())
+        elif self._upper.size > self._lower.size:
+            self._lower.push(-self._upper.pop())
+
+
+class ConsensusTracker:
+    """
+    Incremental per-market consensus tracker.
+    
+    Keeps each market's book lines in running median/range heaps so a
+    single quote change is an O(log books) update instead of a full
+    min/max/median recompute over every book. A "Consensus" indicator is
+    emitted only when the tight band forms or its median moves.
+    """
+    
+    def __init__(
+        self, 
+        detector: Optional[SharpDetector] = None,
+        band_width: float = 0.5
+    ):
+        self.detector = detector or SharpDetector()
+        self.band_width = band_width  # Max range for a tight consensus
+        
+        # market -> {book: line}
+        self._quotes: Dict[str, Dict[str, float]] = {}
+        # market -> running median/range/sum of current lines
+        self._lines: Dict[str, _MarketLines] = {}
+        # market -> median of the last emitted tight band
+        self._last_band: Dict[str, Optional[float]] = {}
+    
+    def update_quote(
+        self, 
+        market: str, 
+        book: str, 
+        line: float
+    ) -> Optional[SharpIndicator]:
+        """
+        Record a book's current line for a market.
+        
+        Args:
+            market: Market key (e.g., "game_id:spread")
+            book: Sportsbook name
+            line: Book's current line
+            
+        Returns:
+            SharpIndicator if the tight band formed or moved, None otherwise
+        """
+        quotes = self._quotes.setdefault(market, {})
+        lines = self._lines.setdefault(market, _MarketLines())
+        
+        previous = quotes.get(book)
+        if previous is not None:
+            if previous == line:
+                return None
+            lines.remove(previous)
+        
+        quotes[book] = line
+        lines.add(line)
+        
+        return self._check_band(market)
+    
+    def remove_quote(self, market: str, book: str) -> Optional[SharpIndicator]:
+        """
+        Remove a book's quote (e.g., market pulled).
+        
+        Args:
+            market: Market key
+            book: Sportsbook name
+            
+        Returns:
+            SharpIndicator if the remaining books form a new tight band
+        """
+        quotes = self._quotes.get(market)
+        if not quotes or book not in quotes:
+            return None
+        
+        self._lines[market].remove(quotes.pop(book))
+        return self._check_band(market)
+    
+    def get_consensus(self, market: str) -> Optional[ConsensusSnapshot]:
+        """
+        Get the current consensus snapshot for a market.
+        
+        Args:
+            market: Market key
+            
+        Returns:
+            ConsensusSnapshot if any books are quoted, None otherwise
+        """
+        lines = self._lines.get(market)
+        if lines is None or lines.count == 0:
+            return None
+        
+        count = lines.count
+        low_line, high_line = lines.low(), lines.high()
+        line_range = high_line - low_line
+        
+        return ConsensusSnapshot(
+            market=market,
+            book_count=count,
+            median_line=lines.median(),
+            mean_line=lines.total / count,
+            low_line=low_line,
+            high_line=high_line,
+            line_range=line_range,
+            is_tight=(
+                count >= self.detector.consensus_threshold and 
+                line_range <= self.band_width
+            )
+        )
+    
+    def reset(self, market: Optional[str] = None):
+        """Clear tracked quotes for one market, or all markets."""
+        if market is None:
+            self._quotes.clear()
+            self._lines.clear()
+            self._last_band.clear()
+            return
+        
+        for store in (self._quotes, self._lines, self._last_band):
+            store.pop(market, None)
+    
+    def _check_band(self, market: str) -> Optional[SharpIndicator]:
+        """Emit a Consensus indicator if the tight band formed or moved."""
+        snapshot = self.get_consensus(market)
+        
+        if snapshot is None or not snapshot.is_tight:
+            # Band broken - the next tight band is a new event
+            self._last_band[market] = None
+            return None
+        
+        if self._last_band.get(market) == snapshot.median_line:
+            return None
+        
+        self._last_band[market] = snapshot.median_line
+        
+        strength = 2 if snapshot.book_count >= 5 else 1
+        description = f"Consensus: {snapshot.book_count} books at {snapshot.median_line:.1f} ±{snapshot.line_range:.1f}"
+        
+        return SharpIndicator(
+            flag_type="Consensus",
+            strength=strength,
+            description=description,
+            detected_at=datetime.now(),
+            confidence=0.6
+        )
+
+
 # Example usage functions for manual input
 def create_manual_rlm_input(
     open_line: float,
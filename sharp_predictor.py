@@ -12,10 +12,13 @@ This is the main coordinator that brings together all the individual modules.
 """
 
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any, Iterable
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import json
 import logging
+import os
+import threading
 
 # Import our custom modules
 from sharp_detector import SharpDetector, SharpIndicator
@@ -24,6 +27,9 @@ from ev_engine import EVEngine, EVCalculation, RiskFactor
 from confidence_scorer import ConfidenceScorer, ConfidenceBreakdown, ConfidenceInput
 from data_input_manager import DataInputManager, GameData
 
+# Worker processes for analyze_multiple_games (0/1 = sequential)
+SHARP_ANALYSIS_WORKERS = int(os.getenv("SHARP_ANALYSIS_WORKERS", "0"))
+
 
 @dataclass
 class BettingOpportunity:
@@ -70,7 +76,13 @@ class SharpPredictorResults:
 class SharpPredictor:
     """Main Sharp Betting Predictor system."""
     
-    def __init__(self, bankroll: float = 10000.0, min_ev: float = 3.0, min_confidence: int = 7):
+    def __init__(
+        self, 
+        bankroll: float = 10000.0, 
+        min_ev: float = 3.0, 
+        min_confidence: int = 7,
+        max_workers: Optional[int] = None
+    ):
         # Initialize all components
         self.sharp_detector = SharpDetector()
         self.fair_value_calculator = FairValueCalculator()
@@ -83,6 +95,13 @@ class SharpPredictor:
         self.min_ev_threshold = min_ev
         self.min_confidence_threshold = min_confidence
         self.max_opportunities = 50  # Limit output size
+        self.max_workers = max_workers if max_workers is not None else SHARP_ANALYSIS_WORKERS
+        self.parallel_chunk_size = 16  # Games per worker task
+        
+        # Worker pool, created on first parallel run and kept until close()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_config: Optional[Tuple[float, float, int]] = None
+        self._executor_lock = threading.Lock()
         
         # Logging
         self.logger = logging.getLogger(__name__)
@@ -188,36 +207,33 @@ class SharpPredictor:
             model_prob = 0.5  # Default if no model prediction
         
         # 1. Sharp Detection
-        sharp_data = self._prepare_sharp_detection_data(
-            game_data, bet_type, side_key, odds_info, public_info, line_movements
+        sharp_indicators = self._detect_sharp_signals(
+            bet_type, side_key, odds_info, public_info, line_movements
         )
-        sharp_indicators = self.sharp_detector.analyze_manual_input(sharp_data)
         
         # 2. Fair Value Calculation
-        fair_value_data = self._prepare_fair_value_data(
+        fair_value_result = self._calculate_fair_value(
             bet_type, model_prob, market_odds, odds_info
         )
-        fair_value_results = self.fair_value_calculator.analyze_manual_input(fair_value_data)
-        fair_value_result = fair_value_results[0] if fair_value_results else None
         
         if fair_value_result is None:
             return None
         
         # 3. EV Calculation
         risk_factors = self._identify_risk_factors(game_data, predictions)
-        ev_data = self._prepare_ev_data(model_prob, market_odds, 100, risk_factors)  # $100 base stake
-        ev_calculations = self.ev_engine.analyze_manual_input(ev_data)
-        ev_calculation = ev_calculations[0] if ev_calculations else None
-        
-        if ev_calculation is None:
-            return None
+        ev_calculation = self.ev_engine.calculate_single_bet_ev(
+            win_probability=model_prob,
+            odds=market_odds,
+            stake=100,  # $100 base stake
+            risk_factors=risk_factors
+        )
         
         # 4. Confidence Scoring
-        confidence_data = self._prepare_confidence_data(
-            sharp_indicators, fair_value_result.edge_percentage, 
-            model_prob, game_data, risk_factors
+        confidence_breakdown = self.confidence_scorer.calculate_confidence_score(
+            self._build_confidence_input(
+                sharp_indicators, fair_value_result.edge_percentage, risk_factors
+            )
         )
-        confidence_breakdown = self.confidence_scorer.analyze_manual_input(confidence_data)
         
         # 5. Create comprehensive opportunity
         opportunity = BettingOpportunity(
@@ -242,7 +258,7 @@ class SharpPredictor:
             key_factors=confidence_breakdown.key_factors,
             best_book=odds_info.get("book", "Manual"),
             timestamp=datetime.now(),
-            risk_factors=[rf["description"] for rf in risk_factors] if risk_factors else [],
+            risk_factors=[rf.description for rf in risk_factors],
             ev_calculation=ev_calculation,
             fair_value_result=fair_value_result,
             confidence_breakdown=confidence_breakdown,
@@ -290,16 +306,15 @@ class SharpPredictor:
         
         return None
     
-    def _prepare_sharp_detection_data(
+    def _detect_sharp_signals(
         self,
-        game_data: GameData,
         bet_type: str,
         side_key: str,
         odds_info: Dict[str, Any],
         public_info: Dict[str, Any],
         line_movements: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Prepare data for sharp detection analysis."""
+    ) -> List[SharpIndicator]:
+        """Run sharp detection on typed line movement and public data."""
         
         # Find relevant line movements
         relevant_movements = [
@@ -307,131 +322,98 @@ class SharpPredictor:
             if lm.get("bet_type", "").lower() == bet_type.lower()
         ]
         
-        sharp_data = {}
+        line_movement = None
+        public_data = None
+        steam_movements = None
         
         # Line movement data
         if "line" in odds_info and len(relevant_movements) > 0:
             # Use the first movement as example
             movement = relevant_movements[0]
-            sharp_data["line_movement"] = {
-                "open": movement.get("from_line", 0),
-                "current": movement.get("to_line", 0),
-                "books": [movement.get("book", "Unknown")]
-            }
+            line_movement = self.sharp_detector.build_line_movement(
+                open_line=movement.get("from_line", 0),
+                current_line=movement.get("to_line", 0),
+                books=[movement.get("book", "Unknown")]
+            )
         
         # Public betting data
         if public_info:
-            bets_pct = public_info.get(f"{side_key}_bets_pct", 50)
-            money_pct = public_info.get(f"{side_key}_money_pct", 50)
-            
-            sharp_data["public_data"] = {
-                "bets_pct": bets_pct,
-                "money_pct": money_pct
-            }
+            public_data = self.sharp_detector.build_public_data(
+                bets_pct=public_info.get(f"{side_key}_bets_pct", 50),
+                money_pct=public_info.get(f"{side_key}_money_pct", 50)
+            )
         
         # Steam data if multiple movements
         if len(relevant_movements) > 1:
-            sharp_data["steam_data"] = [
-                {
-                    "from": movement.get("from_line", 0),
-                    "to": movement.get("to_line", 0),
-                    "books": [movement.get("book", "Unknown")]
-                }
+            steam_movements = [
+                self.sharp_detector.build_line_movement(
+                    open_line=movement.get("from_line", 0),
+                    current_line=movement.get("to_line", 0),
+                    books=[movement.get("book", "Unknown")]
+                )
                 for movement in relevant_movements[:3]  # Limit to first 3
             ]
         
-        return sharp_data
+        return self.sharp_detector.analyze_signals(line_movement, public_data, steam_movements)
     
-    def _prepare_fair_value_data(
+    def _calculate_fair_value(
         self,
         bet_type: str,
         model_prob: float,
         market_odds: int,
         odds_info: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Prepare data for fair value calculation."""
+    ) -> Optional[FairValueResult]:
+        """Calculate fair value for the analyzed side of a market."""
+        book = odds_info.get("book", "Manual")
         
         if bet_type == "moneyline":
-            return {
-                "moneyline": {
-                    "home_prob": model_prob,
-                    "away_prob": 1 - model_prob,
-                    "home_odds": market_odds if "home" in str(odds_info) else -110,
-                    "away_odds": -110,  # Simplified
-                    "book": odds_info.get("book", "Manual")
-                }
-            }
+            return self.fair_value_calculator.calculate_side_fair_value(
+                outcome="home_win",
+                probability=model_prob,
+                opposing_probability=1 - model_prob,
+                american_odds=market_odds if "home" in str(odds_info) else -110,
+                book=book
+            )
         elif bet_type == "spread":
-            return {
-                "spread": {
-                    "favorite_prob": model_prob,
-                    "underdog_prob": 1 - model_prob,
-                    "line": odds_info.get("line", -3.5),
-                    "favorite_odds": market_odds,
-                    "underdog_odds": -110,
-                    "book": odds_info.get("book", "Manual")
-                }
-            }
+            return self.fair_value_calculator.calculate_side_fair_value(
+                outcome=f"favorite_{odds_info.get('line', -3.5)}",
+                probability=model_prob,
+                opposing_probability=1 - model_prob,
+                american_odds=market_odds,
+                book=book
+            )
         elif bet_type == "total":
-            return {
-                "total": {
-                    "over_prob": model_prob,
-                    "under_prob": 1 - model_prob,
-                    "line": odds_info.get("line", 8.5),
-                    "over_odds": market_odds,
-                    "under_odds": -110,
-                    "book": odds_info.get("book", "Manual")
-                }
-            }
+            return self.fair_value_calculator.calculate_side_fair_value(
+                outcome=f"over_{odds_info.get('line', 8.5)}",
+                probability=model_prob,
+                opposing_probability=1 - model_prob,
+                american_odds=market_odds,
+                book=book
+            )
         
-        return {}
-    
-    def _prepare_ev_data(
-        self,
-        model_prob: float,
-        market_odds: int,
-        stake: float,
-        risk_factors: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Prepare data for EV calculation."""
-        return {
-            "single_bet": {
-                "win_probability": model_prob,
-                "odds": market_odds,
-                "stake": stake,
-                "risk_factors": risk_factors
-            }
-        }
+        return None
     
-    def _prepare_confidence_data(
+    def _build_confidence_input(
         self,
         sharp_indicators: List[SharpIndicator],
         edge_percentage: float,
-        model_prob: float,
-        game_data: GameData,
-        risk_factors: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Prepare data for confidence scoring."""
-        
-        # Extract volatility factors
-        volatility_factors = []
-        if risk_factors:
-            volatility_factors = [rf.get("type", "unknown") for rf in risk_factors]
-        
-        return {
-            "sharp_indicators": [ind.flag_type for ind in sharp_indicators],
-            "ev_percentage": edge_percentage,
-            "model_confidence": 0.8,  # Default model confidence
-            "market_stability": 0.8,  # Default market stability
-            "data_quality": 0.8,     # Default data quality
-            "volatility_factors": volatility_factors
-        }
+        risk_factors: List[RiskFactor]
+    ) -> ConfidenceInput:
+        """Build confidence scoring input."""
+        return ConfidenceInput(
+            sharp_indicators=[ind.flag_type for ind in sharp_indicators],
+            ev_percentage=edge_percentage,
+            model_confidence=0.8,  # Default model confidence
+            market_stability=0.8,  # Default market stability
+            data_quality=0.8,      # Default data quality
+            volatility_factors=[rf.factor_type for rf in risk_factors]
+        )
     
     def _identify_risk_factors(
         self, 
         game_data: GameData, 
         predictions: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
+    ) -> List[RiskFactor]:
         """Identify risk factors for the game."""
         risk_factors = []
         
@@ -441,32 +423,32 @@ class SharpPredictor:
         if "weather" in metadata:
             weather = metadata["weather"]
             if weather.get("condition") in ["rain", "snow", "wind"]:
-                risk_factors.append({
-                    "type": "weather",
-                    "impact": -0.1,  # 10% negative impact
-                    "description": f"Weather: {weather.get('condition', 'adverse')}",
-                    "confidence": 0.8
-                })
+                risk_factors.append(RiskFactor(
+                    factor_type="weather",
+                    impact=-0.1,  # 10% negative impact
+                    description=f"Weather: {weather.get('condition', 'adverse')}",
+                    confidence=0.8
+                ))
         
         if "injuries" in metadata:
             injuries = metadata["injuries"]
             if injuries.get("key_players"):
-                risk_factors.append({
-                    "type": "injury",
-                    "impact": -0.15,  # 15% negative impact
-                    "description": f"Key injuries: {injuries.get('count', 'multiple')}",
-                    "confidence": 0.9
-                })
+                risk_factors.append(RiskFactor(
+                    factor_type="injury",
+                    impact=-0.15,  # 15% negative impact
+                    description=f"Key injuries: {injuries.get('count', 'multiple')}",
+                    confidence=0.9
+                ))
         
         # Check for high variance games
         if predictions and "variance" in predictions:
             if predictions["variance"] > 0.2:
-                risk_factors.append({
-                    "type": "variance",
-                    "impact": -0.05,
-                    "description": "High variance matchup",
-                    "confidence": 0.7
-                })
+                risk_factors.append(RiskFactor(
+                    factor_type="variance",
+                    impact=-0.05,
+                    description="High variance matchup",
+                    confidence=0.7
+                ))
         
         return risk_factors
     
@@ -559,14 +541,102 @@ class SharpPredictor:
         start_time = datetime.now()
         all_opportunities = []
         
-        for game in games:
-            game_predictions = None
-            if model_predictions and game.game_id in model_predictions:
-                game_predictions = model_predictions[game.game_id]
-            
-            opportunities = self.analyze_game(game, game_predictions)
+        for opportunities in self.analyze_games(games, model_predictions):
             all_opportunities.extend(opportunities)
         
+        return self.build_results(all_opportunities, start_time)
+    
+    def analyze_games(
+        self, 
+        games: List[GameData],
+        model_predictions: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[List[BettingOpportunity]]:
+        """
+        Analyze games, in parallel when worker processes are configured.
+        
+        Args:
+            games: List of games to analyze
+            model_predictions: Optional dict of {game_id: predictions}
+            
+        Returns:
+            Per-game opportunity lists, in the same order as games
+        """
+        work = [
+            (game, (model_predictions or {}).get(game.game_id))
+            for game in games
+        ]
+        
+        if self.max_workers and self.max_workers > 1 and len(work) > self.parallel_chunk_size:
+            return self._analyze_games_parallel(work)
+        
+        return [self.analyze_game(game, predictions) for game, predictions in work]
+    
+    def _analyze_games_parallel(
+        self, 
+        work: List[Tuple[GameData, Optional[Dict[str, Any]]]]
+    ) -> List[List[BettingOpportunity]]:
+        """Shard games across a process pool in chunks, preserving input order."""
+        chunks = [
+            work[i:i + self.parallel_chunk_size]
+            for i in range(0, len(work), self.parallel_chunk_size)
+        ]
+        
+        results = []
+        try:
+            # map() yields chunk results in submission order
+            for chunk_results in self._get_executor().map(_analyze_game_chunk, chunks):
+                results.extend(chunk_results)
+        except Exception as e:
+            self.logger.error(f"Parallel analysis failed, falling back to sequential: {str(e)}")
+            # A broken pool can't be reused; the next run starts a fresh one
+            self.close()
+            return [self.analyze_game(game, predictions) for game, predictions in work]
+        
+        return results
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it (or restarting it after a config change)."""
+        config = (self.bankroll, self.min_ev_threshold, self.min_confidence_threshold)
+        
+        with self._executor_lock:
+            if self._executor is not None and self._executor_config != config:
+                # Workers were initialized with the old thresholds
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_analysis_worker,
+                    initargs=config
+                )
+                self._executor_config = config
+            
+            return self._executor
+    
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def build_results(
+        self, 
+        all_opportunities: List[BettingOpportunity],
+        start_time: datetime
+    ) -> SharpPredictorResults:
+        """
+        Filter, rank and summarize already-analyzed opportunities.
+        
+        Args:
+            all_opportunities: Opportunities from one or more games
+            start_time: When the analysis run started
+            
+        Returns:
+            SharpPredictorResults with comprehensive analysis
+        """
         # Filter and sort opportunities
         qualified_opportunities = [
             opp for opp in all_opportunities 
@@ -697,6 +767,176 @@ class SharpPredictor:
         return json.dumps(serializable_results, indent=2)
 
 
+# Per-process predictor for parallel analysis (engines built once per worker)
+_worker_predictor: Optional[SharpPredictor] = None
+
+
+def _init_analysis_worker(bankroll: float, min_ev: float, min_confidence: int):
+    """Process pool initializer - builds the worker's SharpPredictor."""
+    global _worker_predictor
+    _worker_predictor = SharpPredictor(
+        bankroll=bankroll, 
+        min_ev=min_ev, 
+        min_confidence=min_confidence,
+        max_workers=0
+    )
+
+
+def _analyze_game_chunk(
+    chunk: List[Tuple[GameData, Optional[Dict[str, Any]]]]
+) -> List[List[BettingOpportunity]]:
+    """Analyze a chunk of games in a worker process."""
+    return [
+        _worker_predictor.analyze_game(game, predictions)
+        for game, predictions in chunk
+    ]
+
+
+class MaterializedOpportunitySet:
+    """
+    Materialized per-game opportunity set for a SharpPredictor.
+    
+    Opportunities are kept per game and only re-analyzed for games that
+    were invalidated (new odds, public betting data or line movements), so
+    reads cost a merge of cached results instead of a full slate analysis.
+    Games come from DataInputManager.assemble_games, so separately uploaded
+    market data is joined in.
+    
+    Before serving cached results DataInputManager.changed_game_ids is
+    asked what changed since the results were built, so writes by other
+    workers and external file changes also invalidate the games they
+    touch - and only those.
+    """
+    
+    def __init__(
+        self, 
+        predictor: SharpPredictor, 
+        data_manager: Optional[DataInputManager] = None
+    ):
+        self.predictor = predictor
+        self.data_manager = data_manager or predictor.data_manager
+        
+        self._game_opportunities: Dict[str, List[BettingOpportunity]] = {}
+        self._dirty_games: Set[str] = set()
+        self._needs_full_refresh = True
+        self._results: Optional[SharpPredictorResults] = None
+        # Data version the materialized games were read from (see DataInputManager.changed_game_ids)
+        self._version: Optional[Dict[str, Any]] = None
+        # Bumped by every invalidate, to detect invalidations during a refresh
+        self._generation = 0
+        
+        # Guards the state above; refreshes are serialized separately so
+        # invalidate never waits for an analysis
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        
+        self.logger = logging.getLogger(__name__)
+    
+    @property
+    def game_count(self) -> int:
+        """Number of games currently materialized."""
+        return len(self._game_opportunities)
+    
+    def invalidate(self, game_ids: Optional[Iterable[str]] = None):
+        """
+        Mark games as changed.
+        
+        Args:
+            game_ids: Changed game IDs, or None to rebuild every game
+        """
+        with self._lock:
+            if game_ids is None:
+                self._needs_full_refresh = True
+            else:
+                self._dirty_games.update(game_ids)
+            
+            self._generation += 1
+            self._results = None
+    
+    def get_results(self) -> SharpPredictorResults:
+        """
+        Get current top opportunities, re-analyzing only changed games.
+        
+        Returns:
+            SharpPredictorResults over every materialized game
+        """
+        with self._refresh_lock:
+            version, changed = self.data_manager.changed_game_ids(self._version)
+            
+            with self._lock:
+                if changed is None:
+                    self._needs_full_refresh = True
+                else:
+                    self._dirty_games.update(changed)
+                
+                if self._results is not None and not self._needs_full_refresh and not self._dirty_games:
+                    return self._results
+                
+                # Take the pending work; invalidations from here on land in a fresh set
+                full_refresh, self._needs_full_refresh = self._needs_full_refresh, False
+                dirty_games, self._dirty_games = self._dirty_games, set()
+                generation = self._generation
+                game_opportunities = dict(self._game_opportunities)
+            
+            try:
+                results = self._refresh(game_opportunities, full_refresh, dirty_games)
+            except Exception:
+                with self._lock:
+                    self._needs_full_refresh |= full_refresh
+                    self._dirty_games |= dirty_games
+                raise
+            
+            with self._lock:
+                self._game_opportunities = game_opportunities
+                self._version = version
+                # Games invalidated meanwhile are still pending; only cache
+                # results that no invalidation has overtaken
+                if self._generation == generation:
+                    self._results = results
+            
+            return results
+    
+    def _refresh(
+        self, 
+        game_opportunities: Dict[str, List[BettingOpportunity]], 
+        full_refresh: bool, 
+        dirty_games: Set[str]
+    ) -> SharpPredictorResults:
+        """Re-analyze the given games in place and merge all opportunities."""
+        start_time = datetime.now()
+        
+        if full_refresh:
+            games = self.data_manager.assemble_games()
+            game_opportunities.clear()
+            game_opportunities.update({
+                game.game_id: opportunities
+                for game, opportunities in zip(games, self.predictor.analyze_games(games))
+            })
+            dirty_games = set()
+        
+        if dirty_games:
+            changed = {
+                game.game_id: game 
+                for game in self.data_manager.assemble_games(game_ids=dirty_games)
+            }
+            for game_id in sorted(dirty_games):
+                game = changed.get(game_id)
+                if game is None:
+                    game_opportunities.pop(game_id, None)
+                else:
+                    game_opportunities[game_id] = self.predictor.analyze_game(game)
+            
+            self.logger.info(f"Re-analyzed {len(dirty_games)} changed games")
+        
+        all_opportunities = [
+            opp 
+            for opportunities in game_opportunities.values() 
+            for opp in opportunities
+        ]
+        
+        return self.predictor.build_results(all_opportunities, start_time)
+
+
 # Helper function for easy usage
 def create_demo_analysis() -> SharpPredictorResults:
     """Create a demo analysis with sample data."""
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Sharp Signal Replay Engine
+
+Replays stored line-movement and public-betting history through the
+SharpDetector in time order to see which signals would have fired:
+- Reverse Line Movement (RLM)
+- Steam Moves
+- Sharp Money splits
+- Consensus line shifts
+
+Used to tune rlm_threshold/steam_threshold offline without waiting for
+live markets.
+
+Usage:
+    python sharp_replay.py --data-dir data
+    python sharp_replay.py --rlm-threshold 0.75 --steam-threshold 1.0
+    python sharp_replay.py --sweep
+"""
+
+import argparse
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from columnar_store import ColumnarDataset, find_columnar_datasets
+from data_input_manager import read_json_lines
+from sharp_detector import (
+    ConsensusTracker, LineMovement, PublicBettingData, SharpDetector, SharpIndicator
+)
+
+
+@dataclass
+class ReplayEvent:
+    """A single historical market event."""
+    timestamp: datetime
+    event_type: str  # "line_movement" or "public_betting"
+    game_id: str
+    bet_type: str
+    record: Dict[str, Any]
+
+
+@dataclass
+class ReplaySignal:
+    """A sharp signal that fired during replay."""
+    fired_at: datetime  # Event time, not wall-clock time
+    game_id: str
+    bet_type: str
+    side: Optional[str]
+    flag_type: str
+    strength: int
+    description: str
+
+
+@dataclass
+class ReplayReport:
+    """Results of a replay run."""
+    signals: List[ReplaySignal]
+    signal_counts: Dict[str, int]
+    events_processed: int
+    events_skipped: int
+    elapsed_seconds: float
+    events_per_second: float
+    thresholds: Dict[str, float]
+    first_event: Optional[datetime] = None
+    last_event: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to a JSON-serializable dict."""
+        return {
+            "signal_counts": self.signal_counts,
+            "events_processed": self.events_processed,
+            "events_skipped": self.events_skipped,
+            "elapsed_seconds": self.elapsed_seconds,
+            "events_per_second": self.events_per_second,
+            "thresholds": self.thresholds,
+            "first_event": self.first_event.isoformat() if self.first_event else None,
+            "last_event": self.last_event.isoformat() if self.last_event else None,
+            "signals": [
+                {
+                    "fired_at": signal.fired_at.isoformat(),
+                    "game_id": signal.game_id,
+                    "bet_type": signal.bet_type,
+                    "side": signal.side,
+                    "flag_type": signal.flag_type,
+                    "strength": signal.strength,
+                    "description": signal.description
+                }
+                for signal in self.signals
+            ]
+        }
+
+
+@dataclass
+class _MarketState:
+    """Replay state for a single (game_id, bet_type) market."""
+    public_by_side: Dict[str, PublicBettingData] = field(default_factory=dict)
+    recent_movements: Deque[LineMovement] = field(default_factory=deque)
+    last_movement: Optional[LineMovement] = None
+
+
+class SharpReplayEngine:
+    """Replays historical market events through the SharpDetector."""
+
+    def __init__(
+        self,
+        detector: Optional[SharpDetector] = None,
+        steam_window_minutes: int = 15
+    ):
+        self.detector = detector or SharpDetector()
+        self.steam_window_minutes = steam_window_minutes
+        self.logger = logging.getLogger(__name__)
+
+    def load_events(self, data_directory: str = "data") -> List[ReplayEvent]:
+        """
+        Load stored line movements and public betting data in time order.
+
+        Args:
+            data_directory: Directory written by DataInputManager
+
+        Returns:
+            Events sorted by timestamp
+        """
+        data_dir = Path(data_directory)
+        events = []
+        skipped = 0
+
+        sources = [
+            ("line_movement", sorted(
+                [*data_dir.glob("line_movements*.json"), *data_dir.glob("line_movements_*.jsonl")]
+            )),
+            ("public_betting", sorted(data_dir.glob("public_betting_*.json")))
+        ]
+
+        for event_type, files in sources:
+            for data_file in files:
+                try:
+                    if data_file.suffix == ".jsonl":
+                        records = read_json_lines(data_file)
+                    else:
+                        with open(data_file, 'r') as f:
+                            records = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    self.logger.error(f"Error reading {data_file}: {str(e)}")
+                    continue
+
+                if isinstance(records, dict):
+                    records = [records]
+
+                skipped += self._add_events(events, event_type, records)
+
+        for event_type, data_type in (("line_movement", "line_movements"), ("public_betting", "public_betting")):
+            for dataset_path in find_columnar_datasets(data_dir, data_type):
+                records = ColumnarDataset(dataset_path).to_records()
+                skipped += self._add_events(events, event_type, records)
+
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} records without game_id/timestamp")
+
+        events.sort(key=lambda event: event.timestamp)
+        return events
+
+    def _add_events(self, events: List[ReplayEvent], event_type: str, records: List[Any]) -> int:
+        """Append usable records as events, returning how many were skipped."""
+        skipped = 0
+
+        for record in records:
+            event = self._record_to_event(event_type, record)
+            if event is None:
+                skipped += 1
+            else:
+                events.append(event)
+
+        return skipped
+
+    def _record_to_event(self, event_type: str, record: Any) -> Optional[ReplayEvent]:
+        """Convert a stored record to a ReplayEvent (None if unusable)."""
+        if not isinstance(record, dict) or "game_id" not in record:
+            return None
+
+        timestamp = record.get("timestamp")
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                return None
+        if not isinstance(timestamp, datetime):
+            return None
+        if timestamp.tzinfo is not None:
+            # Compare everything as naive UTC so offset and naive stamps sort together
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return ReplayEvent(
+            timestamp=timestamp,
+            event_type=event_type,
+            game_id=record["game_id"],
+            bet_type=str(record.get("bet_type", "moneyline")).lower(),
+            record=record
+        )
+
+    def replay(self, events: Iterable[ReplayEvent]) -> ReplayReport:
+        """
+        Replay events through the detector in the given (time) order.
+
+        Signals are edge-triggered: a flag is reported when it first fires
+        for a market/side or its strength changes, not on every event
+        while it stays active.
+
+        Args:
+            events: Events sorted by timestamp
+
+        Returns:
+            ReplayReport with fired signals and throughput
+        """
+        markets: Dict[Tuple[str, str], _MarketState] = {}
+        active_flags: Dict[Tuple[str, str, str, Optional[str]], int] = {}
+        consensus = ConsensusTracker(self.detector)
+        signals: List[ReplaySignal] = []
+
+        processed = 0
+        skipped = 0
+        first_event = None
+        last_event = None
+
+        start = time.perf_counter()
+
+        for event in events:
+            state = markets.get((event.game_id, event.bet_type))
+            if state is None:
+                state = markets[(event.game_id, event.bet_type)] = _MarketState()
+
+            try:
+                if event.event_type == "line_movement":
+                    fired = self._process_movement(event, state, consensus)
+                else:
+                    fired = self._process_public(event, state)
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+
+            for side, flag_type, indicator in fired:
+                key = (event.game_id, event.bet_type, flag_type, side)
+
+                if indicator is None:
+                    active_flags.pop(key, None)
+                    continue
+
+                if active_flags.get(key) == indicator.strength and flag_type != "Consensus":
+                    continue
+
+                active_flags[key] = indicator.strength
+                signals.append(ReplaySignal(
+                    fired_at=event.timestamp,
+                    game_id=event.game_id,
+                    bet_type=event.bet_type,
+                    side=side,
+                    flag_type=flag_type,
+                    strength=indicator.strength,
+                    description=indicator.description
+                ))
+
+            processed += 1
+            if first_event is None:
+                first_event = event.timestamp
+            last_event = event.timestamp
+
+        elapsed = time.perf_counter() - start
+
+        signal_counts: Dict[str, int] = {}
+        for signal in signals:
+            signal_counts[signal.flag_type] = signal_counts.get(signal.flag_type, 0) + 1
+
+        return ReplayReport(
+            signals=signals,
+            signal_counts=signal_counts,
+            events_processed=processed,
+            events_skipped=skipped,
+            elapsed_seconds=elapsed,
+            events_per_second=processed / elapsed if elapsed > 0 else 0.0,
+            thresholds={
+                "rlm_threshold": self.detector.rlm_threshold,
+                "steam_threshold": self.detector.steam_threshold,
+                "split_threshold": self.detector.split_threshold,
+                "consensus_threshold": self.detector.consensus_threshold
+            },
+            first_event=first_event,
+            last_event=last_event
+        )
+
+    def _process_movement(
+        self,
+        event: ReplayEvent,
+        state: _MarketState,
+        consensus: ConsensusTracker
+    ) -> List[Tuple[Optional[str], str, Optional[SharpIndicator]]]:
+        """Update market state with a line movement and check RLM/Steam/Consensus."""
+        record = event.record
+        book = record.get("book", "Unknown")
+        to_line = float(record["to_line"])
+
+        movement = self.detector.build_line_movement(
+            open_line=float(record["from_line"]),
+            current_line=to_line,
+            books=[book],
+            timestamp=event.timestamp
+        )
+        state.last_movement = movement
+
+        fired = []
+
+        # RLM against each side's latest public split
+        for side, public_data in state.public_by_side.items():
+            fired.append((side, "RLM", self.detector.detect_reverse_line_movement(movement, public_data)))
+
+        # Steam over the sliding window of recent movements
+        window_seconds = self.steam_window_minutes * 60
+        recent = state.recent_movements
+        recent.append(movement)
+        while recent and (event.timestamp - recent[0].timestamp).total_seconds() > window_seconds:
+            recent.popleft()
+
+        fired.append((None, "Steam", self.detector.detect_steam_move(
+            list(recent), self.steam_window_minutes, reference_time=event.timestamp
+        )))
+
+        # Consensus only reports when the tight band forms or moves
+        consensus_indicator = consensus.update_quote(f"{event.game_id}:{event.bet_type}", book, to_line)
+        if consensus_indicator is not None:
+            fired.append((None, "Consensus", consensus_indicator))
+
+        return fired
+
+    def _process_public(
+        self,
+        event: ReplayEvent,
+        state: _MarketState
+    ) -> List[Tuple[Optional[str], str, Optional[SharpIndicator]]]:
+        """Update market state with public betting data and check Sharp $/RLM."""
+        record = event.record
+        side = record.get("side", "home")
+
+        public_data = self.detector.build_public_data(
+            bets_pct=float(record.get("bets_percentage", record.get("bets_pct"))),
+            money_pct=float(record.get("money_percentage", record.get("money_pct")))
+        )
+        state.public_by_side[side] = public_data
+
+        fired = [(side, "Sharp $", self.detector.detect_sharp_money_split(public_data))]
+
+        if state.last_movement is not None:
+            fired.append((side, "RLM", self.detector.detect_reverse_line_movement(
+                state.last_movement, public_data
+            )))
+
+        return fired
+
+    def sweep_thresholds(
+        self,
+        events: List[ReplayEvent],
+        rlm_thresholds: List[float],
+        steam_thresholds: List[float]
+    ) -> List[Dict[str, Any]]:
+        """
+        Replay the same events under each RLM/steam threshold combination.
+
+        Args:
+            events: Events sorted by timestamp
+            rlm_thresholds: Candidate rlm_threshold values
+            steam_thresholds: Candidate steam_threshold values
+
+        Returns:
+            List of {thresholds, signal_counts, events_per_second} dicts
+        """
+        results = []
+
+        for rlm_threshold in rlm_thresholds:
+            for steam_threshold in steam_thresholds:
+                detector = SharpDetector()
+                detector.rlm_threshold = rlm_threshold
+                detector.steam_threshold = steam_threshold
+                detector.split_threshold = self.detector.split_threshold
+                detector.consensus_threshold = self.detector.consensus_threshold
+
+                engine = SharpReplayEngine(detector, self.steam_window_minutes)
+                report = engine.replay(events)
+
+                results.append({
+                    "thresholds": report.thresholds,
+                    "signal_counts": report.signal_counts,
+                    "events_per_second": report.events_per_second
+                })
+
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical market data through the sharp detector")
+    parser.add_argument("--data-dir", default="data", help="DataInputManager data directory")
+    parser.add_argument("--rlm-threshold", type=float, help="Override rlm_threshold")
+    parser.add_argument("--steam-threshold", type=float, help="Override steam_threshold")
+    parser.add_argument("--steam-window", type=int, default=15, help="Steam window in minutes")
+    parser.add_argument("--sweep", action="store_true", help="Sweep a grid of RLM/steam thresholds")
+    parser.add_argument("--output", help="Write the full report (with signals) to this JSON file")
+
+    args = parser.parse_args()
+
+    detector = SharpDetector()
+    if args.rlm_threshold is not None:
+        detector.rlm_threshold = args.rlm_threshold
+    if args.steam_threshold is not None:
+        detector.steam_threshold = args.steam_threshold
+
+    engine = SharpReplayEngine(detector, args.steam_window)
+
+    print("🔁 Sharp Signal Replay")
+    print("=" * 50)
+
+    events = engine.load_events(args.data_dir)
+    print(f"📥 Loaded {len(events)} events from {args.data_dir}")
+
+    if args.sweep:
+        grid = [0.25, 0.5, 0.75, 1.0, 1.5]
+        for result in engine.sweep_thresholds(events, grid, grid):
+            thresholds = result["thresholds"]
+            print(f"   RLM {thresholds['rlm_threshold']:.2f} | Steam {thresholds['steam_threshold']:.2f} "
+                  f"→ {result['signal_counts']}")
+        return
+
+    report = engine.replay(events)
+
+    print(f"⚡ {report.events_processed} events in {report.elapsed_seconds:.2f}s "
+          f"({report.events_per_second:,.0f} events/sec)")
+    for flag_type, count in sorted(report.signal_counts.items()):
+        print(f"   {flag_type}: {count}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"📊 Report saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ from typing import Dict, List, Any, Optional
 import logging
 
 # Import Sharp Predictor components
-from sharp_predictor import SharpPredictor, create_demo_analysis, BettingOpportunity, SharpPredictorResults
+from sharp_predictor import SharpPredictor, MaterializedOpportunitySet, create_demo_analysis, BettingOpportunity, SharpPredictorResults
 from data_input_manager import DataInputManager, create_odds_data, create_public_betting_data
 from sharp_detector import SharpDetector
 from fair_value_calculator import FairValueCalculator
@@ -35,6 +35,14 @@ class SharpWebInterface:
         self.data_manager = DataInputManager()
         self.logger = logging.getLogger(__name__)
         
+        # Materialized opportunity sets keyed by (bankroll, min_ev, min_confidence)
+        self.opportunity_sets: Dict[tuple, MaterializedOpportunitySet] = {}
+        self.max_opportunity_sets = 8
+        self.data_manager.add_change_listener(self._invalidate_opportunities)
+        
+        # CSV uploads larger than this are streamed instead of parsed in memory
+        self.stream_upload_threshold = 5 * 1024 * 1024
+        
         # Register routes
         self._register_routes()
     
@@ -57,22 +65,14 @@ class SharpWebInterface:
                 min_ev = data.get('min_ev', 3.0)
                 min_confidence = data.get('min_confidence', 7)
                 
-                # Configure predictor
-                predictor = SharpPredictor(
-                    bankroll=bankroll, 
-                    min_ev=min_ev, 
-                    min_confidence=min_confidence
-                )
+                # Get materialized opportunities for this configuration
+                opportunity_set = self._get_opportunity_set(bankroll, min_ev, min_confidence)
+                predictor = opportunity_set.predictor
+                results = opportunity_set.get_results()
                 
-                # Get games to analyze
-                games = self.data_manager.get_all_games()
-                
-                if not games:
+                if opportunity_set.game_count == 0:
                     # Use demo data if no games available
                     results = create_demo_analysis()
-                else:
-                    # Analyze actual games
-                    results = predictor.analyze_multiple_games(games)
                 
                 # Convert to JSON
                 json_response = predictor.to_json(results)
@@ -102,6 +102,12 @@ class SharpWebInterface:
                 if not data_type:
                     return jsonify({'error': 'Data type not specified'}), 400
                 
+                # Stream large uploads in chunks (counts + upload id only)
+                stream = request.form.get('stream', '').lower() in ('1', 'true', 'yes')
+                if stream or (request.content_length or 0) > self.stream_upload_threshold:
+                    result = self.data_manager.upload_csv_stream(file.stream, data_type)
+                    return jsonify(result)
+                
                 # Read file content
                 file_content = file.read().decode('utf-8')
                 
@@ -121,6 +127,21 @@ class SharpWebInterface:
         def upload_json_data():
             """Upload JSON data for analysis."""
             try:
+                # Stream large arrays from a file part or raw body
+                if 'file' in request.files:
+                    data_type = request.form.get('data_type')
+                    if not data_type:
+                        return jsonify({'error': 'Data type not specified'}), 400
+                    result = self.data_manager.upload_json_stream(request.files['file'].stream, data_type)
+                    return jsonify(result)
+                
+                if not request.is_json:
+                    data_type = request.args.get('data_type')
+                    if not data_type:
+                        return jsonify({'error': 'Data type not specified'}), 400
+                    result = self.data_manager.upload_json_stream(request.stream, data_type)
+                    return jsonify(result)
+                
                 data = request.get_json()
                 json_content = data.get('content')
                 data_type = data.get('data_type')
@@ -231,7 +252,8 @@ class SharpWebInterface:
         def get_data_summary():
             """Get summary of uploaded data."""
             try:
-                summary = self.data_manager.get_data_summary()
+                refresh = request.args.get('refresh', 'false').lower() == 'true'
+                summary = self.data_manager.get_data_summary(refresh=refresh)
                 return jsonify(summary)
             except Exception as e:
                 self.logger.error(f"Error getting data summary: {str(e)}")
@@ -281,6 +303,35 @@ class SharpWebInterface:
             """Manual entry interface."""
             return render_template_string(MANUAL_ENTRY_TEMPLATE)
     
+    def _get_opportunity_set(
+        self, 
+        bankroll: float, 
+        min_ev: float, 
+        min_confidence: int
+    ) -> MaterializedOpportunitySet:
+        """Get (or create) the materialized opportunity set for a configuration."""
+        key = (bankroll, min_ev, min_confidence)
+        
+        if key not in self.opportunity_sets:
+            if len(self.opportunity_sets) >= self.max_opportunity_sets:
+                # Drop the oldest configuration and its worker pool
+                evicted = self.opportunity_sets.pop(next(iter(self.opportunity_sets)))
+                evicted.predictor.close()
+            
+            predictor = SharpPredictor(
+                bankroll=bankroll, 
+                min_ev=min_ev, 
+                min_confidence=min_confidence
+            )
+            self.opportunity_sets[key] = MaterializedOpportunitySet(predictor, self.data_manager)
+        
+        return self.opportunity_sets[key]
+    
+    def _invalidate_opportunities(self, game_ids: Optional[List[str]]):
+        """Invalidate materialized opportunities for changed games."""
+        for opportunity_set in self.opportunity_sets.values():
+            opportunity_set.invalidate(game_ids)
+    
     def _format_results_for_display(self, results: SharpPredictorResults) -> Dict[str, Any]:
         """Format results for HTML display."""
         formatted_opportunities = []
@@ -0,0 +1,256 @@
+"""
+Hedged Requests Across Fallback Data Sources
+
+A league can be fetched from several providers (FootyStats, then
+football-data, then API-Sports). Trying them strictly one after another
+makes a slow primary the latency floor. hedged_fetch instead starts the
+next source once the current one has run longer than its p90 latency
+budget, and returns the first valid response from any of them.
+
+SourceUsage records every attempt per source: daily request counts
+(checked against {SOURCE}_DAILY_QUOTA before a request is started) and
+recent latencies, from which the hedge budget is derived. Both persist
+across runs in a small JSON file.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from group_commit import atomic_write_text
+
+
+HEDGED_REQUESTS = os.getenv("HEDGED_REQUESTS", "true").lower() == "true"
+
+# Hedge once a source is slower than this quantile of its recent latencies
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.9"))
+# Budget (seconds) used until a source has HEDGE_MIN_SAMPLES successful requests
+HEDGE_DEFAULT_BUDGET = float(os.getenv("HEDGE_DEFAULT_BUDGET", "10"))
+HEDGE_MIN_SAMPLES = 5
+LATENCY_WINDOW = 100
+
+# Requests per day (overridable via {SOURCE}_DAILY_QUOTA; 0 = unlimited)
+SOURCE_DAILY_QUOTAS = {
+    "footystats": 0,
+    "football_data": 0,
+    "api_sports": 100,
+    "sportsdata": 0
+}
+
+logger = logging.getLogger(__name__)
+
+
+def daily_quota(source: str) -> int:
+    """Requests per day allowed for a source (0 = unlimited)."""
+    return int(os.getenv(f"{source.upper()}_DAILY_QUOTA", SOURCE_DAILY_QUOTAS.get(source, 0)))
+
+
+class SourceUsage:
+    """Per-source request counts, outcomes and latencies."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: JSON file to persist usage in (in-memory only if None)
+        """
+        self.path = Path(path) if path else None
+        self.day = date.today().isoformat()
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    saved = json.load(f)
+                if saved.get("day") == self.day:
+                    self.counts = saved.get("counts", {})
+                for source, samples in saved.get("latencies", {}).items():
+                    self.latencies[source] = deque(samples, maxlen=LATENCY_WINDOW)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Ignoring unreadable source usage {self.path}: {e}")
+
+    def try_acquire(self, source: str) -> bool:
+        """
+        Count a request against a source's daily quota.
+
+        Args:
+            source: Data source name
+
+        Returns:
+            False (and nothing counted) if the quota is used up
+        """
+        with self._lock:
+            self._roll_day()
+            counts = self._counts(source)
+            quota = daily_quota(source)
+            if quota and counts["requests"] >= quota:
+                counts["quota_skips"] += 1
+                return False
+            counts["requests"] += 1
+            return True
+
+    def record(self, source: str, latency: float, ok: bool):
+        """
+        Record the outcome of a finished request.
+
+        Args:
+            source: Data source name
+            latency: Seconds the request took
+            ok: Whether it returned valid data
+        """
+        with self._lock:
+            self._counts(source)["successes" if ok else "failures"] += 1
+            if ok:
+                self.latencies.setdefault(source, deque(maxlen=LATENCY_WINDOW)).append(round(latency, 3))
+
+    def record_hedge(self, source: str, won: bool = False):
+        """Count a hedge started on a source, or (won=True) one that returned first."""
+        with self._lock:
+            self._counts(source)["hedges_won" if won else "hedges"] += 1
+
+    def budget(self, source: str) -> float:
+        """
+        Seconds to wait on a source before hedging.
+
+        Returns:
+            HEDGE_QUANTILE of recent successful latencies, or
+            HEDGE_DEFAULT_BUDGET while there are too few samples
+        """
+        with self._lock:
+            samples = list(self.latencies.get(source, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_BUDGET
+        return float(np.quantile(samples, HEDGE_QUANTILE))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Today's usage per source, with quota and hedge budget."""
+        with self._lock:
+            sources = set(self.counts) | set(self.latencies)
+            counts = {source: dict(self._counts(source)) for source in sources}
+
+        for source, entry in counts.items():
+            entry["daily_quota"] = daily_quota(source) or None
+            entry["hedge_budget"] = round(self.budget(source), 3)
+        return counts
+
+    def save(self):
+        """Persist usage (no-op without a path)."""
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                "day": self.day,
+                "counts": self.counts,
+                "latencies": {source: list(samples) for source, samples in self.latencies.items()}
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, json.dumps(state, indent=2), fsync=False)
+
+    def _counts(self, source: str) -> Dict[str, int]:
+        """Counters of a source (call with the lock held)."""
+        return self.counts.setdefault(source, {
+            "requests": 0, "successes": 0, "failures": 0,
+            "hedges": 0, "hedges_won": 0, "quota_skips": 0
+        })
+
+    def _roll_day(self):
+        """Reset daily counts at midnight (call with the lock held)."""
+        today = date.today().isoformat()
+        if today != self.day:
+            self.day, self.counts = today, {}
+
+
+def hedged_fetch(
+    attempts: List[Tuple[str, Callable[[], Any]]],
+    usage: SourceUsage,
+    hedge: bool = True,
+    is_valid: Callable[[Any], bool] = bool
+) -> Tuple[Optional[str], Any]:
+    """
+    Fetch from the first source that returns valid data.
+
+    Sources are tried in order. A source that fails starts the next one
+    immediately; with hedging, a source still running after its latency
+    budget also starts the next one, and whichever valid response arrives
+    first wins. Requests that lose the race finish in the background and
+    are only recorded in usage.
+
+    Args:
+        attempts: (source, fetch) pairs in preference order
+        usage: Per-source usage and latency tracking
+        hedge: Start the next source once the current one exceeds its budget
+        is_valid: Whether a fetch result counts as a response
+
+    Returns:
+        (source, result) of the winning source, or (None, None)
+    """
+    queue = list(attempts)
+    pending: Dict[Future, Tuple[str, float, bool]] = {}
+    executor = ThreadPoolExecutor(max_workers=max(len(queue), 1), thread_name_prefix="hedge")
+
+    def finished(future: Future, source: str, started: float):
+        try:
+            ok = is_valid(future.result())
+        except Exception:
+            ok = False
+        usage.record(source, time.monotonic() - started, ok)
+
+    def launch(hedged: bool) -> bool:
+        while queue:
+            source, fetch = queue.pop(0)
+            if not usage.try_acquire(source):
+                logger.warning(f"⚠️  Daily quota for {source} used up, skipping")
+                continue
+            started = time.monotonic()
+            future = executor.submit(fetch)
+            future.add_done_callback(lambda f, s=source, t=started: finished(f, s, t))
+            pending[future] = (source, started, hedged)
+            if hedged:
+                usage.record_hedge(source)
+            return True
+        return False
+
+    try:
+        launch(hedged=False)
+
+        while pending:
+            timeout = None
+            if hedge and queue:
+                source, started, _ = max(pending.values(), key=lambda entry: entry[1])
+                timeout = max(0.0, started + usage.budget(source) - time.monotonic())
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info(f"⏱️  {source} slower than {usage.budget(source):.1f}s, hedging with next source")
+                launch(hedged=True)
+                continue
+
+            for future in done:
+                source, _, hedged = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"❌ {source} request failed: {e}")
+                    result = None
+
+                if is_valid(result):
+                    if hedged:
+                        usage.record_hedge(source, won=True)
+                    return source, result
+
+                launch(hedged=False)
+
+        return None, None
+
+    finally:
+        executor.shutdown(wait=False)
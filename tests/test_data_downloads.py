@@ -0,0 +1,631 @@
+#!/usr/bin/env python3
+"""
+Historical Data Pipeline Tests
+Tests provider rate limiting, concurrent league downloads, the download
+manifest, resumable bulk downloads, the streamed MLB archive, incremental
+processing, the columnar processed dataset, metadata sidecars, hedged
+fallback requests, the upstream record/replay stub and dataset validation
+"""
+
+import unittest
+import functools
+import tempfile
+import threading
+import io
+import json
+import zipfile
+import time
+import sys
+import os
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import TokenBucket, provider_for_url, download_concurrently
+from download_manifest import DownloadManifest, season_is_finished
+from download_checkpoint import DownloadCheckpoint
+from mlb_archive import MLBArchiveReader
+from columnar_store import ColumnarDataset
+from historical_dataset import HistoricalDataset
+from data_sidecars import INDEX_FILENAME, sidecar_path
+from source_hedging import SourceUsage, hedged_fetch
+from api_stub import FaultConfig, FixtureStore, UpstreamStub, stubbed_upstreams, upstream_url
+from rate_limiter import RateLimitedSession
+from data_validation import DatasetValidator
+from enhanced_data_downloader import EnhancedDataDownloader
+import download_historical_data
+import data_manager
+import ml_models
+
+
+def make_response(status_code: int, content: bytes = b"", headers: dict = None) -> requests.Response:
+    """Build a requests.Response without a network round trip"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = "https://api.footystats.org/league-matches?key=secret&league_id=1"
+    return response
+
+
+class FakeSession:
+    """Session returning queued responses and recording request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test token buckets and the concurrent download executor"""
+
+    def test_bucket_paces_requests_after_burst(self):
+        """Requests beyond the burst wait for tokens at the bucket rate"""
+        bucket = TokenBucket(rate=50.0, capacity=2)
+
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 2 free from the burst, 4 more at 50/s
+        self.assertGreaterEqual(elapsed, 4 / 50.0 * 0.9)
+        self.assertLess(elapsed, 0.5)
+
+    def test_bucket_shared_across_threads(self):
+        """Concurrent callers together stay within the bucket rate"""
+        bucket = TokenBucket(rate=100.0, capacity=1)
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.monotonic() - start, 19 / 100.0 * 0.9)
+
+    def test_provider_for_url(self):
+        """Hosts map to the provider whose quota they count against"""
+        self.assertEqual(provider_for_url("https://api.footystats.org/league-matches?key=x"), "footystats")
+        self.assertEqual(provider_for_url("https://v3.football.api-sports.io/fixtures"), "api_sports")
+        self.assertEqual(provider_for_url("https://api.sportsdata.io/v3/mlb/scores/json/teams"), "sportsdata")
+        self.assertIsNone(provider_for_url("https://example.com/data"))
+
+    def test_download_concurrently_keeps_order_and_errors(self):
+        """Results come back in job order with exceptions captured per job"""
+        def download(n):
+            time.sleep(0.01 * (5 - n))
+            if n == 3:
+                raise ValueError("boom")
+            return n * 10
+
+        results = download_concurrently(download, [(n,) for n in range(5)], max_workers=5)
+
+        self.assertEqual([job for job, _, _ in results], [(n,) for n in range(5)])
+        self.assertEqual([result for _, result, _ in results], [0, 10, 20, None, 40])
+        self.assertIsInstance(results[3][2], ValueError)
+
+
+class TestDownloadManifest(unittest.TestCase):
+    """Test skip-if-unchanged bookkeeping for historical downloads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+        self.manifest = DownloadManifest(self.data_dir / "download_manifest.json")
+        self.file_path = self.data_dir / "matches.json"
+        self.file_path.write_text("[]")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_season_is_finished(self):
+        """Past seasons are final; the current one is not"""
+        today = date(2025, 3, 1)
+        self.assertTrue(season_is_finished(2024, "mlb", today))
+        self.assertFalse(season_is_finished(2025, "mlb", today))
+        self.assertTrue(season_is_finished("2023-2024", "soccer", today))
+        self.assertFalse(season_is_finished("2024-2025", "soccer", today))
+        self.assertFalse(season_is_finished("2024", "soccer", today))
+
+    def test_conditional_get_sends_validators_and_detects_changes(self):
+        """Stored validators are sent back; 304 and same-hash bodies count as unchanged"""
+        first = make_response(200, b'{"data": [1]}', {"ETag": '"v1"'})
+        self.manifest.record("soccer/epl/2025", self.file_path, first)
+
+        session = FakeSession(make_response(304), make_response(200, b'{"data": [1]}'), make_response(200, b'{"data": [2]}'))
+        self.assertFalse(self.manifest.conditional_get(session, "soccer/epl/2025", "url")[1])
+        self.assertFalse(self.manifest.conditional_get(session, "soccer/epl/2025", "url")[1])
+        self.assertTrue(self.manifest.conditional_get(session, "soccer/epl/2025", "url")[1])
+        self.assertEqual(session.requests[0]["If-None-Match"], '"v1"')
+
+    def test_immutable_entries_persist_without_api_key(self):
+        """Finished seasons stay current across runs and URLs are stored redacted"""
+        self.manifest.record("mlb/2023/games", self.file_path, make_response(200, b"[]"), immutable=True)
+
+        reloaded = DownloadManifest(self.data_dir / "download_manifest.json")
+        self.assertTrue(reloaded.is_current("mlb/2023/games"))
+        self.assertNotIn("secret", reloaded.entries["mlb/2023/games"]["url"])
+
+        self.file_path.unlink()
+        self.assertFalse(reloaded.is_current("mlb/2023/games"))
+
+
+
+class TestDownloadCheckpoint(unittest.TestCase):
+    """Test resumable bulk downloads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "soccer_download.checkpoint"
+        self.units = [f"League/{season}/{endpoint}" for season in ("2023", "2024") for endpoint in ("matches", "stats")]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_resume_skips_completed_units(self):
+        """A restart resumes at the first incomplete unit and survives a torn last line"""
+        checkpoint = DownloadCheckpoint(self.path, "soccer")
+        checkpoint.begin(self.units)
+        checkpoint.mark_done(self.units[0])
+        checkpoint.mark_failed(self.units[1], "HTTP 500")
+        with open(self.path, 'a') as f:
+            f.write('{"unit": "League/2024/mat')
+
+        resumed = DownloadCheckpoint(self.path, "soccer")
+        self.assertEqual(resumed.begin(self.units), 1)
+        self.assertEqual(resumed.pending(), self.units[2:])
+        self.assertEqual(resumed.failed(), [self.units[1]])
+
+        resumed.mark_done(self.units[2])
+        self.assertEqual(DownloadCheckpoint(self.path, "soccer").begin(self.units), 2)
+
+    def test_different_unit_list_starts_over(self):
+        """A checkpoint for other seasons is not resumed"""
+        checkpoint = DownloadCheckpoint(self.path, "soccer")
+        checkpoint.begin(self.units)
+        checkpoint.mark_done(self.units[0])
+
+        other = DownloadCheckpoint(self.path, "soccer")
+        self.assertEqual(other.begin(self.units[:2]), 0)
+        self.assertEqual(other.pending(), self.units[:2])
+
+    def test_bulk_download_retries_failures_in_second_pass(self):
+        """Failed units are retried after the first pass and the journal is removed on completion"""
+        attempts = {}
+
+        def download_unit(country, league_name, league_id, season, endpoint):
+            key = (league_name, season, endpoint)
+            attempts[key] = attempts.get(key, 0) + 1
+            if endpoint == "stats" and attempts[key] == 1:
+                raise requests.HTTPError("503 Server Error")
+            return "updated"
+
+        leagues = {"England": {"English Premier League": {"id": "premier-league", "priority": 1}}}
+        downloader = download_historical_data.HistoricalDataDownloader()
+
+        with mock.patch.object(download_historical_data, "SOCCER_LEAGUES", leagues), \
+                mock.patch.object(download_historical_data, "SOCCER_CHECKPOINT_FILE", self.path), \
+                mock.patch.object(downloader, "_download_unit", side_effect=download_unit):
+            results = downloader.download_all_soccer_leagues(["2023-2024", "2024-2025"])
+
+        self.assertEqual(results, {"England - English Premier League": True})
+        self.assertEqual(attempts[("English Premier League", "2024-2025", "stats")], 2)
+        self.assertEqual(attempts[("English Premier League", "2024-2025", "matches")], 1)
+        self.assertFalse(self.path.exists())
+
+    def test_interrupted_pass_resumes_after_completed_units(self):
+        """Units finished before an interruption are journaled and not downloaded again"""
+        attempts = []
+
+        def download_unit(country, league_name, league_id, season, endpoint):
+            attempts.append((season, endpoint))
+            if len(attempts) == 3 and not resumed:
+                raise KeyboardInterrupt
+            return "updated"
+
+        leagues = {"England": {"English Premier League": {"id": "premier-league", "priority": 1}}}
+        downloader = download_historical_data.HistoricalDataDownloader()
+        sequential = functools.partial(download_concurrently, max_workers=1)
+
+        with mock.patch.object(download_historical_data, "SOCCER_LEAGUES", leagues), \
+                mock.patch.object(download_historical_data, "SOCCER_CHECKPOINT_FILE", self.path), \
+                mock.patch.object(download_historical_data, "download_concurrently", sequential), \
+                mock.patch.object(downloader, "_download_unit", side_effect=download_unit):
+            resumed = False
+            with self.assertRaises(KeyboardInterrupt):
+                downloader.download_all_soccer_leagues(["2023-2024", "2024-2025"])
+            journal = [json.loads(line) for line in self.path.read_text().splitlines()[1:]]
+            self.assertEqual([entry["status"] for entry in journal], ["done", "done"])
+
+            resumed = True
+            results = downloader.download_all_soccer_leagues(["2023-2024", "2024-2025"])
+
+        self.assertEqual(results, {"England - English Premier League": True})
+        # The two units completed before the interruption were not fetched again
+        self.assertEqual(len(attempts), 3 + 2)
+        self.assertEqual(attempts[3:], [("2024-2025", "matches"), ("2024-2025", "stats")])
+
+
+class FlakyArchiveHandler(BaseHTTPRequestHandler):
+    """Serves server.payload, dropping the first full download halfway"""
+
+    def do_GET(self):
+        payload = self.server.payload
+        range_header = self.headers.get("Range")
+        self.server.range_headers.append(range_header)
+
+        if range_header:
+            offset = int(range_header.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {offset}-{len(payload) - 1}/{len(payload)}")
+            body = payload[offset:]
+        else:
+            self.send_response(200)
+            body = payload[:len(payload) // 2]  # connection drops mid-transfer
+
+        self.send_header("Content-Length", str(len(payload) - (offset if range_header else 0)))
+        self.send_header("ETag", '"archive-v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestMLBArchive(unittest.TestCase):
+    """Test the streamed, resumable MLB archive download and lazy reader"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mlb_dir = Path(self.temp_dir.name)
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("Games/Games.2024.json", json.dumps([{"GameID": 1, "HomeTeam": "NYY"}] * 500))
+            archive.writestr("Stats/PlayerGameStats.csv", "PlayerID,Hits\n" + "\n".join(f"{i},{i % 4}" for i in range(2500)))
+            archive.writestr("README.txt", "not data")
+        self.payload = buffer.getvalue()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_download_resumes_with_range_request(self):
+        """A dropped transfer resumes from the partial file with Range/If-Range"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyArchiveHandler)
+        server.payload = self.payload
+        server.range_headers = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        url = f"http://127.0.0.1:{server.server_port}/download-file"
+        try:
+            with mock.patch.object(download_historical_data, "MLB_DATA_DIR", self.mlb_dir), \
+                    mock.patch.object(download_historical_data, "SPORTSDATA_IO_URL", url), \
+                    mock.patch.object(download_historical_data, "MLB_DOWNLOAD_CHUNK_SIZE", 256):
+                downloader = download_historical_data.HistoricalDataDownloader()
+                self.assertTrue(downloader.download_mlb_data())
+                reader = downloader.open_mlb_archive()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertIsNone(server.range_headers[0])
+        self.assertEqual(len(server.range_headers), 2)
+        self.assertGreater(int(server.range_headers[1].split("=")[1].rstrip("-")), 0)
+        self.assertEqual(reader.path.read_bytes(), self.payload)
+        self.assertEqual(list(self.mlb_dir.glob("*.part*")), [])
+
+    def test_reader_parses_members_lazily(self):
+        """Members are parsed one at a time and CSVs can be chunked"""
+        path = self.mlb_dir / "mlb_historical_data_20250115.zip"
+        path.write_bytes(self.payload)
+        reader = MLBArchiveReader(path)
+
+        self.assertEqual(len(reader.members()), 3)
+        members = reader.iter_members()
+        name, games = next(members)
+        self.assertEqual((name, len(games)), ("Games/Games.2024.json", 500))
+        self.assertEqual([name for name, _ in members], ["Stats/PlayerGameStats.csv"])
+
+        chunks = list(reader.iter_csv_chunks("Stats/PlayerGameStats.csv", chunksize=1000))
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 500])
+
+
+
+class TestIncrementalProcessing(unittest.TestCase):
+    """Test hash-driven, partitioned processing of downloaded seasons"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.soccer_dir = root / "soccer"
+        self.processed_dir = root / "processed"
+        self.processed_dir.mkdir()
+
+        self.patches = [
+            mock.patch.object(data_manager, "SOCCER_DATA_DIR", self.soccer_dir),
+            mock.patch.object(data_manager, "PROCESSED_DATA_DIR", self.processed_dir),
+            mock.patch.object(data_manager, "PROCESSING_STATE_FILE", self.processed_dir / ".processing_state.json")
+        ]
+        for patch in self.patches:
+            patch.start()
+
+        self.manager = data_manager.DataManager()
+        self.epl = self.write_season("england", "english_premier_league", "2024", matches=3)
+        self.write_season("spain", "spanish_la_liga", "2024", matches=2)
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.temp_dir.cleanup()
+
+    def write_season(self, country: str, league: str, season: str, matches: int) -> Path:
+        """Write a raw FootyStats season file"""
+        league_dir = self.soccer_dir / country / league
+        league_dir.mkdir(parents=True, exist_ok=True)
+        season_file = league_dir / f"{season}_season.json"
+        season_file.write_text(json.dumps({
+            "league_id": "1",
+            "season": season,
+            "matches": [
+                {"id": i, "home_name": "A", "away_name": "B", "homeGoalCount": i % 3, "awayGoalCount": 1}
+                for i in range(matches)
+            ]
+        }))
+        return season_file
+
+    def test_only_changed_sources_are_reprocessed(self):
+        """Unchanged seasons are skipped; new, edited and deleted ones are handled"""
+        first = self.manager.process_soccer_data()
+        self.assertEqual((first["processed"], first["records"]), (2, 5))
+
+        partition = self.processed_dir / "soccer" / "england" / "english_premier_league" / "2024.cols"
+        self.assertEqual(ColumnarDataset(partition).rows, 3)
+
+        self.write_season("italy", "italian_serie_a", "2024", matches=4)
+        os.utime(self.epl)  # touched but identical
+        second = self.manager.process_soccer_data()
+        self.assertEqual((second["processed"], second["skipped"]), (1, 2))
+
+        self.write_season("england", "english_premier_league", "2024", matches=5)
+        (self.soccer_dir / "spain" / "spanish_la_liga" / "2024_season.json").unlink()
+        third = self.manager.process_soccer_data()
+        self.assertEqual((third["processed"], third["skipped"], third["removed"]), (1, 1, 1))
+        self.assertEqual(ColumnarDataset(partition).rows, 5)
+        self.assertFalse((self.processed_dir / "soccer" / "spain" / "spanish_la_liga" / "2024.cols").exists())
+
+    def test_loader_reads_only_selected_partitions_and_columns(self):
+        """A single-league load touches one partition and the requested columns"""
+        self.write_season("england", "english_premier_league", "2023", matches=4)
+        self.manager.process_soccer_data()
+
+        dataset = HistoricalDataset(self.processed_dir, "soccer")
+        self.assertEqual(len(dataset.partitions()), 3)
+        self.assertEqual(len(dataset.partitions(leagues=["English Premier League"], seasons=["2024"])), 1)
+
+        df = dataset.load(["home_team", "home_goals"], leagues=["English Premier League"])
+        self.assertEqual(list(df.columns), ["home_team", "home_goals"])
+        self.assertEqual(len(df), 7)
+
+        with mock.patch.object(ml_models, "PROCESSED_DATA_DIR", self.processed_dir):
+            matches = ml_models.SoccerPredictor().load_historical_data(leagues=["spanish_la_liga"])
+        self.assertEqual(len(matches), 2)
+        self.assertEqual(list(matches["result"]), ["away_win", "draw"])
+        self.assertEqual(set(matches["league_name"]), {"Spanish La Liga"})
+
+    def test_status_reads_sidecars_not_data(self):
+        """Processed status comes from sidecars even if partition data is unreadable"""
+        self.manager.process_soccer_data()
+        partition = self.processed_dir / "soccer" / "england" / "english_premier_league" / "2024.cols"
+        self.assertTrue(sidecar_path(partition).exists())
+
+        for data_file in partition.iterdir():
+            data_file.write_bytes(b"corrupt")
+
+        files = {f["name"]: f for f in self.manager._get_processed_status()["files"]}
+        epl = files["soccer/england/english_premier_league/2024.cols"]
+        self.assertEqual((epl["records"], epl["schema_version"]), (3, 1))
+
+        # A lost index is rebuilt from the sidecars alone
+        (self.processed_dir / INDEX_FILENAME).unlink()
+        status = data_manager.DataManager()._get_processed_status()
+        self.assertEqual(sorted(f["records"] for f in status["files"]), [2, 3])
+
+    def test_soccer_status_tracks_recorded_writes(self):
+        """Season writes and deletions update the soccer status index"""
+        season_data = {"season": "2024", "matches": [{"date_unix": 1723834800}, {"date_unix": 1748185200}]}
+        self.manager._record_soccer_file(self.epl, season_data)
+
+        status = self.manager._get_soccer_status()
+        self.assertEqual(status["total_files"], 2)  # the other league comes from the rebuild scan
+        epl = next(league for league in status["leagues"] if league["country"] == "england")
+        self.assertEqual(epl["records"], 2)
+        entry = self.manager.soccer_index.entries()["england/english_premier_league/2024_season.json"]
+        self.assertLess(entry["time_range"][0], entry["time_range"][1])
+
+        self.manager.soccer_index.remove(self.epl)
+        self.assertEqual(self.manager._get_soccer_status()["total_files"], 1)
+
+
+class TestHedgedFetch(unittest.TestCase):
+    """Test hedged requests across fallback sources"""
+
+    def slow(self, seconds: float, result):
+        """Fetch that answers after a delay"""
+        def fetch():
+            time.sleep(seconds)
+            return result
+        return fetch
+
+    def test_slow_primary_is_hedged(self):
+        """A fallback starts once the primary exceeds its budget and can win"""
+        usage = SourceUsage()
+        for _ in range(5):
+            usage.record("footystats", 0.05, ok=True)
+
+        started = time.monotonic()
+        source, data = hedged_fetch(
+            [("footystats", self.slow(1.0, ["slow"])), ("football_data", self.slow(0.05, ["fast"]))],
+            usage
+        )
+        self.assertEqual((source, data), ("football_data", ["fast"]))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        counts = usage.summary()["football_data"]
+        self.assertEqual((counts["requests"], counts["hedges"], counts["hedges_won"]), (1, 1, 1))
+
+    def test_sequential_fallback_and_quota(self):
+        """Without hedging, failures fall through in order and exhausted quotas are skipped"""
+        usage = SourceUsage()
+        with mock.patch.dict(os.environ, {"API_SPORTS_DAILY_QUOTA": "1"}):
+            self.assertTrue(usage.try_acquire("api_sports"))
+
+            calls = []
+            attempts = [
+                ("footystats", lambda: calls.append("footystats")),
+                ("api_sports", lambda: calls.append("api_sports") or ["data"]),
+                ("football_data", lambda: calls.append("football_data") or ["data"])
+            ]
+            source, _ = hedged_fetch(attempts, usage, hedge=False)
+
+        self.assertEqual(source, "football_data")
+        self.assertEqual(calls, ["footystats", "football_data"])
+        self.assertEqual(usage.summary()["api_sports"]["quota_skips"], 1)
+
+
+class TestUpstreamStub(unittest.TestCase):
+    """Test replaying recorded upstream responses with injected faults"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.fixtures = Path(self.temp_dir.name)
+        self.url = "https://api.footystats.org/league-matches"
+        FixtureStore(self.fixtures).save(
+            "GET", "api.footystats.org", "/league-matches", [("season_id", "13943")],
+            200, {"Content-Type": "application/json"}, b'{"success": true, "data": [{"id": 1}]}'
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_replays_fixture_regardless_of_credentials(self):
+        """Requests are routed to the stub and answered from fixtures"""
+        self.assertEqual(upstream_url(self.url), self.url)
+
+        with stubbed_upstreams(self.fixtures) as stub:
+            self.assertTrue(upstream_url(self.url).startswith(stub.url))
+            session = RateLimitedSession()
+            response = session.get(self.url, params={"key": "secret", "season_id": "13943"})
+            missing = session.get(self.url, params={"season_id": "1"})
+
+        self.assertEqual(response.json()["data"], [{"id": 1}])
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(stub.stats["api.footystats.org"], {"replayed": 1, "missing": 1})
+
+    def test_injected_faults_are_repeatable(self):
+        """Seeded 429s and errors recur identically across runs"""
+        def run() -> list:
+            faults = FaultConfig(latency=0.01, error_rate=0.3, rate_limit_rate=0.3, seed=7)
+            with stubbed_upstreams(self.fixtures, faults=faults):
+                with requests.Session() as session:
+                    return [
+                        session.get(upstream_url(self.url), params={"season_id": "13943"}).status_code
+                        for _ in range(20)
+                    ]
+
+        first = run()
+        self.assertEqual(first, run())
+        self.assertEqual(set(first), {200, 429, 503})
+
+    def test_record_skips_conditional_responses(self):
+        """A 304 to a conditional request is forwarded but never saved as the fixture"""
+        stub = UpstreamStub(self.fixtures, mode="record")
+        try:
+            not_modified = mock.Mock(status_code=304, headers={"ETag": '"v1"'}, content=b"")
+            with mock.patch.object(stub._upstream, "request", return_value=not_modified):
+                status, _, _ = stub.handle("GET", "/api.footystats.org/league-matches?season_id=13943",
+                                           {"If-None-Match": '"v1"'})
+        finally:
+            stub._server.server_close()
+
+        self.assertEqual(status, 304)
+        fixture = FixtureStore(self.fixtures).load("GET", "api.footystats.org", "/league-matches",
+                                                   [("season_id", "13943")])
+        self.assertEqual(fixture["status"], 200)
+        self.assertNotIn("recorded", stub.stats.get("api.footystats.org", {}))
+
+
+class TestDatasetValidation(unittest.TestCase):
+    """Test column-wise validation of downloaded files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+        self.validator = DatasetValidator(EnhancedDataDownloader._load_validation_schemas())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name: str, source: str, data) -> Path:
+        """Write a file in the downloader's {"metadata", "data"} layout"""
+        path = self.data_dir / name
+        path.write_text(json.dumps({"metadata": {"source": source}, "data": data}))
+        return path
+
+    def test_reports_failed_checks_per_file(self):
+        """Provider field names are resolved and each check reports failing rows"""
+        matches = [
+            {"id": i, "utcDate": "2024-08-16T19:00:00Z", "homeTeam": {"name": "A"}, "awayTeam": {"name": "B"},
+             "score": {"fullTime": {"home": i % 4, "away": 1}}}
+            for i in range(6)
+        ]
+        matches[1]["utcDate"] = "not a date"
+        matches[2]["score"]["fullTime"]["home"] = 99
+        matches[3]["homeTeam"] = {"name": None}
+        matches.append(dict(matches[0]))
+        football_data = self.validator.validate_file(self.write("fd.json", "football_data", matches), "soccer_match")
+
+        self.assertEqual((football_data["records"], football_data["invalid_records"]), (7, 4))
+        self.assertEqual(football_data["missing"]["home_team"]["rows"], [3])
+        self.assertEqual(football_data["type_errors"]["date"]["rows"], [1])
+        self.assertEqual(football_data["range_errors"]["home_goals"]["rows"], [2])
+        self.assertEqual(football_data["duplicates"], 1)
+
+        footystats = self.write("fs.json", "footystats", [{"league_id": 1, "matches": [
+            {"id": 1, "home_name": "A", "away_name": "B", "date_unix": 1723834800, "homeGoalCount": 2}
+        ]}])
+        self.assertEqual(self.validator.validate_file(footystats, "soccer_match")["valid_records"], 1)
+
+        (self.data_dir / "broken.json").write_text("[]")
+        reports = {Path(r["file"]).name: r for r in self.validator.validate_directory(self.data_dir, "soccer_match")}
+        self.assertFalse(reports["broken.json"]["valid_structure"])
+
+    def test_records_without_ids_and_scalar_fields(self):
+        """ID-less rows are deduplicated on required fields; scalars at nested paths are missing"""
+        matches = [
+            {"home_team": "A", "away_team": "B", "date": "2024-08-16"},
+            {"home_team": "C", "away_team": "D", "date": "2024-08-16"},
+            {"home_team": "C", "away_team": "D", "date": "2024-08-16"},
+            {"id": 7, "homeTeam": "E", "awayTeam": {"name": "F"}, "utcDate": "2024-08-16"}
+        ]
+        report = self.validator.validate_file(self.write("mixed.json", "football_data", matches), "soccer_match")
+
+        self.assertIsNone(report["error"])
+        self.assertEqual(report["duplicates"], 1)
+        self.assertEqual(report["missing"]["home_team"]["rows"], [3])
+        self.assertEqual(report["invalid_records"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
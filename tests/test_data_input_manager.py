@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Data Input Manager Tests
+Tests game storage, lookup and upload processing for the Sharp Predictor
+"""
+
+import unittest
+import tempfile
+import io
+import json
+import sys
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_input_manager import DataInputManager, iter_json_records, create_odds_data, create_public_betting_data
+
+
+def make_game_dict(game_id: str, sport: str = "MLB", game_date: str = "2025-01-15T19:00:00") -> dict:
+    """Build a games_*.json record"""
+    return {
+        "game_id": game_id,
+        "sport": sport,
+        "home_team": f"Home {game_id}",
+        "away_team": f"Away {game_id}",
+        "game_date": game_date,
+        "odds_data": create_odds_data(-150, +130, -1.5),
+        "public_betting_data": create_public_betting_data(65, 72, 58, 68, 52, 48),
+        "line_movement_data": [],
+        "model_predictions": {"moneyline_home_prob": 0.6}
+    }
+
+
+class TestSQLiteGameStore(unittest.TestCase):
+    """Test the indexed SQLite game store behind DataInputManager"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        games = [
+            make_game_dict("MLB_1", "MLB", "2025-01-15T19:00:00"),
+            make_game_dict("MLB_2", "MLB", "2025-01-16T19:00:00"),
+            make_game_dict("NBA_1", "NBA", "2025-01-15T20:30:00")
+        ]
+        with open(os.path.join(self.data_dir, "games_20250115.json"), "w") as f:
+            json.dump(games, f)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_store_matches_file_scan(self):
+        """Store-backed reads should return the same games as the file scan"""
+        file_manager = DataInputManager(self.data_dir)
+        db_manager = DataInputManager(self.data_dir, database_path=os.path.join(self.data_dir, "games.db"))
+
+        self.assertEqual(db_manager.game_store.count_games(), 3)
+        self.assertEqual(db_manager.get_game_data("MLB_2"), file_manager.get_game_data("MLB_2"))
+        self.assertIsNone(db_manager.get_game_data("missing"))
+        self.assertEqual(
+            sorted(g.game_id for g in db_manager.get_all_games(sport="mlb")),
+            sorted(g.game_id for g in file_manager.get_all_games(sport="mlb"))
+        )
+
+    def test_date_filters_and_line_movements(self):
+        """Date filters are applied and line movements attach as child rows"""
+        manager = DataInputManager(self.data_dir, database_path=os.path.join(self.data_dir, "games.db"))
+
+        games = manager.get_all_games(start_date=datetime(2025, 1, 16))
+        self.assertEqual([g.game_id for g in games], ["MLB_2"])
+
+        games = manager.get_all_games(sport="MLB", end_date=datetime(2025, 1, 15, 23, 59))
+        self.assertEqual([g.game_id for g in games], ["MLB_1"])
+
+        manager.add_line_movement("MLB_1", "DraftKings", "spread", -1.0, -1.5)
+        movements = manager.get_game_data("MLB_1").line_movement_data
+        self.assertEqual(len(movements), 1)
+        self.assertEqual(movements[0]["to_line"], -1.5)
+
+    def test_new_game_files_imported_into_existing_store(self):
+        """Game files added after the store was created are imported once"""
+        database_path = os.path.join(self.data_dir, "games.db")
+        DataInputManager(self.data_dir, database_path=database_path)
+
+        with open(os.path.join(self.data_dir, "games_20250117.json"), "w") as f:
+            json.dump([make_game_dict("NHL_1", "NHL", "2025-01-17T19:00:00")], f)
+
+        manager = DataInputManager(self.data_dir, database_path=database_path)
+        self.assertEqual(manager.game_store.count_games(), 4)
+        self.assertEqual(manager.game_store.import_json_files(self.data_dir), 0)
+
+    def test_game_upload_merges_line_movements(self):
+        """Uploaded line_movement_data merges with stored movements by timestamp and book"""
+        manager = DataInputManager(self.data_dir, database_path=os.path.join(self.data_dir, "games.db"))
+        manager.add_line_movement("MLB_1", "DraftKings", "spread", -1.0, -1.5, "2025-01-15T18:00:00")
+        manager.add_line_movement("MLB_1", "FanDuel", "spread", -1.0, -1.5, "2025-01-15T18:05:00")
+
+        game = make_game_dict("MLB_1", "MLB", "2025-01-15T19:00:00")
+        game["line_movement_data"] = [
+            {"book": "FanDuel", "bet_type": "spread", "from_line": -1.0, "to_line": -2.0,
+             "timestamp": "2025-01-15T18:05:00"},
+            {"book": "BetMGM", "bet_type": "spread", "from_line": -1.0, "to_line": -1.5,
+             "timestamp": "2025-01-15T18:10:00"}
+        ]
+        manager.game_store.upsert_games([game])
+
+        movements = manager.game_store.get_game("MLB_1")["line_movement_data"]
+        self.assertEqual(
+            [(m["book"], m["to_line"]) for m in movements],
+            [("DraftKings", -1.5), ("FanDuel", -2.0), ("BetMGM", -1.5)]
+        )
+
+    def test_market_uploads_stored_in_child_tables(self):
+        """Odds and public betting uploads are merged into the store's child tables"""
+        manager = DataInputManager(self.data_dir, database_path=os.path.join(self.data_dir, "games.db"))
+        manager.upload_csv_data(
+            "game_id,book,bet_type,side,odds,line_value\n"
+            "MLB_1,DraftKings,moneyline,home,-150,\n"
+            "MLB_1,DraftKings,spread,,-110,-1.5\n",
+            "odds"
+        )
+        manager.upload_json_data(json.dumps([
+            {"game_id": "MLB_1", "book": "FanDuel", "bet_type": "moneyline", "side": "away", "odds": 135}
+        ]), "odds")
+        manager.upload_csv_data(
+            "game_id,bet_type,side,bets_pct,money_pct\n"
+            "MLB_1,moneyline,home,65,72\n",
+            "public_betting"
+        )
+
+        stored = manager.game_store.get_game("MLB_1")
+        moneyline = stored["odds_data"]["moneyline"]
+        self.assertEqual((moneyline["home"], moneyline["away"]), (-150, 135))
+        self.assertEqual(sorted(moneyline["books"]), ["DraftKings", "FanDuel"])
+        self.assertEqual(stored["odds_data"]["spread"]["line"], -1.5)
+        self.assertEqual(stored["public_betting_data"]["moneyline"]["home_bets_pct"], 65)
+        self.assertEqual(stored["public_betting_data"]["moneyline"]["away_money_pct"], 28)
+
+
+class TestGameFileCache(unittest.TestCase):
+    """Test mtime/size-based caching of parsed game files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        self.write_games("games_a.json", [make_game_dict("A1"), make_game_dict("A2")])
+        self.write_games("games_b.json", [make_game_dict("B1")])
+        self.manager = DataInputManager(self.data_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_games(self, filename: str, games: list):
+        with open(os.path.join(self.data_dir, filename), "w") as f:
+            json.dump(games, f)
+
+    def test_unchanged_files_not_reparsed(self):
+        """Only the changed file is reparsed; lookups hit the game_id index"""
+        first = {g.game_id: g for g in self.manager.get_all_games()}
+        self.assertIs(self.manager.get_game_data("A1"), first["A1"])
+
+        self.write_games("games_b.json", [make_game_dict("B1"), make_game_dict("B2", "NBA")])
+        second = {g.game_id: g for g in self.manager.get_all_games()}
+
+        self.assertIs(second["A1"], first["A1"])
+        self.assertIsNot(second["B1"], first["B1"])
+        self.assertEqual(self.manager.get_game_data("B2").sport, "NBA")
+
+    def test_removed_files_dropped(self):
+        """Deleting a game file removes its games from the cache"""
+        self.assertIsNotNone(self.manager.get_game_data("B1"))
+        os.remove(os.path.join(self.data_dir, "games_b.json"))
+
+        self.assertIsNone(self.manager.get_game_data("B1"))
+        self.assertEqual(sorted(g.game_id for g in self.manager.get_all_games()), ["A1", "A2"])
+
+
+class TestStreamingCSVUpload(unittest.TestCase):
+    """Test chunked CSV ingestion"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stream_matches_in_memory_upload(self):
+        """Chunked output should match upload_csv_data row for row"""
+        rows = ["game_id,book,bet_type,from_line,to_line,timestamp"]
+        rows += [f"G{i % 7},Book{i % 3},spread,-1.0,{-1.0 - (i % 3) * 0.5},2025-01-15 18:{i % 60:02d}:00" for i in range(250)]
+        content = "\n".join(rows) + "\n"
+
+        expected = self.manager.upload_csv_data(content, "line_movements")["data"]
+        result = self.manager.upload_csv_stream(io.StringIO(content), "line_movements", chunk_size=100)
+
+        self.assertTrue(result["success"])
+        self.assertNotIn("data", result)
+        self.assertEqual(result["processed_rows"], 250)
+        self.assertEqual(result["chunks"], 3)
+
+        with open(os.path.join(self.temp_dir.name, result["filename"])) as f:
+            self.assertEqual(json.load(f), expected)
+
+    def test_invalid_header_leaves_no_file(self):
+        """Missing required columns fails without writing output"""
+        result = self.manager.upload_csv_stream(io.StringIO("game_id,odds\nG1,-110\n"), "odds")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+class TestStreamingJSONUpload(unittest.TestCase):
+    """Test incremental JSON parsing and streamed JSON uploads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_incremental_parser_matches_json_loads(self):
+        """Records parse identically regardless of read size boundaries"""
+        document = json.dumps([make_game_dict(f"G{i}") for i in range(20)] + [1.5e-7, "é", None])
+
+        for read_size in (1, 7, 4096):
+            records = list(iter_json_records(io.BytesIO(document.encode("utf-8")), read_size))
+            self.assertEqual(records, json.loads(document))
+
+    def test_incremental_parser_splits_multibyte_characters(self):
+        """Reads ending inside a UTF-8 character are not taken for the end of input"""
+        document = json.dumps(["é", "ü", {"home_team": "Atlético Madrid", "venue": "球場"}], ensure_ascii=False)
+
+        for read_size in (1, 2, 3, 5):
+            records = list(iter_json_records(io.BytesIO(document.encode("utf-8")), read_size))
+            self.assertEqual(records, json.loads(document))
+
+    def test_stream_upload(self):
+        """Streamed upload writes every record and returns counts only"""
+        games = [make_game_dict(f"G{i}") for i in range(50)]
+        result = self.manager.upload_json_stream(io.StringIO(json.dumps(games)), "games")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["processed_records"], 50)
+        self.assertEqual(len(self.manager.get_all_games()), 50)
+
+    def test_stream_upload_rejects_invalid_records(self):
+        """A games record without game_id fails the upload and leaves no file"""
+        result = self.manager.upload_json_stream(io.StringIO('[{"game_id": "G1"}, {"sport": "MLB"}]'), "games")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+class TestColumnarStorage(unittest.TestCase):
+    """Test columnar storage of market data uploads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.json_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name, storage_format="columnar")
+        self.json_manager = DataInputManager(self.json_dir.name)
+
+        rows = ["game_id,book,bet_type,odds,line_value"]
+        rows += [f"G{i % 5},Book{i % 3},spread,{-100 - i},{-1.5 if i % 2 else ''}" for i in range(40)]
+        self.content = "\n".join(rows) + "\n"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        self.json_dir.cleanup()
+
+    def test_columnar_matches_json(self):
+        """Columnar and JSON uploads load back to the same values"""
+        result = self.manager.upload_csv_data(self.content, "odds")
+        self.json_manager.upload_csv_data(self.content, "odds")
+
+        self.assertTrue(result["filename"].endswith(".cols"))
+
+        columns = ["game_id", "book", "odds", "line_value"]
+        columnar = self.manager.load_market_data("odds", columns)
+        expected = self.json_manager.load_market_data("odds", columns)
+
+        self.assertEqual(list(columnar.columns), columns)
+        self.assertEqual(columnar["game_id"].astype(str).tolist(), expected["game_id"].tolist())
+        self.assertEqual(columnar["odds"].tolist(), expected["odds"].tolist())
+        self.assertEqual(
+            columnar["line_value"].isna().tolist(),
+            expected["line_value"].isna().tolist()
+        )
+
+    def test_mixed_timestamps_and_invalid_odds(self):
+        """Offset and naive timestamps share a column; invalid odds are missing, not 0"""
+        records = [
+            {"game_id": "G1", "book": "DraftKings", "bet_type": "moneyline", "side": "home",
+             "odds": -150, "timestamp": "2025-01-15T18:00:00Z"},
+            {"game_id": "G1", "book": "FanDuel", "bet_type": "moneyline", "side": "home",
+             "odds": "-140.0", "timestamp": "2025-01-15T13:05:00-05:00"},
+            {"game_id": "G1", "book": "BetMGM", "bet_type": "moneyline", "side": "home",
+             "odds": "off", "timestamp": "2025-01-15 18:10:00"}
+        ]
+        result = self.manager.upload_json_data(json.dumps(records), "odds")
+        self.assertTrue(result["success"], result.get("error"))
+
+        stored = self.manager.load_market_data("odds", ["book", "odds", "timestamp"])
+        self.assertEqual(stored["odds"].tolist()[:2], [-150, -140])
+        self.assertTrue(pd.isna(stored["odds"].tolist()[2]))
+        self.assertEqual(
+            [str(t) for t in stored["timestamp"]],
+            ["2025-01-15 18:00:00", "2025-01-15 18:05:00", "2025-01-15 18:10:00"]
+        )
+
+    def test_summary_and_date_filter(self):
+        """Columnar datasets appear in the summary and filter by upload date"""
+        self.manager.upload_csv_data(self.content, "odds")
+
+        summary = self.manager.get_data_summary()
+        self.assertEqual(summary["odds_files"], 1)
+
+        self.assertEqual(len(self.manager.load_market_data("odds", ["odds"], date="19990101")), 0)
+
+
+class TestDataManifest(unittest.TestCase):
+    """Test the maintained data summary manifest"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_manifest_matches_directory_scan(self):
+        """Incrementally maintained summary equals a fresh rebuild"""
+        games = [make_game_dict("G1"), make_game_dict("G2", sport="NBA")]
+        self.manager.upload_json_data(json.dumps(games), "games")
+        self.manager.upload_json_stream(io.StringIO(json.dumps([make_game_dict("G3", sport="NFL")])), "games")
+        self.manager.upload_csv_data("game_id,book,bet_type,odds\nG1,DK,spread,-110\n", "odds")
+        self.manager.add_line_movement("G1", "DK", "spread", -1.0, -1.5)
+        self.manager.add_line_movement("G1", "DK", "spread", -1.5, -2.0)
+
+        summary = self.manager.get_data_summary()
+        self.assertEqual(summary["games_count"], 2)
+        self.assertEqual(summary["odds_files"], 1)
+        self.assertEqual(summary["line_movement_files"], 1)
+        self.assertEqual(summary["sports"], ["MLB", "NBA", "NFL"])
+
+        rebuilt = self.manager.get_data_summary(refresh=True)
+        self.assertEqual(
+            {k: v for k, v in summary.items() if k != "data_files"},
+            {k: v for k, v in rebuilt.items() if k != "data_files"}
+        )
+        self.assertEqual(
+            sorted(f["filename"] for f in summary["data_files"]),
+            sorted(f["filename"] for f in rebuilt["data_files"])
+        )
+
+    def test_summary_does_not_read_data_files(self):
+        """Summary is served from the manifest without scanning the directory"""
+        self.manager.upload_json_data(json.dumps([make_game_dict("G1")]), "games")
+
+        with mock.patch.object(Path, "glob", side_effect=AssertionError("scanned")):
+            summary = DataInputManager(self.temp_dir.name).get_data_summary()
+
+        self.assertEqual(summary["sports"], ["MLB"])
+
+
+class TestGameAssembly(unittest.TestCase):
+    """Test joining separately uploaded datasets into GameData"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name)
+
+        self.manager.upload_csv_data(
+            "game_id,sport,home_team,away_team,game_date\n"
+            "G1,MLB,Yankees,Red Sox,2025-01-15 19:00:00\n"
+            "G2,MLB,Mets,Phillies,2025-01-15 19:10:00\n",
+            "games"
+        )
+        self.manager.upload_csv_data(
+            "game_id,book,bet_type,side,odds,line_value\n"
+            "G1,DraftKings,moneyline,home,-150,\n"
+            "G1,DraftKings,moneyline,away,+130,\n"
+            "G1,FanDuel,spread,,-110,-1.5\n"
+            "G9,FanDuel,spread,,-110,-1.5\n",
+            "odds"
+        )
+        self.manager.upload_csv_data(
+            "game_id,bet_type,side,bets_pct,money_pct\n"
+            "G1,moneyline,home,65,72\n"
+            "G1,spread,favorite,58,68\n",
+            "public_betting"
+        )
+        self.manager.add_line_movement("G1", "DraftKings", "spread", -1.0, -1.5, "2025-01-15T18:30:00")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_assembles_uploaded_datasets(self):
+        """Odds, public betting and movements are joined on game_id"""
+        games = {game.game_id: game for game in self.manager.assemble_games()}
+
+        self.assertEqual(sorted(games), ["G1", "G2"])
+
+        g1 = games["G1"]
+        self.assertEqual(g1.odds_data["moneyline"]["home"], -150)
+        self.assertEqual(g1.odds_data["moneyline"]["away"], 130)
+        self.assertEqual(g1.odds_data["spread"]["line"], -1.5)
+        self.assertEqual(g1.odds_data["spread"]["away_odds"], -110)
+        self.assertEqual(g1.public_betting_data["moneyline"]["away_bets_pct"], 35)
+        self.assertEqual(g1.public_betting_data["spread"]["underdog_money_pct"], 32)
+        self.assertEqual(len(g1.line_movement_data), 1)
+
+        self.assertEqual(games["G2"].odds_data, {})
+
+    def test_matches_embedded_game(self):
+        """Assembled odds drive the same analysis as the embedded layout"""
+        from sharp_predictor import SharpPredictor
+
+        assembled = self.manager.assemble_games(game_ids=["G1"])[0]
+        embedded = self.manager._dict_to_game_data({
+            "game_id": "G1", "sport": "MLB", "home_team": "Yankees", "away_team": "Red Sox",
+            "game_date": "2025-01-15 19:00:00",
+            "odds_data": create_odds_data(-150, 130, -1.5),
+            "public_betting_data": create_public_betting_data(65, 72, 58, 68, 50, 50),
+            "line_movement_data": assembled.line_movement_data
+        })
+        predictions = {"moneyline_home_prob": 0.65, "moneyline_away_prob": 0.35}
+
+        predictor = SharpPredictor(min_ev=0.0, min_confidence=1)
+        self.assertEqual(
+            [(o.bet_type, o.bet_side, o.market_odds) for o in predictor.analyze_game(assembled, predictions)
+             if o.bet_type != "total"],
+            [(o.bet_type, o.bet_side, o.market_odds) for o in predictor.analyze_game(embedded, predictions)
+             if o.bet_type != "total"]
+        )
+
+    def test_string_and_invalid_market_values(self):
+        """Numeric strings are coerced and rows that don't convert are skipped"""
+        self.manager._save_records([
+            {"game_id": "G2", "book": "FanDuel", "bet_type": "moneyline", "side": "home", "odds": "-120.0"},
+            {"game_id": "G2", "book": "FanDuel", "bet_type": "moneyline", "side": "away", "odds": "off"},
+            {"game_id": "G2", "book": "FanDuel", "bet_type": "spread", "odds": "-110", "line_value": "n/a"}
+        ], "odds", "odds_20990101_000000")
+        self.manager._save_records([
+            {"game_id": "G2", "bet_type": "moneyline", "side": "home",
+             "bets_percentage": "55", "money_percentage": "61.5"},
+            {"game_id": "G2", "bet_type": "total", "side": "over",
+             "bets_percentage": "", "money_percentage": "40"}
+        ], "public_betting", "public_betting_20990101_000000")
+
+        with self.assertLogs("game_assembler", level="WARNING"):
+            g2 = self.manager.assemble_games(game_ids=["G2"])[0]
+
+        self.assertEqual(g2.odds_data["moneyline"]["home"], -120)
+        self.assertNotIn("away", g2.odds_data["moneyline"])
+        self.assertNotIn("spread", g2.odds_data)
+        self.assertEqual(g2.public_betting_data["moneyline"]["away_bets_pct"], 45)
+        self.assertNotIn("total", g2.public_betting_data)
+
+    def test_unchanged_market_files_not_reparsed(self):
+        """Repeat assembly reads only market files that changed"""
+        from data_input_manager import MARKET_RECORD_CACHE
+
+        self.manager.assemble_games()
+        with mock.patch.object(MARKET_RECORD_CACHE, "_parse_source", wraps=MARKET_RECORD_CACHE._parse_source) as parse:
+            self.manager.assemble_games(game_ids=["G1"])
+            self.assertEqual(parse.call_count, 0)
+
+            self.manager._save_records([
+                {"game_id": "G2", "book": "FanDuel", "bet_type": "moneyline", "side": "home",
+                 "odds": -120, "line_value": None, "timestamp": "2025-01-15 18:00:00"}
+            ], "odds", "odds_20990101_000000")
+            games = {game.game_id: game for game in self.manager.assemble_games()}
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(games["G2"].odds_data["moneyline"]["home"], -120)
+        self.assertEqual(games["G1"].odds_data["moneyline"]["home"], -150)
+
+
+class TestCompactGameData(unittest.TestCase):
+    """Test the compact in-memory game representation"""
+
+    def test_slotted_with_shared_strings(self):
+        """Parsed games carry no __dict__ and share repeated strings"""
+        manager = DataInputManager(tempfile.mkdtemp())
+        documents = [json.loads(json.dumps(make_game_dict(f"G{i}"))) for i in range(2)]
+        for document in documents:
+            document["line_movement_data"] = [
+                {"game_id": document["game_id"], "book": "".join(["Draft", "Kings"]), "bet_type": "spread",
+                 "from_line": -1.0, "to_line": -1.5, "timestamp": "2025-01-15T18:30:00"}
+            ]
+
+        first, second = [manager._dict_to_game_data(document) for document in documents]
+
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.sport, second.sport)
+        self.assertIs(first.line_movement_data[0]["book"], second.line_movement_data[0]["book"])
+        self.assertIs(first.odds_data["spread"]["book"], second.odds_data["spread"]["book"])
+
+
+class TestGroupCommitWriter(unittest.TestCase):
+    """Test grouped atomic commits of concurrent writes"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name)
+
+    def tearDown(self):
+        self.manager.line_movement_writer.close()
+        self.temp_dir.cleanup()
+
+    def test_concurrent_line_movements_all_committed(self):
+        """Concurrent add_line_movement calls are batched and none are lost"""
+        def add_movements(thread_id):
+            for i in range(25):
+                self.manager.add_line_movement(f"G{thread_id}", "DraftKings", "spread", -1.0, -1.5 - i)
+
+        threads = [threading.Thread(target=add_movements, args=(t,)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        segments = list(Path(self.temp_dir.name).glob("line_movements_*.jsonl"))
+        movements = [json.loads(line) for segment in segments for line in segment.read_text().splitlines()]
+
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(len(movements), 200)
+        self.assertLess(self.manager.line_movement_writer.commits, 200)
+        self.assertEqual(self.manager.get_data_summary()["line_movement_files"], 1)
+
+    def test_failed_commit_reported(self):
+        """A failing commit fails the write and leaves no partial file"""
+        def failing_commit(movements):
+            raise OSError("disk full")
+
+        self.manager.line_movement_writer.commit = failing_commit
+        result = self.manager.add_line_movement("G1", "DraftKings", "spread", -1.0, -1.5)
+
+        self.assertFalse(result["success"])
+        self.assertIn("disk full", result["error"])
+        self.assertEqual(list(Path(self.temp_dir.name).glob("line_movements*")), [])
+
+    def test_commits_append_to_segment(self):
+        """Each commit appends its batch instead of rewriting stored movements"""
+        self.manager.add_line_movement("G1", "DraftKings", "spread", -1.0, -1.5)
+        segment = self.manager._line_movement_segment
+        first_commit = segment.read_bytes()
+
+        self.manager.add_line_movement("G2", "FanDuel", "spread", -2.0, -2.5)
+        with open(segment, 'ab') as f:
+            f.write(b'{"game_id": "G3", "bo')  # torn append
+        self.manager.add_line_movement("G4", "BetMGM", "total", 8.5, 9.0)
+
+        self.assertTrue(segment.read_bytes().startswith(first_commit))
+        self.assertEqual(
+            [movement["game_id"] for movement in self.manager.load_market_data("line_movements").to_dict("records")],
+            ["G1", "G2", "G4"]
+        )
+
+
+class TestUploadCompaction(unittest.TestCase):
+    """Test compaction of upload files into daily per-sport partitions"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = DataInputManager(self.temp_dir.name)
+
+        self.manager.upload_json_data(json.dumps([make_game_dict("G1"), make_game_dict("G2", sport="NBA")]), "games")
+        for i in range(4):
+            self.manager._save_records([
+                {"game_id": "G1", "book": "DraftKings", "bet_type": "moneyline", "side": "home",
+                 "odds": -150 - i, "line_value": None, "timestamp": "2025-01-15 18:00:00"},
+                {"game_id": "G2", "book": "FanDuel", "bet_type": "spread", "odds": -110,
+                 "line_value": -3.5, "timestamp": f"2025-01-15 18:0{i}:00"}
+            ], "odds", f"odds_20250115_18000{i}")
+        self.manager.add_line_movement("G1", "DraftKings", "spread", -1.0, -1.5, "2025-01-15T18:30:00")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compaction_preserves_assembled_games(self):
+        """Partitions replace the uploads without changing what readers see"""
+        from data_compaction import UploadCompactor
+
+        def snapshot():
+            return {
+                game.game_id: (game.odds_data, game.public_betting_data, game.line_movement_data)
+                for game in self.manager.assemble_games()
+            }
+
+        expected = snapshot()
+        stats = UploadCompactor(self.manager).compact()
+
+        self.assertTrue(stats["success"])
+        self.assertEqual(stats["superseded_dropped"], 3)
+        self.assertEqual(snapshot(), expected)
+        self.assertEqual(snapshot()["G1"][0]["moneyline"]["home"], -153)
+
+        names = sorted(os.listdir(self.temp_dir.name))
+        self.assertIn("odds_20250115_000000_mlb.json", names)
+        self.assertIn("odds_20250115_000000_nba.json", names)
+        self.assertIn("line_movements_20250115_000000_mlb.json", names)
+        self.assertEqual([name for name in names if name.startswith("line_movements") and name.endswith(".jsonl")], [])
+        self.assertEqual(self.manager.get_data_summary()["odds_files"], 2)
+
+    def test_compaction_is_idempotent(self):
+        """A second run finds nothing left to merge"""
+        from data_compaction import UploadCompactor
+
+        UploadCompactor(self.manager).compact()
+        stats = UploadCompactor(self.manager).compact()
+
+        self.assertEqual(stats["files_read"], 0)
+        self.assertEqual(stats["partitions_written"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Sharp Predictor System Tests
+Tests sharp detection, consensus tracking and predictor analysis paths
+"""
+
+import unittest
+import tempfile
+import json
+import sys
+import os
+import random
+import statistics
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sharp_detector import SharpDetector, ConsensusTracker
+from fair_value_calculator import FairValueCalculator
+from ev_engine import EVEngine, RiskFactor
+from sharp_predictor import SharpPredictor, MaterializedOpportunitySet
+from data_input_manager import DataInputManager, create_odds_data, create_public_betting_data
+from sharp_replay import SharpReplayEngine
+
+
+def make_game_dict(game_id: str, home_prob: float = 0.6) -> dict:
+    """Build a games_*.json record with odds, public data and predictions"""
+    return {
+        "game_id": game_id,
+        "sport": "MLB",
+        "home_team": f"Home {game_id}",
+        "away_team": f"Away {game_id}",
+        "game_date": "2025-01-15T19:00:00",
+        "odds_data": create_odds_data(-110, +100, -1.5),
+        "public_betting_data": create_public_betting_data(65, 72, 58, 68, 52, 48),
+        "line_movement_data": [],
+        "model_predictions": {
+            "moneyline_home_prob": home_prob,
+            "moneyline_away_prob": 1 - home_prob
+        }
+    }
+
+
+class TestConsensusTracker(unittest.TestCase):
+    """Test incremental consensus tracking"""
+
+    def setUp(self):
+        self.tracker = ConsensusTracker()
+        self.market = "MLB_NYY_BOS:spread"
+
+    def test_matches_full_recompute(self):
+        """Tracker snapshot should match a full recompute after every update"""
+        rng = random.Random(3)
+        books = ["DraftKings", "FanDuel", "BetMGM", "Caesars", "PointsBet", "BetRivers", "Pinnacle"]
+        quotes = {}
+
+        for _ in range(300):
+            book = rng.choice(books)
+            if book in quotes and rng.random() < 0.2:
+                self.tracker.remove_quote(self.market, book)
+                del quotes[book]
+            else:
+                quotes[book] = rng.choice([-2.0, -1.5, -1.5, -1.0, -0.5, 0.0, 0.5])
+                self.tracker.update_quote(self.market, book, quotes[book])
+
+            snapshot = self.tracker.get_consensus(self.market)
+            if not quotes:
+                self.assertIsNone(snapshot)
+                continue
+
+            lines = list(quotes.values())
+            self.assertEqual(snapshot.book_count, len(lines))
+            self.assertEqual(snapshot.median_line, statistics.median(lines))
+            self.assertAlmostEqual(snapshot.mean_line, statistics.mean(lines))
+            self.assertEqual((snapshot.low_line, snapshot.high_line), (min(lines), max(lines)))
+            self.assertEqual(snapshot.line_range, max(lines) - min(lines))
+
+    def test_event_reports_median(self):
+        """The Consensus description reports the median the event fired on"""
+        for book, line in [("DraftKings", -1.5), ("FanDuel", -1.5), ("BetMGM", -1.0)]:
+            event = self.tracker.update_quote(self.market, book, line)
+
+        self.assertEqual(self.tracker.get_consensus(self.market).median_line, -1.5)
+        self.assertIn("at -1.5", event.description)
+
+    def test_emits_only_when_band_moves(self):
+        """Consensus event fires on band formation and moves, not on repeats"""
+        events = [
+            self.tracker.update_quote(self.market, book, -1.5)
+            for book in ["DraftKings", "FanDuel", "BetMGM"]
+        ]
+        self.assertEqual([e is not None for e in events], [False, False, True])
+
+        # Fourth book at the same line leaves the median where it was
+        self.assertIsNone(self.tracker.update_quote(self.market, "Caesars", -1.5))
+
+        # Market moves as a group - median shifts, new event
+        self.tracker.update_quote(self.market, "DraftKings", -2.0)
+        self.tracker.update_quote(self.market, "FanDuel", -2.0)
+        event = self.tracker.update_quote(self.market, "BetMGM", -2.0)
+        self.assertIsNotNone(event)
+        self.assertEqual(event.flag_type, "Consensus")
+
+    def test_band_break_and_reform(self):
+        """A broken band re-emits when it forms again"""
+        for book in ["DraftKings", "FanDuel", "BetMGM"]:
+            self.tracker.update_quote(self.market, book, 8.5)
+
+        self.assertIsNone(self.tracker.update_quote(self.market, "FanDuel", 9.5))
+        self.assertFalse(self.tracker.get_consensus(self.market).is_tight)
+
+        self.assertIsNotNone(self.tracker.update_quote(self.market, "FanDuel", 8.5))
+
+        self.tracker.remove_quote(self.market, "BetMGM")
+        self.assertEqual(self.tracker.get_consensus(self.market).book_count, 2)
+        self.assertFalse(self.tracker.get_consensus(self.market).is_tight)
+
+
+class TestTypedEntryPoints(unittest.TestCase):
+    """Test that typed engine entry points match the manual-input dict path"""
+
+    def setUp(self):
+        game = make_game_dict("G1", 0.58)
+        self.home_odds = game["odds_data"]["moneyline"]["home"]
+        self.away_odds = game["odds_data"]["moneyline"]["away"]
+        self.home_public = game["public_betting_data"]["moneyline"]
+        self.home_prob = game["model_predictions"]["moneyline_home_prob"]
+        self.away_prob = game["model_predictions"]["moneyline_away_prob"]
+
+    def without(self, result, field):
+        """Result as a dict without its creation-time field"""
+        values = asdict(result)
+        values.pop(field)
+        return values
+
+    def test_sharp_signals(self):
+        """analyze_signals matches analyze_manual_input"""
+        detector = SharpDetector()
+        books = ["DraftKings", "FanDuel", "BetMGM"]
+
+        expected = detector.analyze_manual_input({
+            "line_movement": {"open": -1.0, "current": -2.0, "books": books},
+            "public_data": {"bets_pct": self.home_public["home_bets_pct"], "money_pct": self.home_public["home_money_pct"]},
+            "steam_data": [{"from": -1.0, "to": -1.5, "books": [book]} for book in books]
+        })
+        indicators = detector.analyze_signals(
+            detector.build_line_movement(-1.0, -2.0, books),
+            detector.build_public_data(self.home_public["home_bets_pct"], self.home_public["home_money_pct"]),
+            [detector.build_line_movement(-1.0, -1.5, [book]) for book in books]
+        )
+
+        self.assertTrue(indicators)
+        self.assertEqual(
+            [self.without(indicator, "detected_at") for indicator in indicators],
+            [self.without(indicator, "detected_at") for indicator in expected]
+        )
+
+    def test_side_fair_value(self):
+        """calculate_side_fair_value matches each side of the moneyline dict path"""
+        calculator = FairValueCalculator()
+
+        expected = calculator.analyze_manual_input({"moneyline": {
+            "home_prob": self.home_prob, "away_prob": self.away_prob,
+            "home_odds": self.home_odds, "away_odds": self.away_odds, "book": "DraftKings"
+        }})
+        results = [
+            calculator.calculate_side_fair_value("home_win", self.home_prob, self.away_prob, self.home_odds, "DraftKings"),
+            calculator.calculate_side_fair_value("away_win", self.away_prob, self.home_prob, self.away_odds, "DraftKings")
+        ]
+
+        self.assertEqual([asdict(result) for result in results], [asdict(result) for result in expected])
+
+    def test_single_bet_ev(self):
+        """calculate_single_bet_ev matches the single_bet dict path"""
+        engine = EVEngine()
+        risk_factors = [{"type": "injury", "impact": -0.02, "description": "Starter questionable", "confidence": 0.8}]
+
+        expected = engine.analyze_manual_input({"single_bet": {
+            "win_probability": self.home_prob, "odds": self.home_odds, "stake": 100, "risk_factors": risk_factors
+        }})[0]
+        result = engine.calculate_single_bet_ev(
+            self.home_prob, self.home_odds, 100,
+            [RiskFactor(factor_type=rf["type"], impact=rf["impact"], description=rf["description"],
+                        confidence=rf["confidence"]) for rf in risk_factors]
+        )
+
+        self.assertEqual(
+            self.without(result, "calculation_timestamp"),
+            self.without(expected, "calculation_timestamp")
+        )
+
+
+class TestMaterializedOpportunitySet(unittest.TestCase):
+    """Test per-game invalidation of materialized opportunities"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager = DataInputManager(self.temp_dir.name)
+        games = [make_game_dict(f"G{i}") for i in range(5)]
+        with open(os.path.join(self.temp_dir.name, "games_20250115.json"), "w") as f:
+            json.dump(games, f)
+
+        self.predictor = SharpPredictor(min_ev=0.0, min_confidence=1)
+        self.analyzed = []
+        analyze_game = self.predictor.analyze_game
+
+        def counting_analyze_game(game, model_predictions=None):
+            self.analyzed.append(game.game_id)
+            return analyze_game(game, model_predictions)
+
+        self.predictor.analyze_game = counting_analyze_game
+        self.opportunity_set = MaterializedOpportunitySet(self.predictor, self.data_manager)
+        self.data_manager.add_change_listener(self.opportunity_set.invalidate)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_matches_full_analysis(self):
+        """Materialized results should match a full analyze_multiple_games run"""
+        results = self.opportunity_set.get_results()
+        expected = self.predictor.analyze_multiple_games(self.data_manager.get_all_games())
+
+        self.assertEqual(results.total_opportunities, expected.total_opportunities)
+        self.assertEqual(
+            [(o.game_id, o.bet_type, o.bet_side) for o in results.best_opportunities],
+            [(o.game_id, o.bet_type, o.bet_side) for o in expected.best_opportunities]
+        )
+
+    def test_only_changed_games_reanalyzed(self):
+        """Reads are cached and writes re-analyze only the affected game"""
+        self.opportunity_set.get_results()
+        self.assertEqual(len(self.analyzed), 5)
+
+        self.analyzed.clear()
+        self.opportunity_set.get_results()
+        self.assertEqual(self.analyzed, [])
+
+        self.data_manager.add_line_movement("G3", "DraftKings", "spread", -1.0, -1.5)
+        self.opportunity_set.get_results()
+        self.assertEqual(self.analyzed, ["G3"])
+
+    def test_writes_by_other_workers_invalidate(self):
+        """File changes made without a change notification are detected"""
+        self.opportunity_set.get_results()
+
+        self.analyzed.clear()
+        other_worker = DataInputManager(self.temp_dir.name)
+        other_worker.add_line_movement("G2", "FanDuel", "spread", -1.0, -1.5)
+        other_worker.line_movement_writer.close()
+
+        self.opportunity_set.get_results()
+        self.assertEqual(self.analyzed, ["G2"])
+
+    def test_repeated_writes_reanalyze_only_touched_game(self):
+        """Each write re-analyzes its own game, however much data is stored"""
+        self.opportunity_set.get_results()
+
+        for i in range(20):
+            game_id = f"G{i % 5}"
+            self.analyzed.clear()
+            self.data_manager.add_line_movement(game_id, "DraftKings", "spread", -1.0, -1.5 - i)
+            self.opportunity_set.get_results()
+            self.assertEqual(self.analyzed, [game_id])
+
+    def test_store_writes_reanalyze_only_touched_game(self):
+        """With the SQLite store, local and other workers' writes re-analyze only their game"""
+        database_path = os.path.join(self.temp_dir.name, "games.db")
+        data_manager = DataInputManager(self.temp_dir.name, database_path=database_path)
+        opportunity_set = MaterializedOpportunitySet(self.predictor, data_manager)
+        data_manager.add_change_listener(opportunity_set.invalidate)
+        opportunity_set.get_results()
+
+        for i in range(10):
+            game_id = f"G{i % 5}"
+            self.analyzed.clear()
+            data_manager.add_line_movement(game_id, "DraftKings", "spread", -1.0, -1.5 - i)
+            opportunity_set.get_results()
+            self.assertEqual(self.analyzed, [game_id])
+
+        other_worker = DataInputManager(self.temp_dir.name, database_path=database_path)
+        other_worker.add_line_movement("G3", "FanDuel", "spread", -1.0, -1.5)
+        other_worker.line_movement_writer.close()
+
+        self.analyzed.clear()
+        opportunity_set.get_results()
+        self.assertEqual(self.analyzed, ["G3"])
+
+    def test_invalidation_during_refresh_not_cached(self):
+        """Games invalidated while a refresh runs are re-analyzed on the next read"""
+        analyze_game = self.predictor.analyze_game
+
+        def invalidating_analyze_game(game, model_predictions=None):
+            if game.game_id == "G4":
+                self.opportunity_set.invalidate(["G1"])
+            return analyze_game(game, model_predictions)
+
+        self.opportunity_set.get_results()
+        self.opportunity_set.invalidate(["G4"])
+        self.predictor.analyze_game = invalidating_analyze_game
+        self.opportunity_set.get_results()
+
+        self.predictor.analyze_game = analyze_game
+        self.analyzed.clear()
+        self.opportunity_set.get_results()
+        self.assertEqual(self.analyzed, ["G1"])
+
+
+class TestParallelAnalysis(unittest.TestCase):
+    """Test process-pool analysis of multiple games"""
+
+    def test_parallel_matches_sequential(self):
+        """Parallel mode should produce the same ranked results as sequential"""
+        data_manager = DataInputManager(tempfile.mkdtemp())
+        games = [
+            data_manager._dict_to_game_data(make_game_dict(f"G{i}", 0.55 + (i % 7) * 0.02))
+            for i in range(40)
+        ]
+
+        sequential = SharpPredictor(min_ev=0.0, min_confidence=1, max_workers=0)
+        parallel = SharpPredictor(min_ev=0.0, min_confidence=1, max_workers=2)
+        parallel.parallel_chunk_size = 8
+
+        expected = sequential.analyze_multiple_games(games)
+        self.addCleanup(parallel.close)
+        results = parallel.analyze_multiple_games(games)
+
+        self.assertEqual(results.total_opportunities, expected.total_opportunities)
+        self.assertEqual(
+            [(o.game_id, o.bet_type, o.bet_side, o.edge_percentage) for o in results.best_opportunities],
+            [(o.game_id, o.bet_type, o.bet_side, o.edge_percentage) for o in expected.best_opportunities]
+        )
+
+    def test_worker_pool_reused_across_runs(self):
+        """One pool serves every run until close(); changed thresholds restart it"""
+        data_manager = DataInputManager(tempfile.mkdtemp())
+        games = [data_manager._dict_to_game_data(make_game_dict(f"G{i}", 0.6)) for i in range(6)]
+
+        predictor = SharpPredictor(min_ev=0.0, min_confidence=1, max_workers=2)
+        predictor.parallel_chunk_size = 2
+        self.addCleanup(predictor.close)
+
+        first = predictor.analyze_multiple_games(games)
+        pool = predictor._executor
+        second = predictor.analyze_multiple_games(games)
+
+        self.assertIsNotNone(pool)
+        self.assertIs(predictor._executor, pool)
+        self.assertEqual(first.total_opportunities, second.total_opportunities)
+
+        predictor.min_ev_threshold = 1.0
+        predictor.analyze_multiple_games(games)
+        self.assertIsNot(predictor._executor, pool)
+
+        predictor.close()
+        self.assertIsNone(predictor._executor)
+
+
+class TestSharpReplay(unittest.TestCase):
+    """Test historical replay of sharp signals"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        start = datetime(2025, 1, 15, 18, 0)
+
+        movements = [
+            {"game_id": "G1", "book": book, "bet_type": "spread", "from_line": -1.0,
+             "to_line": -1.5, "timestamp": (start + timedelta(minutes=i)).isoformat()}
+            for i, book in enumerate(["DraftKings", "FanDuel", "BetMGM", "Caesars"], start=1)
+        ]
+        public = [
+            {"game_id": "G1", "bet_type": "spread", "side": "favorite", "bets_percentage": 30.0,
+             "money_percentage": 55.0, "timestamp": start.isoformat()}
+        ]
+
+        with open(os.path.join(self.temp_dir.name, "line_movements.json"), "w") as f:
+            json.dump(movements, f)
+        with open(os.path.join(self.temp_dir.name, "public_betting_20250115.json"), "w") as f:
+            json.dump(public, f)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_signals_fire_in_event_time(self):
+        """Replay reports Sharp $, Steam and Consensus at their event timestamps"""
+        engine = SharpReplayEngine()
+        events = engine.load_events(self.temp_dir.name)
+        self.assertEqual(len(events), 5)
+        self.assertEqual(events[0].event_type, "public_betting")
+
+        report = engine.replay(events)
+
+        self.assertEqual(report.events_processed, 5)
+        self.assertEqual(report.signal_counts.get("Sharp $"), 1)
+        self.assertEqual(report.signal_counts.get("Consensus"), 1)
+        self.assertGreaterEqual(report.signal_counts.get("Steam", 0), 1)
+
+        steam = [s for s in report.signals if s.flag_type == "Steam"][0]
+        self.assertEqual(steam.fired_at, datetime(2025, 1, 15, 18, 3))
+
+    def test_mixed_timezone_timestamps(self):
+        """Offset and naive timestamps are ordered together as UTC"""
+        with open(os.path.join(self.temp_dir.name, "line_movements_20250115.json"), "w") as f:
+            json.dump([{"game_id": "G1", "book": "PointsBet", "bet_type": "spread", "from_line": -1.5,
+                        "to_line": -2.0, "timestamp": "2025-01-15T13:02:30-05:00"}], f)
+
+        events = SharpReplayEngine().load_events(self.temp_dir.name)
+
+        self.assertEqual(len(events), 6)
+        self.assertEqual(events[3].record["book"], "PointsBet")
+        self.assertEqual(events[3].timestamp, datetime(2025, 1, 15, 18, 2, 30))
+
+    def test_threshold_sweep(self):
+        """Raising the steam threshold suppresses steam signals"""
+        engine = SharpReplayEngine()
+        events = engine.load_events(self.temp_dir.name)
+        results = engine.sweep_thresholds(events, [0.5], [0.5, 5.0])
+
+        self.assertIn("Steam", results[0]["signal_counts"])
+        self.assertNotIn("Steam", results[1]["signal_counts"])
+
+
+if __name__ == "__main__":
+    unittest.main()